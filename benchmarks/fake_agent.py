@@ -0,0 +1,150 @@
+"""
+Stand-in MASV Agent for benchmarks.
+
+Serves the agent's local HTTP API as used by HTTPTransport (list, start,
+pause, resume and finalize uploads) and simulates transfers sharing a fixed
+uplink: every active upload gets an equal share of ``uplink_mbps`` and its
+progress advances with wall time. ``fake_masv.py`` exposes the same agent through the
+``masv`` command line for the CLI transport.
+"""
+
+import itertools
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeAgent:
+    """Local HTTP server simulating MASV Agent uploads."""
+
+    def __init__(self, api_key, uplink_mbps=100.0, host="127.0.0.1", port=0):
+        """
+        Initialize the fake.
+
+        Args:
+            api_key: Key clients must send in X-API-KEY
+            uplink_mbps: Simulated upload bandwidth in megabits per second,
+                shared by all active uploads
+            host: Address to listen on
+            port: Port to listen on (0 picks a free one)
+        """
+        self.api_key = api_key
+        self.rate = uplink_mbps * 1_000_000 / 8
+        self.host = host
+        self.port = port
+        self.transfers = {}
+        self.finalized = set()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._last = time.monotonic()
+        self._server = None
+
+    @property
+    def url(self):
+        """Base URL of the agent API (for MASV_AGENT_URL)."""
+        return f"http://{self.host}:{self.port}/api/v1"
+
+    def start(self):
+        """Start serving in a background thread; returns self."""
+        agent = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, body):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _dispatch(self, method):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"null")
+                if self.headers.get("X-API-KEY") != agent.api_key:
+                    return self._reply(401, {"error": "invalid api key"})
+                status, reply = agent.handle(method, self.path, body)
+                self._reply(status, reply)
+
+            def do_GET(self):
+                self._dispatch("GET")
+
+            def do_POST(self):
+                self._dispatch("POST")
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        """Stop serving."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def _advance(self):
+        """Move active uploads forward by the time elapsed since last call."""
+        now = time.monotonic()
+        elapsed, self._last = now - self._last, now
+        active = [t for t in self.transfers.values() if t["state"] == "transferring"]
+        if not active:
+            return
+        share = self.rate * elapsed / len(active)
+        for transfer in active:
+            transfer["progress"] = min(transfer["size"], transfer["progress"] + share)
+            if transfer["progress"] >= transfer["size"]:
+                transfer["state"] = "complete"
+
+    def handle(self, method, path, body):
+        """
+        Answer one API request.
+
+        Returns:
+            tuple: (HTTP status, JSON-serializable reply)
+        """
+        path = path.split("?", 1)[0].rstrip("/")
+        with self._lock:
+            self._advance()
+            if method == "GET" and path.endswith("/uploads"):
+                return 200, {"transfers": [dict(t) for t in self.transfers.values()]}
+
+            if method == "POST" and path.endswith("/finalize"):
+                upload_id = path.split("/")[-2]
+                if upload_id not in self.transfers:
+                    return 404, {"error": "not found"}
+                self.finalized.add(upload_id)
+                return 200, {}
+
+            if method == "POST" and path.rsplit("/", 1)[-1] in ("pause", "resume"):
+                upload_id, action = path.split("/")[-2:]
+                transfer = self.transfers.get(upload_id)
+                if transfer is None:
+                    return 404, {"error": "not found"}
+                if transfer["state"] != "complete":
+                    transfer["state"] = "paused" if action == "pause" else "transferring"
+                return 200, {}
+
+            if method == "POST" and path.rsplit("/", 1)[-1] in ("portal", "email"):
+                files = (body or {}).get("files", [])
+                missing = [f for f in files if not os.path.exists(f)]
+                if not files or missing:
+                    return 400, {"error": f"missing files: {missing}"}
+                upload_id = f"pkg{next(self._ids)}"
+                self.transfers[upload_id] = {
+                    "package_id": upload_id,
+                    "state": "transferring",
+                    "progress": 0,
+                    "size": sum(os.path.getsize(f) for f in files),
+                }
+                return 200, {"id": upload_id}
+
+        return 404, {"error": f"no route for {method} {path}"}
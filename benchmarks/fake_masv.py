@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Stand-in ``masv`` command line for benchmarks.
+
+Implements the subcommands CLITransport runs (``upload ls``, ``upload start
+portal|email``, ``upload pause|resume|finalize``, ``server start``,
+``--help``) by forwarding them to a FakeAgent at FAKE_MASV_AGENT_URL. Standard library
+only, so each call costs about what a small native CLI would.
+"""
+
+import json
+import os
+import sys
+import urllib.error
+import urllib.request
+
+
+def call(method, path, body=None):
+    """Send a request to the fake agent; exit non-zero on errors."""
+    url = os.environ["FAKE_MASV_AGENT_URL"].rstrip("/") + path
+    data = json.dumps(body).encode() if body is not None else None
+    request = urllib.request.Request(
+        url,
+        data=data,
+        method=method,
+        headers={
+            "X-API-KEY": os.environ.get("MASV_API_KEY", ""),
+            "Content-Type": "application/json",
+        },
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return json.loads(response.read() or b"null")
+    except urllib.error.HTTPError as e:
+        sys.stderr.write(e.read().decode(errors="replace") + "\n")
+        sys.exit(1)
+    except OSError as e:
+        sys.stderr.write(f"cannot reach agent: {e}\n")
+        sys.exit(1)
+
+
+def upload_start(delivery, args):
+    """Parse ``masv upload start`` options and files."""
+    options = {
+        "--subdomain": "subdomain",
+        "--sender": "sender",
+        "--emails": "emails",
+        "--team-id": "team_id",
+        "--name": "name",
+        "--description": "description",
+        "--password": "password",
+    }
+    body = {"files": []}
+    args = list(args)
+    while args:
+        arg = args.pop(0)
+        if arg in options:
+            body[options[arg]] = args.pop(0)
+        else:
+            body["files"].append(os.path.abspath(arg))
+    if "emails" in body:
+        body["emails"] = body["emails"].split(",")
+    return call("POST", f"/uploads/{delivery}", body)
+
+
+def main(argv):
+    """Main entry point."""
+    if not argv or argv[0] in ("--help", "-h"):
+        print("Usage:\n  masv [command]\n\n(benchmark stand-in)")
+        return 1
+    if argv[:2] == ["server", "start"]:
+        # The harness already runs the fake agent
+        return 0
+    if argv[:2] == ["upload", "ls"]:
+        print(json.dumps(call("GET", "/uploads")))
+        return 0
+    if argv[:2] == ["upload", "start"] and len(argv) > 2:
+        print(json.dumps(upload_start(argv[2], argv[3:])))
+        return 0
+    if argv[:2] in (["upload", "finalize"], ["upload", "pause"], ["upload", "resume"]):
+        if len(argv) > 2:
+            call("POST", f"/uploads/{argv[2]}/{argv[1]}")
+            return 0
+    sys.stderr.write(f"unknown command: {' '.join(argv)}\n")
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
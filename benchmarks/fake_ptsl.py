@@ -0,0 +1,163 @@
+"""
+Stand-in Pro Tools Scripting API server for benchmarks.
+
+Implements the ``SendGrpcRequest`` commands ProToolsClient uses
+(RegisterConnection, GetSessionName, GetSessionPath, OpenSession,
+CloseSession, ExportMix) on a local gRPC port. ExportMix waits for a configurable latency and writes a WAV of a
+configurable size into the session's ``Bounced Files`` folder, one per mix
+source in stems mode. Uses the generated PTSL modules for the message types,
+so the SDK code from README step 3 is required.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from concurrent import futures
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.audio.wav import WavWriter  # noqa: E402
+from src.protools.ptsl import load  # noqa: E402
+
+
+class FakeProTools:
+    """Local gRPC server answering PTSL requests like Pro Tools would."""
+
+    def __init__(
+        self,
+        session_path,
+        bounce_latency=1.0,
+        bounce_bytes=50 * 1024**2,
+        host="127.0.0.1",
+        port=0,
+    ):
+        """
+        Initialize the fake.
+
+        Args:
+            session_path: Path of the (fake) .ptx session file; bounces go to
+                the "Bounced Files" folder next to it
+            bounce_latency: Seconds ExportMix takes, on top of writing the file
+            bounce_bytes: Approximate size of each bounced file
+            host: Address to listen on
+            port: Port to listen on (0 picks a free one)
+        """
+        self.session_path = session_path
+        self.bounce_latency = bounce_latency
+        self.bounce_bytes = bounce_bytes
+        self.host = host
+        self.port = port
+        self.requests = []
+        self._server = None
+        # Pro Tools runs one export at a time
+        self._export_lock = threading.Lock()
+
+    def start(self):
+        """Start serving; returns self with ``port`` set."""
+        import grpc
+
+        pb2, _ = load()
+        self._pb2 = pb2
+        service = pb2.DESCRIPTOR.services_by_name["PTSL"].full_name
+        handler = grpc.method_handlers_generic_handler(
+            service,
+            {
+                "SendGrpcRequest": grpc.unary_unary_rpc_method_handler(
+                    self._handle,
+                    request_deserializer=pb2.Request.FromString,
+                    response_serializer=pb2.Response.SerializeToString,
+                )
+            },
+        )
+        self._server = grpc.server(futures.ThreadPoolExecutor(max_workers=8))
+        self._server.add_generic_rpc_handlers((handler,))
+        self.port = self._server.add_insecure_port(f"{self.host}:{self.port}")
+        self._server.start()
+        return self
+
+    def stop(self):
+        """Stop serving."""
+        if self._server is not None:
+            self._server.stop(grace=None)
+            self._server = None
+
+    def _respond(self, command, body=None, error=None):
+        """Build a Response message."""
+        pb2 = self._pb2
+        header = pb2.ResponseHeader(
+            command=command,
+            status=pb2.TStatus_Failed if error else pb2.TStatus_Completed,
+        )
+        return pb2.Response(
+            header=header,
+            response_body_json=json.dumps(body) if body is not None else "",
+            response_error_json=json.dumps(error) if error else "",
+        )
+
+    def _handle(self, request, context):
+        """Dispatch one SendGrpcRequest call."""
+        pb2 = self._pb2
+        command = request.header.command
+        self.requests.append(pb2.CommandId.Name(command))
+        body = json.loads(request.request_body_json or "{}")
+
+        if command == pb2.CId_RegisterConnection:
+            return self._respond(command, {"session_id": uuid.uuid4().hex})
+        if command == pb2.CId_GetSessionName:
+            name = os.path.splitext(os.path.basename(self.session_path))[0]
+            return self._respond(command, {"session_name": name})
+        if command == pb2.CId_GetSessionPath:
+            return self._respond(
+                command, {"session_path": {"path": self.session_path}}
+            )
+        if command == pb2.CId_OpenSession:
+            path = body.get("session_path", "")
+            if not os.path.isfile(path):
+                return self._respond(
+                    command, error={"command_error_message": f"Cannot open {path}"}
+                )
+            self.session_path = path
+            return self._respond(command, {})
+        if command == pb2.CId_CloseSession:
+            return self._respond(command, {})
+        if command == pb2.CId_ExportMix:
+            return self._respond(command, self._export(body))
+        return self._respond(
+            command, error={"command_error_message": "Not implemented by fake"}
+        )
+
+    def _export(self, body):
+        """Simulate an offline bounce: wait, then write the file(s)."""
+        with self._export_lock:
+            time.sleep(self.bounce_latency)
+            folder = os.path.join(
+                os.path.dirname(self.session_path),
+                body.get("location_info", {}).get("directory", "Bounced Files"),
+            )
+            os.makedirs(folder, exist_ok=True)
+            audio = body.get("audio_info", {})
+            sample_rate = int(audio.get("sample_rate", "SR_48000").split("_")[-1])
+            bits = int(audio.get("bit_depth", "Bit24")[3:])
+            file_name = body.get("file_name", "bounce")
+
+            sources = [s["name"] for s in body.get("mix_source_list", [])]
+            names = [f"{file_name} ({source})" for source in sources] or [file_name]
+            for name in names:
+                self._write_wav(os.path.join(folder, f"{name}.wav"), sample_rate, bits)
+        return {}
+
+    def _write_wav(self, path, sample_rate, bits):
+        """Write a stereo WAV of about ``bounce_bytes`` filled with noise."""
+        block = 2 * bits // 8
+        frames = max(self.bounce_bytes // block, 1)
+        # Noise rather than silence so hashing and compression see real work
+        chunk = os.urandom(block * 65536)
+        with WavWriter(path, sample_rate, 2, bits) as writer:
+            remaining = frames * block
+            while remaining > 0:
+                writer.write(chunk[: min(remaining, len(chunk))])
+                remaining -= len(chunk)
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+End-to-end latency and throughput of ``BounceAndSendApp`` against fakes.
+
+Stands up a fake Pro Tools (gRPC, see fake_ptsl.py) and a fake MASV Agent
+(HTTP API plus a ``masv`` CLI on PATH, see fake_agent.py / fake_masv.py),
+then runs the real pipeline against them: a series of single jobs, one
+after the other, and a burst of concurrent jobs. Per-phase timings come
+from the pipeline's own timing spans.
+
+Usage:
+    python benchmarks/pipeline.py [--runs 3] [--concurrent 4]
+        [--bounce-latency 1.0] [--bounce-mb 50] [--uplink-mbps 400]
+        [--transport http|cli] [--save results.json]
+        [--compare baseline.json --tolerance 0.15]
+
+Needs the generated SDK code (README step 3); no Pro Tools or MASV account.
+Exits non-zero if --compare finds a regression beyond the tolerance.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HERE = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(HERE, "results")
+
+# Metrics compared against a baseline (all "lower is better")
+COMPARED = ("latency_p50", "latency_p95", "wall_seconds")
+
+
+def _percentile(values, fraction):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def _summarize(latencies, wall, total_bytes):
+    """Latency and throughput figures for one scenario."""
+    return {
+        "jobs": len(latencies),
+        "latency_p50": statistics.median(latencies),
+        "latency_p95": _percentile(latencies, 0.95),
+        "latency_max": max(latencies),
+        "wall_seconds": wall,
+        "throughput_mb_s": total_bytes / wall / 1e6 if wall else 0.0,
+    }
+
+
+def _run_jobs(app, count):
+    """
+    Submit ``count`` jobs at once and time each until it's delivered.
+
+    Returns:
+        tuple: (per-job latencies, wall time, bytes uploaded)
+    """
+    latencies = [None] * count
+    started = time.perf_counter()
+    jobs = [app.enqueue() for _ in range(count)]
+
+    def wait(index, job):
+        job.result()
+        latencies[index] = time.perf_counter() - started
+
+    waiters = [
+        threading.Thread(target=wait, args=(i, job)) for i, job in enumerate(jobs)
+    ]
+    for waiter in waiters:
+        waiter.start()
+    for waiter in waiters:
+        waiter.join()
+    wall = time.perf_counter() - started
+
+    failed = [job for job in jobs if job.error is not None]
+    if failed:
+        raise RuntimeError(f"{len(failed)} job(s) failed: {failed[0].error}")
+    total = sum(os.path.getsize(path) for job in jobs for path in job.files)
+    return latencies, wall, total
+
+
+def _phase_medians(log_path):
+    """Median seconds per timing span name from a JSON-lines log."""
+    spans = {}
+    with open(log_path) as f:
+        for line in f:
+            record = json.loads(line)
+            spans.setdefault(record["span"], []).append(record["seconds"])
+    return {name: statistics.median(values) for name, values in sorted(spans.items())}
+
+
+def run(args):
+    """
+    Run the benchmark scenarios.
+
+    Returns:
+        dict: Parameters, environment and per-scenario results
+    """
+    from fake_agent import FakeAgent
+    from fake_ptsl import FakeProTools
+
+    with tempfile.TemporaryDirectory() as tmp:
+        session = os.path.join(tmp, "session", "Benchmark.ptx")
+        os.makedirs(os.path.dirname(session))
+        open(session, "w").close()
+
+        protools = FakeProTools(
+            session,
+            bounce_latency=args.bounce_latency,
+            bounce_bytes=int(args.bounce_mb * 1e6),
+        ).start()
+        agent = FakeAgent("benchmark", uplink_mbps=args.uplink_mbps).start()
+
+        # A "masv" on PATH that talks to the fake agent
+        bin_dir = os.path.join(tmp, "bin")
+        os.makedirs(bin_dir)
+        wrapper = os.path.join(bin_dir, "masv")
+        with open(wrapper, "w") as f:
+            f.write(
+                f'#!/bin/sh\nexec "{sys.executable}" -S '
+                f'"{os.path.join(HERE, "fake_masv.py")}" "$@"\n'
+            )
+        os.chmod(wrapper, 0o755)
+
+        timing_log = os.path.join(tmp, "timing.jsonl")
+        os.environ.update(
+            {
+                "PATH": bin_dir + os.pathsep + os.environ.get("PATH", ""),
+                "FAKE_MASV_AGENT_URL": agent.url,
+                "MASV_AGENT_URL": agent.url,
+                "MASV_AGENT_TRANSPORT": args.transport,
+                "MASV_API_KEY": "benchmark",
+                "MASV_TEAM_ID": "benchmark",
+                "MASV_DELIVERY_MODE": "portal",
+                "MASV_PORTAL_URL": "benchmark",
+                # No MASV web API behind the fake agent
+                "MASV_PREFLIGHT": "agent",
+                "MASV_PORTAL_PASSWORD": "",
+                "MASV_UPLOAD_WORKERS": str(args.upload_workers),
+                "MASV_PROTOOLS_STATE_DIR": os.path.join(tmp, "state"),
+                "PROTOOLS_HOST": "127.0.0.1",
+                "PROTOOLS_PORT": str(protools.port),
+                "PIPELINE_TIMING_LOG": timing_log,
+                # Measure the plain pipeline: every job bounces and uploads
+                "MASV_DEDUP": "off",
+                "BOUNCE_CACHE": "off",
+                "BOUNCE_STEMS": "",
+                "DELIVERABLES": "",
+                "MASV_COMPRESS": "off",
+                "MASV_COMPRESS_CONTAINER": "",
+            }
+        )
+
+        # Imported after the environment is set: state paths are resolved at import
+        sys.path.insert(0, ROOT)
+        from src.bounce_and_send import BounceAndSendApp
+
+        app = BounceAndSendApp()
+        scenarios = {}
+        try:
+            print(f"Single jobs ({args.runs} runs)...")
+            latencies, wall, total = [], 0.0, 0
+            for _ in range(args.runs):
+                job_latencies, job_wall, job_bytes = _run_jobs(app, 1)
+                latencies += job_latencies
+                wall += job_wall
+                total += job_bytes
+            scenarios["single"] = _summarize(latencies, wall, total)
+
+            if args.concurrent > 1:
+                print(f"Concurrent burst ({args.concurrent} jobs)...")
+                scenarios["concurrent"] = _summarize(*_run_jobs(app, args.concurrent))
+        finally:
+            app.shutdown()
+            agent.stop()
+            protools.stop()
+
+        phases = _phase_medians(timing_log)
+
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {
+            "runs": args.runs,
+            "concurrent": args.concurrent,
+            "bounce_latency": args.bounce_latency,
+            "bounce_mb": args.bounce_mb,
+            "uplink_mbps": args.uplink_mbps,
+            "transport": args.transport,
+            "upload_workers": args.upload_workers,
+        },
+        "scenarios": scenarios,
+        "phases": phases,
+    }
+
+
+def _git_commit():
+    """Current commit hash, or None outside a git checkout."""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return result.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results):
+    """Print scenario figures and per-phase medians."""
+    for name, figures in results["scenarios"].items():
+        print(
+            f"\n{name}: {figures['jobs']} job(s), "
+            f"p50 {figures['latency_p50']:.2f}s, p95 {figures['latency_p95']:.2f}s, "
+            f"wall {figures['wall_seconds']:.2f}s, "
+            f"{figures['throughput_mb_s']:.1f} MB/s"
+        )
+    print("\nPhase medians:")
+    for name, seconds in results["phases"].items():
+        print(f"  {seconds * 1000:9.1f} ms  {name}")
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compare against a saved run.
+
+    Returns:
+        bool: True if no compared metric got slower by more than ``tolerance``
+    """
+    if baseline.get("params") != results["params"]:
+        print("\nNote: baseline was run with different parameters")
+    ok = True
+    print(f"\nCompared with {baseline.get('commit') or 'baseline'}:")
+    for name, figures in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous:
+            continue
+        for metric in COMPARED:
+            old, new = previous[metric], figures[metric]
+            change = (new - old) / old if old else 0.0
+            regressed = change > tolerance
+            ok = ok and not regressed
+            print(
+                f"  {name:10s} {metric:13s} {old:8.3f} -> {new:8.3f} "
+                f"({change:+.1%}){'  ✗' if regressed else ''}"
+            )
+    return ok
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=3, help="Single-job runs")
+    parser.add_argument(
+        "--concurrent", type=int, default=4, help="Jobs in the concurrent burst"
+    )
+    parser.add_argument(
+        "--bounce-latency", type=float, default=1.0, help="Seconds per fake export"
+    )
+    parser.add_argument(
+        "--bounce-mb", type=float, default=50, help="Size of each bounce in MB"
+    )
+    parser.add_argument(
+        "--uplink-mbps", type=float, default=400, help="Simulated upload bandwidth"
+    )
+    parser.add_argument("--transport", choices=("http", "cli"), default="http")
+    parser.add_argument("--upload-workers", type=int, default=3)
+    parser.add_argument(
+        "--save",
+        default=os.path.join(RESULTS_DIR, f"pipeline-{time.strftime('%Y%m%d-%H%M%S')}.json"),
+        help="Where to write the results (default: benchmarks/results/)",
+    )
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.15,
+        help="Allowed slowdown before --compare fails (fraction, default 0.15)",
+    )
+    args = parser.parse_args()
+
+    results = run(args)
+    print_results(results)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+    with open(args.save, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults saved to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if not compare(results, baseline, args.tolerance):
+            print("✗ Regression beyond tolerance")
+            return 1
+        print("✓ Within tolerance")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
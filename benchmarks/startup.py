@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Startup-time budget for ``python src/bounce_and_send.py --cli``.
+
+Measures wall time from process start until the first PTSL request
+reaches Pro Tools. gRPC connects lazily on the first RPC, so a plain TCP
+listener standing in for Pro Tools sees the connection exactly when the
+first request (RegisterConnection) is sent; the process is then killed.
+
+Usage:
+    python benchmarks/startup.py [--runs 5] [--budget 1.0] [--importtime]
+
+Exits non-zero if the median startup time exceeds the budget.
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = os.path.join(ROOT, "src", "bounce_and_send.py")
+
+
+def measure_once(python, extra_args=(), timeout=30.0):
+    """
+    Run the CLI once and time it up to the first PTSL request.
+
+    Returns:
+        tuple: (seconds, stderr output)
+    """
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(1)
+    listener.settimeout(timeout)
+    port = listener.getsockname()[1]
+
+    with tempfile.TemporaryDirectory() as state:
+        env = {
+            **os.environ,
+            "PROTOOLS_HOST": "127.0.0.1",
+            "PROTOOLS_PORT": str(port),
+            "MASV_API_KEY": "benchmark",
+            "MASV_TEAM_ID": "benchmark",
+            "MASV_DELIVERY_MODE": "portal",
+            "MASV_PORTAL_URL": "benchmark",
+            # No MASV web API behind the fake agent
+            "MASV_PREFLIGHT": "agent",
+            "MASV_PROTOOLS_STATE_DIR": state,
+        }
+        started = time.perf_counter()
+        proc = subprocess.Popen(
+            [python, *extra_args, SCRIPT, "--cli"],
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        try:
+            conn, _ = listener.accept()
+            elapsed = time.perf_counter() - started
+            conn.close()
+        except socket.timeout:
+            proc.kill()
+            _, stderr = proc.communicate()
+            raise RuntimeError(f"No PTSL request within {timeout}s:\n{stderr}")
+        finally:
+            listener.close()
+
+        proc.kill()
+        _, stderr = proc.communicate()
+    return elapsed, stderr
+
+
+def print_importtime(stderr, top=15):
+    """Print the slowest imports from ``-X importtime`` output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        try:
+            rows.append((int(parts[1]), parts[2].rstrip()))
+        except ValueError:
+            continue
+    print(f"\nSlowest imports (cumulative):")
+    for cumulative, name in sorted(rows, reverse=True)[:top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=float(os.getenv("STARTUP_BUDGET", "1.0")),
+        help="Maximum median seconds to the first PTSL request",
+    )
+    parser.add_argument("--python", default=sys.executable)
+    parser.add_argument(
+        "--importtime", action="store_true", help="Show the slowest imports"
+    )
+    args = parser.parse_args()
+
+    # First run warms __pycache__ (including the generated PTSL modules)
+    measure_once(args.python)
+
+    times = []
+    for _ in range(args.runs):
+        elapsed, _ = measure_once(args.python)
+        times.append(elapsed)
+        print(f"  {elapsed * 1000:7.1f} ms")
+
+    median = statistics.median(times)
+    print(f"Median startup to first PTSL request: {median * 1000:.1f} ms")
+    print(f"Budget: {args.budget * 1000:.0f} ms")
+
+    if args.importtime:
+        _, stderr = measure_once(args.python, ["-X", "importtime"])
+        print_importtime(stderr)
+
+    if median > args.budget:
+        print("✗ Over budget")
+        return 1
+    print("✓ Within budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
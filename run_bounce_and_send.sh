@@ -10,9 +10,30 @@ SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 # Use absolute paths
 PYTHON="${SCRIPT_DIR}/venv/bin/python3"
 SCRIPT="${SCRIPT_DIR}/src/bounce_and_send.py"
+HOTKEY="${SCRIPT_DIR}/src/hotkey.py"
 
-# Load .env to check delivery mode and defaults
-if [ -f "${SCRIPT_DIR}/.env" ]; then
+# Hand the job to the daemon; it returns as soon as the job is queued.
+# Returns only if no daemon is listening (hotkey.py exit 2), so the caller
+# can run the script itself. A refused job or a lost reply (exit 1 or 3)
+# must not start a second bounce.
+submit_to_daemon() {
+    "$PYTHON" -S "$HOTKEY" submit "$@"
+    local status=$?
+    if [ "$status" -eq 2 ]; then
+        return
+    fi
+    if [ "$status" -ne 0 ]; then
+        osascript -e 'display notification "The daemon did not queue the job - see hotkey.py status" with title "MASV Bounce and Send"'
+    fi
+    exit "$status"
+}
+
+# Ask the resident daemon (src/daemon.py) for delivery settings if it's running,
+# otherwise load .env to check delivery mode and defaults
+if DAEMON_CONFIG=$("$PYTHON" -S "$HOTKEY" config 2>/dev/null); then
+    USE_DAEMON=1
+    eval "$DAEMON_CONFIG"
+elif [ -f "${SCRIPT_DIR}/.env" ]; then
     DELIVERY_MODE=$(grep "^MASV_DELIVERY_MODE=" "${SCRIPT_DIR}/.env" | cut -d'=' -f2)
     PORTAL_URL=$(grep "^MASV_PORTAL_URL=" "${SCRIPT_DIR}/.env" | cut -d'=' -f2)
     DEFAULT_RECIPIENTS=$(grep "^MASV_DEFAULT_RECIPIENTS=" "${SCRIPT_DIR}/.env" | cut -d'=' -f2)
@@ -48,6 +69,10 @@ if [ "$DELIVERY_MODE" = "portal" ]; then
         PORTAL_SUBDOMAIN="$PORTAL_INPUT"
     fi
 
+    if [ -n "$USE_DAEMON" ]; then
+        submit_to_daemon --portal "$PORTAL_SUBDOMAIN"
+    fi
+
     # Set portal URL for this run
     export MASV_PORTAL_URL="$PORTAL_SUBDOMAIN"
 
@@ -68,6 +93,10 @@ else
         exit 0
     fi
 
+    if [ -n "$USE_DAEMON" ]; then
+        submit_to_daemon --recipients "$RECIPIENT"
+    fi
+
     # Run the Python script with recipient
     echo "$RECIPIENT" | "$PYTHON" "$SCRIPT" --cli
 fi
@@ -0,0 +1,24 @@
+"""Audio file handling: WAV I/O, deliverables, quality checks, previews and splicing.
+
+The submodules load NumPy, so names here are imported on first access
+rather than with the package (the hotkey path never touches audio).
+"""
+
+import importlib
+
+_EXPORTS = {
+    "QCLimits": "qc",
+    "QCReport": "qc",
+    "WavReader": "wav",
+    "WavWriter": "wav",
+    "analyze_quality": "qc",
+    "render_deliverables": "resample",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
@@ -0,0 +1,62 @@
+"""Small listening copies of a bounce, sent ahead of the full-resolution files."""
+
+import os
+import shutil
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from .resample import render_deliverable
+from .wav import require_numpy
+
+# Fallback preview format when ffmpeg isn't installed
+PREVIEW_RATE = 22050
+PREVIEW_BITS = 16
+
+
+def find_ffmpeg() -> Optional[str]:
+    """Path of ffmpeg (FFMPEG_BINARY overrides), or None."""
+    return shutil.which(os.getenv("FFMPEG_BINARY", "ffmpeg"))
+
+
+def preview_path(source_path: str, extension: str) -> str:
+    """Output path for a preview, e.g. 'Mix_preview.m4a'."""
+    return f"{os.path.splitext(source_path)[0]}_preview{extension}"
+
+
+def encode_preview(source_path: str, bitrate: str = "128k", workers=None) -> str:
+    """
+    Encode a small preview of a bounce in one streaming pass.
+
+    With ffmpeg the preview is stereo AAC (.m4a) at ``bitrate``. Without
+    it, a 22.05 kHz 16-bit WAV is rendered by the deliverables resampler
+    (WAV bounces only; needs NumPy).
+
+    Args:
+        source_path: Bounce to preview
+        bitrate: AAC bitrate, e.g. "128k"
+        workers: Worker processes for the WAV fallback (default: CPU count)
+
+    Returns:
+        str: Path of the preview file
+
+    Raises:
+        RuntimeError: If encoding fails
+        ValueError: If the fallback can't read the bounce
+    """
+    ffmpeg = find_ffmpeg()
+    if ffmpeg:
+        out = preview_path(source_path, ".m4a")
+        cmd = [ffmpeg, "-nostdin", "-loglevel", "error", "-y", "-i", source_path]
+        cmd.extend(["-vn", "-ac", "2", "-c:a", "aac", "-b:a", bitrate])
+        cmd.extend(["-movflags", "+faststart", out])
+        try:
+            subprocess.run(cmd, capture_output=True, text=True, check=True)
+        except subprocess.CalledProcessError as e:
+            raise RuntimeError(f"Preview encode failed for {source_path}: {e.stderr}")
+        return out
+
+    require_numpy()
+    out = preview_path(source_path, ".wav")
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return render_deliverable(source_path, out, PREVIEW_RATE, PREVIEW_BITS, pool)
@@ -0,0 +1,356 @@
+"""Streaming quality checks of a bounce: levels, loudness, silence, truncation."""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from math import log10, pi, tan
+
+from .resample import polyphase_filter
+from .wav import WavReader, require_numpy
+
+try:
+    import numpy as np
+except ImportError:
+    pass
+
+# Frames analyzed per worker task (rounded down to whole 100 ms segments)
+CHUNK_FRAMES = 1 << 18
+
+# Samples at or above this level count as full scale
+CLIP_LEVEL = 0.9999
+# Consecutive full-scale samples that count as clipping
+CLIP_RUN = 3
+# Frames below this peak level count as silence
+SILENCE_DB = -60.0
+# A final 10 ms this loud means the bounce was probably cut off
+ABRUPT_END_DB = -20.0
+
+# ITU-R BS.1770 gating
+ABSOLUTE_GATE = -70.0
+RELATIVE_GATE = -10.0
+
+
+def _db(value):
+    """Amplitude ratio in dB (-inf for silence)."""
+    return 20 * log10(value) if value > 0 else float("-inf")
+
+
+@lru_cache(maxsize=8)
+def k_weighting(sample_rate):
+    """
+    Impulse response of the BS.1770 K-weighting filter at a sample rate.
+
+    The two biquads (high shelf, then high pass) are designed from the
+    standard's analog prototype, so rates other than 48 kHz are handled,
+    and truncated once the response has decayed (200 ms).
+
+    Args:
+        sample_rate: Sample rate in Hz
+
+    Returns:
+        numpy.ndarray: FIR coefficients
+    """
+    k = tan(pi * 1681.974450955533 / sample_rate)
+    q = 0.7071752369554196
+    vh = 10 ** (3.999843853973347 / 20)
+    vb = vh**0.4996667741545416
+    a0 = 1 + k / q + k * k
+    shelf = (
+        ((vh + vb * k / q + k * k) / a0, 2 * (k * k - vh) / a0, (vh - vb * k / q + k * k) / a0),
+        (2 * (k * k - 1) / a0, (1 - k / q + k * k) / a0),
+    )
+    k = tan(pi * 38.13547087602444 / sample_rate)
+    q = 0.5003270373238773
+    a0 = 1 + k / q + k * k
+    high_pass = ((1.0, -2.0, 1.0), (2 * (k * k - 1) / a0, (1 - k / q + k * k) / a0))
+
+    signal = [0.0] * int(sample_rate * 0.2)
+    signal[0] = 1.0
+    for (b0, b1, b2), (a1, a2) in (shelf, high_pass):
+        x1 = x2 = y1 = y2 = 0.0
+        for n, x in enumerate(signal):
+            y = b0 * x + b1 * x1 + b2 * x2 - a1 * y1 - a2 * y2
+            x2, x1, y2, y1 = x1, x, y1, y
+            signal[n] = y
+    return np.array(signal)
+
+
+def channel_weights(channels):
+    """
+    BS.1770 channel weights, assuming WAV (SMPTE) order for 5.1.
+
+    Args:
+        channels: Channel count
+
+    Returns:
+        numpy.ndarray: Weight per channel (LFE excluded, surrounds +1.5 dB)
+    """
+    if channels == 6:
+        return np.array([1.0, 1.0, 1.0, 0.0, 1.41, 1.41])
+    return np.ones(channels)
+
+
+def segment_frames(sample_rate):
+    """Frames in one 100 ms loudness segment."""
+    return max(int(round(sample_rate / 10)), 1)
+
+
+def analyze_chunk(path, start, stop):
+    """
+    Measure frames [start, stop) of a WAV file.
+
+    Filters need the frames before ``start``; they are read from the file
+    (zero before its beginning), so chunks can be analyzed in any order.
+
+    Args:
+        path: WAV path
+        start: First frame (a multiple of the segment length)
+        stop: End frame, exclusive
+
+    Returns:
+        dict: Per-channel peak, true peak and sum of squares, K-weighted
+        energy of each whole 100 ms segment, number of clipped runs and the
+        first/last non-silent frame and longest silent gap in the chunk
+    """
+    with WavReader(path) as reader:
+        rate = reader.sample_rate
+        kernel = k_weighting(rate)
+        # 4x oversampling below 96 kHz, 2x above (BS.1770 Annex 2)
+        up = 4 if rate < 96000 else 2
+        phases = polyphase_filter(up, 1, taps=12)
+        history = max(len(kernel) - 1, phases.shape[1] - 1)
+        block = reader.read(start - history, stop)
+    x = block[history:]
+    n = len(x)
+    magnitude = np.abs(x)
+
+    # True peak: every interpolated phase of the oversampled signal
+    true_peak = magnitude.max(axis=0)
+    for phase in phases:
+        y = np.zeros_like(x)
+        for t, coefficient in enumerate(phase):
+            y += coefficient * block[history - t : history - t + n]
+        np.maximum(true_peak, np.abs(y).max(axis=0), out=true_peak)
+
+    # K-weighting by FFT convolution, the preceding frames as history
+    size = 1 << (len(block) - 1).bit_length()
+    spectrum = np.fft.rfft(block, size, axis=0)
+    spectrum *= np.fft.rfft(kernel, size)[:, None]
+    weighted = np.fft.irfft(spectrum, size, axis=0)[history : history + n]
+    seg = segment_frames(rate)
+    whole = n // seg * seg
+    energy = (weighted[:whole] ** 2).reshape(-1, seg, x.shape[1]).mean(axis=1)
+
+    # Clipping: runs of CLIP_RUN full-scale samples, counted where they reach
+    # that length (the frame before the chunk tells whether a run continues)
+    full = np.abs(block[history - CLIP_RUN :]) >= CLIP_LEVEL
+    run = full[CLIP_RUN - 1 :].copy()
+    for lag in range(1, CLIP_RUN):
+        run &= full[CLIP_RUN - 1 - lag : len(full) - lag]
+    clipped = int((run[1:] & ~run[:-1]).sum())
+
+    active = np.flatnonzero(magnitude.max(axis=1) > 10 ** (SILENCE_DB / 20))
+    gap = int((np.diff(active) - 1).max()) if len(active) > 1 else 0
+    return {
+        "peak": magnitude.max(axis=0),
+        "true_peak": true_peak,
+        "sum_squares": (x * x).sum(axis=0),
+        "energy": energy,
+        "clipped": clipped,
+        "first_active": start + int(active[0]) if len(active) else None,
+        "last_active": start + int(active[-1]) if len(active) else None,
+        "gap": gap,
+        "end_peak": magnitude[-max(rate // 100, 1) :].max() if n else 0.0,
+    }
+
+
+def integrated_loudness(energy, weights):
+    """
+    Gated integrated loudness (BS.1770) from 100 ms segment energies.
+
+    Args:
+        energy: Array of shape (segments, channels) of mean squares
+        weights: Channel weights
+
+    Returns:
+        float: Loudness in LUFS (-inf if everything is below the gate)
+    """
+    if len(energy) < 4:
+        return float("-inf")
+    # 400 ms blocks overlapping by 75%: four consecutive segments each
+    cumulative = np.concatenate([np.zeros((1, energy.shape[1])), np.cumsum(energy, axis=0)])
+    blocks = ((cumulative[4:] - cumulative[:-4]) / 4) @ weights
+    with np.errstate(divide="ignore"):
+        loudness = -0.691 + 10 * np.log10(blocks)
+    gated = blocks[loudness > ABSOLUTE_GATE]
+    if not len(gated):
+        return float("-inf")
+    threshold = -0.691 + 10 * log10(gated.mean()) + RELATIVE_GATE
+    gated = blocks[(loudness > ABSOLUTE_GATE) & (loudness > threshold)]
+    return -0.691 + 10 * log10(gated.mean())
+
+
+class QCLimits:
+    """Thresholds a bounce must meet to pass QC."""
+
+    def __init__(
+        self, max_true_peak=-1.0, target_lufs=None, lufs_tolerance=2.0, max_silence=10.0
+    ):
+        """
+        Initialize the limits.
+
+        Args:
+            max_true_peak: Highest allowed true peak in dBTP
+            target_lufs: Required integrated loudness (None to skip the check)
+            lufs_tolerance: Allowed deviation from target_lufs in LU
+            max_silence: Longest allowed silence in seconds at the start, at
+                the end or within the bounce
+        """
+        self.max_true_peak = max_true_peak
+        self.target_lufs = target_lufs
+        self.lufs_tolerance = lufs_tolerance
+        self.max_silence = max_silence
+
+
+class QCReport:
+    """Measurements of one file and the problems found."""
+
+    def __init__(self, path, metrics, problems):
+        """
+        Initialize the report.
+
+        Args:
+            path: Analyzed file
+            metrics: Measurement name to value
+            problems: Human-readable descriptions of failed checks
+        """
+        self.path = path
+        self.metrics = metrics
+        self.problems = problems
+
+    @property
+    def passed(self):
+        """True if no check failed."""
+        return not self.problems
+
+    def as_dict(self):
+        """JSON-serializable form (for status queries and manifests)."""
+        return {"path": self.path, "passed": self.passed, "problems": self.problems, **self.metrics}
+
+    def __str__(self):
+        m = self.metrics
+        return (
+            f"{m['loudness_lufs']:.1f} LUFS, true peak {m['true_peak_db']:.1f} dBTP, "
+            f"peak {m['peak_db']:.1f} dBFS"
+        )
+
+
+def _problems(metrics, limits):
+    """Check measurements against limits."""
+    problems = []
+    if metrics["truncated"]:
+        problems.append("file is truncated (header promises more audio than it holds)")
+    if metrics["silent"]:
+        problems.append("file is silent")
+        return problems
+    if metrics["true_peak_db"] > limits.max_true_peak:
+        problems.append(
+            f"true peak {metrics['true_peak_db']:.1f} dBTP is above {limits.max_true_peak:g} dBTP"
+        )
+    if metrics["clipped_runs"]:
+        problems.append(f"{metrics['clipped_runs']} clipped run(s)")
+    if limits.target_lufs is not None:
+        off = metrics["loudness_lufs"] - limits.target_lufs
+        if abs(off) > limits.lufs_tolerance:
+            problems.append(
+                f"loudness {metrics['loudness_lufs']:.1f} LUFS is {abs(off):.1f} LU "
+                f"{'above' if off > 0 else 'below'} the {limits.target_lufs:g} LUFS target"
+            )
+    for name, label in (
+        ("leading_silence", "silence at the start"),
+        ("trailing_silence", "silence at the end"),
+        ("longest_gap", "silent gap"),
+    ):
+        if metrics[name] > limits.max_silence:
+            problems.append(f"{metrics[name]:.1f}s {label}")
+    if metrics["end_level_db"] > ABRUPT_END_DB:
+        problems.append(
+            f"ends abruptly at {metrics['end_level_db']:.1f} dBFS (bounce may be cut off)"
+        )
+    return problems
+
+
+def analyze_quality(path, limits=None, workers=None):
+    """
+    Measure a WAV file and check it against limits.
+
+    The file is memory-mapped and split into chunks that worker processes
+    analyze in parallel (all channels of a chunk at once), so memory stays
+    constant however long the bounce is. Per-chunk results are small and
+    combined in order.
+
+    Args:
+        path: WAV path
+        limits: QCLimits to check against (default: QCLimits())
+        workers: Worker processes (default: CPU count)
+
+    Returns:
+        QCReport: Measurements and problems
+
+    Raises:
+        ValueError: If the file is not a supported WAV file
+    """
+    require_numpy()
+    limits = limits or QCLimits()
+    with WavReader(path) as reader:
+        rate, channels, frames = reader.sample_rate, reader.channels, reader.frames
+        truncated = reader.truncated
+    seg = segment_frames(rate)
+    step = max(CHUNK_FRAMES // seg, 1) * seg
+    ranges = [(start, min(start + step, frames)) for start in range(0, frames, step)]
+
+    peak = np.zeros(channels)
+    true_peak = np.zeros(channels)
+    sum_squares = np.zeros(channels)
+    energy = []
+    clipped = 0
+    first = last = None
+    gap = 0
+    end_peak = 0.0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(analyze_chunk, path, start, stop) for start, stop in ranges]
+        for future in futures:
+            chunk = future.result()
+            np.maximum(peak, chunk["peak"], out=peak)
+            np.maximum(true_peak, chunk["true_peak"], out=true_peak)
+            sum_squares += chunk["sum_squares"]
+            energy.append(chunk["energy"])
+            clipped += chunk["clipped"]
+            gap = max(gap, chunk["gap"])
+            if chunk["first_active"] is not None:
+                if last is not None:
+                    gap = max(gap, chunk["first_active"] - last - 1)
+                if first is None:
+                    first = chunk["first_active"]
+                last = chunk["last_active"]
+            end_peak = chunk["end_peak"]
+
+    energy = np.concatenate(energy) if energy else np.zeros((0, channels))
+    silent = first is None
+    metrics = {
+        "duration": round(frames / rate, 3),
+        "sample_rate": rate,
+        "channels": channels,
+        "peak_db": round(_db(peak.max(initial=0.0)), 2),
+        "true_peak_db": round(_db(true_peak.max(initial=0.0)), 2),
+        "rms_db": [round(_db((s / max(frames, 1)) ** 0.5), 2) for s in sum_squares],
+        "loudness_lufs": round(integrated_loudness(energy, channel_weights(channels)), 2),
+        "clipped_runs": clipped,
+        "leading_silence": round((first if not silent else frames) / rate, 3),
+        "trailing_silence": round((frames - 1 - last if not silent else frames) / rate, 3),
+        "longest_gap": round(gap / rate, 3),
+        "end_level_db": round(_db(end_peak), 2),
+        "silent": silent,
+        "truncated": truncated,
+    }
+    return QCReport(os.path.abspath(path), metrics, _problems(metrics, limits))
@@ -0,0 +1,189 @@
+"""Derive alternate sample-rate / bit-depth deliverables from one bounce."""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from math import gcd
+
+from .wav import WavReader, WavWriter, encode_pcm, require_numpy
+
+try:
+    import numpy as np
+except ImportError:
+    pass
+
+# Output frames rendered per worker task
+CHUNK_FRAMES = 1 << 16
+
+# Filter taps per polyphase branch (quality vs. speed)
+TAPS_PER_PHASE = 64
+
+
+def parse_formats(spec):
+    """
+    Parse a deliverables spec like "48000/24,44100/16".
+
+    Args:
+        spec: Comma-separated sample_rate/bit_depth pairs
+
+    Returns:
+        list: (sample_rate, bit_depth) tuples
+    """
+    formats = []
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        rate, _, bits = item.partition("/")
+        formats.append((int(rate), int(bits or 24)))
+    return formats
+
+
+@lru_cache(maxsize=8)
+def polyphase_filter(up, down, taps=TAPS_PER_PHASE, beta=8.6):
+    """
+    Design a Kaiser-windowed sinc low-pass split into polyphase branches.
+
+    Args:
+        up: Interpolation factor
+        down: Decimation factor
+        taps: Taps per branch
+        beta: Kaiser window shape (8.6 gives roughly 90 dB stopband)
+
+    Returns:
+        numpy.ndarray: Array of shape (up, taps + 1) where row ``p`` holds
+        the coefficients applied for output phase ``p``
+    """
+    length = up * taps + 1
+    # Cutoff relative to the upsampled Nyquist, slightly below the lower rate
+    cutoff = 0.94 / max(up, down)
+    n = np.arange(length) - (length - 1) / 2
+    h = cutoff * np.sinc(cutoff * n) * np.kaiser(length, beta) * up
+    h = np.concatenate([h, np.zeros(up * (taps + 1) - length)])
+    return h.reshape(taps + 1, up).T.copy()
+
+
+_readers = {}
+
+
+def _reader(path):
+    """Per-process cache of open readers (workers reuse the mmap)."""
+    if path not in _readers:
+        _readers[path] = WavReader(path)
+    return _readers[path]
+
+
+def render_chunk(path, up, down, start, stop, bits, seed):
+    """
+    Resample and requantize output frames [start, stop) of a deliverable.
+
+    Each output frame ``m`` sits at position ``m * down + delay`` in the
+    virtually upsampled signal; its value is the dot product of one
+    polyphase branch with the input frames just before it, computed for
+    the whole chunk at once.
+
+    Args:
+        path: Source WAV path
+        up: Interpolation factor
+        down: Decimation factor
+        start: First output frame
+        stop: End output frame (exclusive)
+        bits: Output bit depth
+        seed: Dither seed (per chunk, so output is reproducible)
+
+    Returns:
+        bytes: Encoded PCM for the chunk
+    """
+    reader = _reader(path)
+    dither = np.random.default_rng(seed) if bits < reader.bits or reader.is_float else None
+
+    if up == down:
+        return encode_pcm(reader.read(start, stop), bits, dither)
+
+    phases = polyphase_filter(up, down)
+    taps = phases.shape[1]
+    delay = up * (taps - 1) // 2
+
+    pos = np.arange(start, stop, dtype=np.int64) * down + delay
+    base = pos // up
+    phase = pos % up
+
+    lo = int(base[0]) - taps + 1
+    hi = int(base[-1]) + 1
+    source = reader.read(lo, hi)
+
+    index = base[:, None] - np.arange(taps)[None, :] - lo
+    out = np.einsum("nt,ntc->nc", phases[phase], source[index])
+    return encode_pcm(out, bits, dither)
+
+
+def render_deliverable(source_path, dest_path, sample_rate, bits, pool, window=8):
+    """
+    Write one deliverable, rendering chunks in parallel but in order.
+
+    At most ``window`` chunks are in flight, so memory stays constant
+    regardless of file length.
+
+    Args:
+        source_path: Master WAV path
+        dest_path: Output WAV path
+        sample_rate: Output sample rate
+        bits: Output bit depth
+        pool: Executor used to render chunks
+        window: Maximum chunks submitted ahead of the writer
+
+    Returns:
+        str: dest_path
+    """
+    with WavReader(source_path) as reader:
+        factor = gcd(sample_rate, reader.sample_rate)
+        up, down = sample_rate // factor, reader.sample_rate // factor
+        frames = -(-reader.frames * up // down)
+        channels = reader.channels
+
+    ranges = [(m, min(m + CHUNK_FRAMES, frames)) for m in range(0, frames, CHUNK_FRAMES)]
+    with WavWriter(dest_path, sample_rate, channels, bits) as writer:
+        pending = []
+        for seed, (start, stop) in enumerate(ranges):
+            pending.append(
+                pool.submit(render_chunk, source_path, up, down, start, stop, bits, seed)
+            )
+            if len(pending) >= window:
+                writer.write(pending.pop(0).result())
+        for future in pending:
+            writer.write(future.result())
+    return dest_path
+
+
+def deliverable_path(source_path, sample_rate, bits):
+    """Output path for a deliverable, e.g. 'Mix_44.1k_16bit.wav'."""
+    stem, ext = os.path.splitext(source_path)
+    return f"{stem}_{sample_rate / 1000:g}k_{bits}bit{ext or '.wav'}"
+
+
+def render_deliverables(source_path, formats, workers=None):
+    """
+    Produce each requested format from a single master bounce.
+
+    Formats matching the master are skipped.
+
+    Args:
+        source_path: Master WAV path
+        formats: (sample_rate, bit_depth) tuples
+        workers: Worker processes (default: CPU count)
+
+    Returns:
+        list: Paths of the rendered deliverables
+    """
+    require_numpy()
+    with WavReader(source_path) as reader:
+        master = (reader.sample_rate, reader.bits)
+    paths = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for sample_rate, bits in formats:
+            if (sample_rate, bits) == master:
+                continue
+            dest = deliverable_path(source_path, sample_rate, bits)
+            print(f"Rendering {os.path.basename(dest)}...")
+            paths.append(render_deliverable(source_path, dest, sample_rate, bits, pool))
+    return paths
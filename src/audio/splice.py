@@ -0,0 +1,180 @@
+"""Splice a re-bounced time range into an earlier full bounce."""
+
+import os
+
+from .wav import WavReader, WavWriter, encode_pcm, require_numpy
+
+try:
+    import numpy as np
+except ImportError:
+    pass
+
+# Frames copied per read/write
+CHUNK_FRAMES = 1 << 16
+
+# Unchanged audio bounced on either side of the range, compared with the
+# old bounce before splicing and used for the crossfades
+HANDLE_SECONDS = 1.0
+CROSSFADE_SECONDS = 0.01
+
+# Audio bounced before the handle and thrown away, so reverb tails, delays
+# and compressors are already running when the handle starts, as they were
+# in the full bounce. Effects that remember more than this still make the
+# handle differ (and the mix is bounced in full).
+PREROLL_SECONDS = 5.0
+
+# Largest difference between old and new handles that counts as identical
+# (covers dither and floating-point noise)
+TOLERANCE_DB = -60.0
+
+
+def parse_time(text):
+    """
+    Parse a time like '95', '1:35' or '1:01:35.5' into seconds.
+
+    Raises:
+        ValueError: If the text isn't a time
+    """
+    seconds = 0.0
+    for part in text.strip().split(":"):
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+
+def parse_range(spec):
+    """
+    Parse a time range like '10:00-10:30' (from the start of the mix).
+
+    Args:
+        spec: Start and end time separated by '-'
+
+    Returns:
+        tuple: (start, end) in seconds
+
+    Raises:
+        ValueError: If the spec is malformed or the range is empty
+    """
+    start, sep, end = spec.partition("-")
+    if not sep:
+        raise ValueError(f"Invalid range {spec!r} (expected start-end, e.g. 10:00-10:30)")
+    start, end = parse_time(start), parse_time(end)
+    if not 0 <= start < end:
+        raise ValueError(f"Invalid range {spec!r}: end must be after start")
+    return start, end
+
+
+def _db(value):
+    """Amplitude ratio in dB (-inf for zero)."""
+    return 20 * np.log10(value) if value > 0 else float("-inf")
+
+
+def splice_range(
+    full_path, partial_path, dest_path, offset, start, stop, crossfade=None, preroll=0
+):
+    """
+    Write a copy of a full bounce with frames [start, stop) taken from a partial one.
+
+    The partial bounce starts at frame ``offset`` of the full one and
+    extends past both ends of the range (the handles), after ``preroll``
+    frames that are neither compared nor used. Before anything is
+    written, each handle is compared with the same frames of the full
+    bounce; they must match, or the two bounces don't line up (or the
+    change reaches beyond the range). The new audio is crossfaded in and
+    out inside the handles. Frames outside the crossfades are copied
+    byte for byte, streaming, so memory use doesn't depend on file length.
+
+    Args:
+        full_path: Earlier full bounce
+        partial_path: Bounce of the frames [offset, offset + its length)
+        dest_path: Output WAV path (may not be full_path)
+        offset: Frame of the full bounce where the partial one starts
+        start: First replaced frame
+        stop: End of the replaced frames (exclusive)
+        crossfade: Crossfade length in frames (default: CROSSFADE_SECONDS,
+            limited by the handles)
+        preroll: Frames at the start of the partial bounce, before the
+            pre-handle, that are ignored
+
+    Returns:
+        dict: Difference in dB between old and new audio in each handle
+
+    Raises:
+        ValueError: If the formats differ, the range isn't covered by the
+            partial bounce or the handles don't match
+    """
+    require_numpy()
+    with WavReader(full_path) as full, WavReader(partial_path) as part:
+        fmt = (full.sample_rate, full.channels, full.bits, full.is_float)
+        if fmt != (part.sample_rate, part.channels, part.bits, part.is_float):
+            raise ValueError("Partial bounce format differs from the full bounce")
+        if full.is_float:
+            raise ValueError("Splicing needs integer PCM bounces")
+        end = offset + part.frames
+        if not 0 <= offset <= offset + preroll <= start < stop <= min(end, full.frames):
+            raise ValueError(
+                f"Partial bounce (frames {offset}-{end}) doesn't cover {start}-{stop}"
+            )
+        pre, post = start - offset - preroll, min(end, full.frames) - stop
+        if crossfade is None:
+            crossfade = int(full.sample_rate * CROSSFADE_SECONDS)
+        # Ends of the file need no crossfade (and have no handle)
+        fade_in = min(crossfade, pre)
+        fade_out = min(crossfade, post)
+
+        # Verify the handles line up before touching anything
+        limit = 10 ** (TOLERANCE_DB / 20)
+        diffs = {}
+        for name, lo, hi in (("pre", start - pre, start), ("post", stop, stop + post)):
+            if hi <= lo:
+                diffs[name] = None
+                continue
+            diff = np.abs(full.read(lo, hi) - part.read(lo - offset, hi - offset)).max()
+            diffs[name] = round(float(_db(diff)), 1)
+            if diff > limit:
+                raise ValueError(
+                    f"Re-bounced audio differs from the previous bounce {name} the "
+                    f"range ({diffs[name]} dB) - the bounces don't line up or the "
+                    "change reaches outside the range"
+                )
+
+        def copy(reader, lo, hi, shift=0):
+            for at in range(lo, hi, CHUNK_FRAMES):
+                writer.write(reader.read_raw(at - shift, min(at + CHUNK_FRAMES, hi) - shift))
+
+        def fade(lo, hi, rising):
+            if hi <= lo:
+                return
+            weight = (np.arange(hi - lo) + 0.5) / (hi - lo)
+            if not rising:
+                weight = 1 - weight
+            old, new = full.read(lo, hi), part.read(lo - offset, hi - offset)
+            mixed = old + (new - old) * weight[:, None]
+            writer.write(encode_pcm(mixed, full.bits))
+
+        with WavWriter(dest_path, full.sample_rate, full.channels, full.bits) as writer:
+            copy(full, 0, start - fade_in)
+            fade(start - fade_in, start, rising=True)
+            copy(part, start, stop, shift=offset)
+            fade(stop, stop + fade_out, rising=False)
+            copy(full, stop + fade_out, full.frames)
+    return diffs
+
+
+def replace_range(full_path, partial_path, offset, start, stop, preroll=0):
+    """
+    Splice a partial bounce into a full bounce in place.
+
+    The result is written next to the full bounce and renamed over it, so
+    the old bounce stays intact if anything fails.
+
+    Returns:
+        dict: Handle differences, see ``splice_range``
+    """
+    tmp = f"{full_path}.splice"
+    try:
+        diffs = splice_range(full_path, partial_path, tmp, offset, start, stop, preroll=preroll)
+        os.replace(tmp, full_path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return diffs
@@ -0,0 +1,291 @@
+"""Chunked, memory-mapped WAV reading and writing."""
+
+import mmap
+import struct
+
+try:
+    import numpy as np
+
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+# Largest size a RIFF chunk header can hold; bigger files are written as RF64
+RIFF_LIMIT = 0xFFFFFFFF
+# Body of a ds64 chunk (RIFF size, data size, sample count, table length),
+# reserved up front as a JUNK chunk so the header can grow into RF64 in place
+DS64_SIZE = 28
+
+
+def require_numpy():
+    """
+    Raise a clear error if NumPy is missing.
+
+    Raises:
+        RuntimeError: If NumPy is not installed
+    """
+    if not HAS_NUMPY:
+        raise RuntimeError(
+            "NumPy is required for audio processing. Install it with: pip install numpy"
+        )
+
+
+class WavReader:
+    """
+    Random access to the samples of a PCM or float WAV file via mmap.
+
+    Only the frames requested by ``read`` are decoded, so arbitrarily large
+    files are processed in constant memory. RIFF and RF64 files with 16,
+    24 or 32-bit integer or 32-bit float samples are supported. Header
+    fields and ``read_raw`` work without NumPy.
+    """
+
+    def __init__(self, path):
+        """
+        Open a WAV file.
+
+        Args:
+            path: Path to the WAV file
+
+        Raises:
+            ValueError: If the file is not a supported WAV file
+        """
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._parse()
+        except Exception:
+            self._file.close()
+            raise
+
+    def _parse(self):
+        """Locate the fmt and data chunks."""
+        mm = self._mm
+        riff, _, wave = struct.unpack_from("<4sI4s", mm, 0)
+        if riff not in (b"RIFF", b"RF64") or wave != b"WAVE":
+            raise ValueError(f"Not a WAV file: {self.path}")
+
+        fmt = None
+        data_size_64 = None
+        offset = 12
+        while offset + 8 <= len(mm):
+            chunk_id, chunk_size = struct.unpack_from("<4sI", mm, offset)
+            body = offset + 8
+            if chunk_id == b"ds64":
+                # RF64: real data size lives here, the data chunk says 0xFFFFFFFF
+                data_size_64 = struct.unpack_from("<Q", mm, body + 8)[0]
+            elif chunk_id == b"fmt ":
+                fmt = struct.unpack_from("<HHIIHH", mm, body)
+                if fmt[0] == WAVE_FORMAT_EXTENSIBLE and chunk_size >= 40:
+                    # Sub-format GUID starts with the real format tag
+                    sub_format = struct.unpack_from("<H", mm, body + 24)[0]
+                    fmt = (sub_format,) + fmt[1:]
+            elif chunk_id == b"data":
+                if fmt is None:
+                    raise ValueError(f"WAV data before fmt chunk: {self.path}")
+                size = chunk_size
+                if size == 0xFFFFFFFF and data_size_64 is not None:
+                    size = data_size_64
+                self.data_offset = body
+                self.data_size = min(size, len(mm) - body)
+                # Header promises more audio than the file holds (cut-off copy)
+                self.truncated = size > len(mm) - body
+                break
+            offset = body + chunk_size + (chunk_size & 1)
+        else:
+            raise ValueError(f"No data chunk in WAV file: {self.path}")
+
+        format_tag, self.channels, self.sample_rate, _, self.block_align, self.bits = fmt
+        if format_tag == WAVE_FORMAT_PCM and self.bits in (16, 24, 32):
+            self.is_float = False
+        elif format_tag == WAVE_FORMAT_IEEE_FLOAT and self.bits == 32:
+            self.is_float = True
+        else:
+            raise ValueError(
+                f"Unsupported WAV format (tag {format_tag:#x}, {self.bits}-bit): {self.path}"
+            )
+        self.frames = self.data_size // self.block_align
+
+    def read(self, start, stop):
+        """
+        Decode a range of frames, zero-padding outside the file.
+
+        Args:
+            start: First frame (may be negative)
+            stop: End frame, exclusive (may be past the end)
+
+        Returns:
+            numpy.ndarray: float64 array of shape (stop - start, channels),
+            scaled to [-1.0, 1.0)
+        """
+        require_numpy()
+        out = np.zeros((max(stop - start, 0), self.channels))
+        lo, hi = max(start, 0), min(stop, self.frames)
+        if hi <= lo:
+            return out
+
+        width = self.bits // 8
+        raw = np.frombuffer(
+            self._mm,
+            dtype=np.uint8,
+            count=(hi - lo) * self.block_align,
+            offset=self.data_offset + lo * self.block_align,
+        )
+        if self.is_float:
+            samples = raw.view("<f4").astype(np.float64)
+        elif width == 3:
+            b = raw.reshape(-1, 3).astype(np.int32)
+            samples = (b[:, 0] | (b[:, 1] << 8) | (b[:, 2] << 16)) << 8 >> 8
+            samples = samples / float(1 << 23)
+        else:
+            samples = raw.view(f"<i{width}") / float(1 << (self.bits - 1))
+        out[lo - start : hi - start] = samples.reshape(-1, self.channels)
+        return out
+
+    def read_raw(self, start, stop):
+        """
+        Return the undecoded sample bytes of frames [start, stop).
+
+        Args:
+            start: First frame
+            stop: End frame, exclusive (clamped to the file length)
+
+        Returns:
+            bytes: Interleaved sample data as stored in the file
+        """
+        start, stop = max(start, 0), min(stop, self.frames)
+        begin = self.data_offset + start * self.block_align
+        return self._mm[begin : begin + max(stop - start, 0) * self.block_align]
+
+    def close(self):
+        """Release the memory map and file."""
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
+
+
+def encode_pcm(samples, bits, dither=None):
+    """
+    Quantize float samples to little-endian integer PCM bytes.
+
+    Args:
+        samples: float array of shape (frames, channels) in [-1.0, 1.0)
+        bits: Target bit depth (16, 24 or 32)
+        dither: Optional numpy Generator; adds TPDF dither of +-1 LSB
+
+    Returns:
+        bytes: Interleaved PCM data
+    """
+    scale = float(1 << (bits - 1))
+    scaled = samples * scale
+    if dither is not None:
+        scaled = scaled + dither.random(scaled.shape) - dither.random(scaled.shape)
+    ints = np.clip(np.round(scaled), -scale, scale - 1).astype("<i4")
+    if bits == 32:
+        return ints.tobytes()
+    if bits == 16:
+        return ints.astype("<i2").tobytes()
+    # 24-bit: keep the low three bytes of each little-endian int32
+    return ints.view(np.uint8).reshape(-1, 4)[:, :3].tobytes()
+
+
+class WavWriter:
+    """
+    Stream integer PCM frames to a WAV file, patching sizes on close.
+
+    Room for a ds64 chunk is reserved as a JUNK chunk, so a file that ends
+    up over 4 GiB is finished as RF64 instead of overflowing the RIFF sizes.
+    """
+
+    def __init__(self, path, sample_rate, channels, bits):
+        """
+        Create a WAV file.
+
+        Args:
+            path: Output path
+            sample_rate: Sample rate in Hz
+            channels: Number of channels
+            bits: Bit depth (16, 24 or 32)
+        """
+        self.path = path
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.bits = bits
+        self.block_align = channels * bits // 8
+        self.data_size = 0
+        self._file = open(path, "wb")
+        self._write_header()
+
+    def _write_header(self):
+        """Write the RIFF/RF64, ds64 (or JUNK), fmt and data headers for the current size."""
+        riff_size = 4 + (8 + DS64_SIZE) + (8 + 16) + 8 + self.data_size + (self.data_size & 1)
+        if riff_size > RIFF_LIMIT:
+            riff = struct.pack("<4sI4s", b"RF64", 0xFFFFFFFF, b"WAVE")
+            reserved = struct.pack(
+                "<4sIQQQI",
+                b"ds64",
+                DS64_SIZE,
+                riff_size,
+                self.data_size,
+                self.data_size // self.block_align,
+                0,
+            )
+            data_size = 0xFFFFFFFF
+        else:
+            riff = struct.pack("<4sI4s", b"RIFF", riff_size, b"WAVE")
+            reserved = struct.pack("<4sI", b"JUNK", DS64_SIZE) + bytes(DS64_SIZE)
+            data_size = self.data_size
+        self._file.write(riff + reserved)
+        self._file.write(
+            struct.pack(
+                "<4sIHHIIHH4sI",
+                b"fmt ",
+                16,
+                WAVE_FORMAT_PCM,
+                self.channels,
+                self.sample_rate,
+                self.sample_rate * self.block_align,
+                self.block_align,
+                self.bits,
+                b"data",
+                data_size,
+            )
+        )
+
+    def write(self, data):
+        """
+        Append encoded PCM bytes (see encode_pcm).
+
+        Args:
+            data: Interleaved PCM bytes
+        """
+        self._file.write(data)
+        self.data_size += len(data)
+
+    def close(self):
+        """Finish the file: pad to even length and fill in chunk sizes."""
+        if self.data_size & 1:
+            self._file.write(b"\0")
+        self._file.seek(0)
+        self._write_header()
+        self._file.close()
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
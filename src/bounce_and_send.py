@@ -6,27 +6,61 @@ This script bounces the current Pro Tools session and uploads it to MASV.
 Can be triggered manually or via Keyboard Maestro.
 """
 
+import contextvars
+import hashlib
 import os
+import shutil
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from dotenv import load_dotenv
 
-# Try to import tkinter, but make it optional
-try:
-    import tkinter as tk
-    from tkinter import messagebox, simpledialog
 
-    HAS_GUI = True
-except ImportError:
-    HAS_GUI = False
-    print("Note: GUI not available (tkinter not installed). Using CLI mode.")
+def _has_gui():
+    """
+    Import tkinter on demand; it's only needed for GUI mode.
+
+    Returns:
+        bool: True if tkinter is available
+    """
+    global tk, messagebox, simpledialog
+    try:
+        import tkinter as tk
+        from tkinter import messagebox, simpledialog
+    except ImportError:
+        print("Note: GUI not available (tkinter not installed). Using CLI mode.")
+        return False
+    return True
+
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from src import timing
 from src.masv import MASVClient
-from src.protools import ProToolsClient
+from src.pipeline import (
+    BouncePipeline,
+    Destination,
+    Job,
+    JobJournal,
+    parse_destination,
+    parse_destinations,
+)
+from src.pipeline.batch import find_sessions, write_manifest
+from src.pipeline.compress import compress_for_upload
+from src.pipeline.dedup import DeliveryIndex, content_hash
+from src.pipeline.folder_watch import FolderWatcher
+from src.pipeline.session_delta import (
+    HashIndex,
+    SessionDeliveries,
+    build_manifest,
+    diff_manifests,
+    stage_package,
+)
+from src.protools import BounceCache, Rig, parse_rigs, parse_stems
 
 
 class BounceAndSendApp:
@@ -64,11 +98,128 @@ class BounceAndSendApp:
         self.bounce_format = os.getenv("DEFAULT_BOUNCE_FORMAT", "WAV")
         self.bit_depth = int(os.getenv("DEFAULT_BIT_DEPTH", "24"))
         self.sample_rate = int(os.getenv("DEFAULT_SAMPLE_RATE", "48000"))
+        # Extra formats derived from the bounce, e.g. "48000/24,44100/16"
+        self.deliverables_spec = os.getenv("DELIVERABLES", "")
+        self.deliverables = []
+        if self.deliverables_spec:
+            # Audio modules load NumPy, so they're only imported when used
+            from src.audio.resample import parse_formats
+
+            self.deliverables = parse_formats(self.deliverables_spec)
+        # Lossless compression before upload: off, auto (only when it saves
+        # time at the measured uplink speed) or always; optional zip container
+        self.compress = os.getenv("MASV_COMPRESS", "off").lower()
+        self.compress_container = os.getenv("MASV_COMPRESS_CONTAINER", "") or None
+        # Quality check of each WAV bounce before it is sent: off, warn (print
+        # problems and send anyway) or block (fail the job instead)
+        self.qc_policy = os.getenv("QC_POLICY", "warn").lower()
+        target_lufs = os.getenv("QC_TARGET_LUFS", "")
+        # QCLimits arguments (the QC module is imported on first check)
+        self.qc_limits = dict(
+            max_true_peak=float(os.getenv("QC_MAX_TRUE_PEAK", "-1.0")),
+            target_lufs=float(target_lufs) if target_lufs else None,
+            lufs_tolerance=float(os.getenv("QC_LUFS_TOLERANCE", "2")),
+            max_silence=float(os.getenv("QC_MAX_SILENCE", "10")),
+        )
+        # Preview proxy: a small AAC (or low-rate WAV) copy of the bounce is
+        # sent as its own package first, at high priority, while the
+        # full-resolution upload continues (MASV_PREVIEW=on)
+        self.preview = os.getenv("MASV_PREVIEW", "off").lower() in ("on", "1", "true")
+        self.preview_bitrate = os.getenv("MASV_PREVIEW_BITRATE", "128k")
+        # Stems mode: comma-separated mix sources, e.g. "Dialog,Music,output:Out 1-2"
+        self.stems = parse_stems(os.getenv("BOUNCE_STEMS", ""))
 
-        # Bounce output directory
-        self.bounce_dir = os.path.expanduser("~/Desktop/ProTools_Bounces")
+        # Output directory (batch reports). Pro Tools itself writes each
+        # bounce into its session's Bounced Files folder, on the rig.
+        self.bounce_dir = os.path.expanduser(
+            os.getenv("BOUNCE_DIR", "~/Desktop/ProTools_Bounces")
+        )
         os.makedirs(self.bounce_dir, exist_ok=True)
 
+        # Uploads of finished bounces run concurrently with the next bounce
+        self.upload_workers = int(os.getenv("MASV_UPLOAD_WORKERS", "3"))
+        self._pipeline = None
+        self._masv = None
+        self._lock = threading.Lock()
+        # Held while the MASV client is built (which may start the agent),
+        # so building it never blocks the pipeline behind self._lock
+        self._masv_lock = threading.Lock()
+
+        # Skip re-uploading a bounce identical to one already delivered
+        # to the same destination (MASV_DEDUP=off to always upload)
+        self.dedup = os.getenv("MASV_DEDUP", "on").lower() not in ("off", "0", "false")
+        self._delivered = DeliveryIndex()
+        # Hashing, and QC that runs alongside the upload (QC_POLICY=warn)
+        self._hash_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="hash")
+
+        # MASV preflight runs while the bounce renders, so a missing agent or
+        # a bad key/team/portal fails the job before the upload is due.
+        # MASV_PREFLIGHT=agent skips the web API checks of the account
+        self.preflight_mode = os.getenv("MASV_PREFLIGHT", "full").lower()
+        self._preflight_pool = ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="preflight"
+        )
+
+        # Session folders (--session-folder) are sent as deltas: only files
+        # whose content changed since the last delivery to a destination.
+        # Hashes are cached by (mtime, size); MASV_SESSION_HASH_WORKERS files
+        # are hashed at once
+        hash_workers = int(os.getenv("MASV_SESSION_HASH_WORKERS", "0")) or None
+        self._hash_index = HashIndex(workers=hash_workers)
+        self._session_deliveries = SessionDeliveries()
+
+        # Fan-out: deliver each bounce to several portals / recipient groups,
+        # e.g. "portal:clientname; email:producer@x.com,mixer@y.com". Uploads
+        # to the destinations run concurrently, at most MASV_FANOUT_CONCURRENCY
+        # at a time across all jobs
+        self.destinations = parse_destinations(os.getenv("MASV_DESTINATIONS", ""))
+        self.fanout_concurrency = int(os.getenv("MASV_FANOUT_CONCURRENCY", "3"))
+        self._fanout_pool = ThreadPoolExecutor(
+            max_workers=max(self.fanout_concurrency, 1), thread_name_prefix="fanout"
+        )
+
+        # Watch-folder mode: send files bounced by hand from Pro Tools.
+        # WATCH_FOLDERS is a list like PATH (default: the open session's
+        # Bounced Files folder); files must be unchanged for WATCH_SETTLE
+        # seconds, and files arriving within WATCH_COALESCE seconds of each
+        # other are sent as one package
+        self.watch_folders = [
+            f for f in os.getenv("WATCH_FOLDERS", "").split(os.pathsep) if f.strip()
+        ]
+        self.watch_settle = float(os.getenv("WATCH_SETTLE", "3"))
+        self.watch_coalesce = float(os.getenv("WATCH_COALESCE", "5"))
+        # Files this app wrote itself (path -> mtime), which the watcher skips
+        self._own_files = {}
+
+        # Every phase change is journaled so a crash mid-upload can be resumed
+        self.journal = JobJournal()
+
+        # Reuse the previous bounce while the saved session is unchanged
+        # (BOUNCE_CACHE=on); old bounces are deleted past BOUNCE_CACHE_MAX_GB
+        self.bounce_cache = None
+        if os.getenv("BOUNCE_CACHE", "off").lower() in ("on", "1", "true"):
+            max_gb = float(os.getenv("BOUNCE_CACHE_MAX_GB", "20"))
+            self.bounce_cache = BounceCache(max_bytes=int(max_gb * 1024**3))
+
+        # Several Pro Tools machines, e.g. "studio-a=10.0.0.11, studio-b=10.0.0.12:31416";
+        # each bounces one job at a time and all feed the same upload workers.
+        # Without PROTOOLS_RIGS the one rig is PROTOOLS_HOST/PROTOOLS_PORT
+        self.rigs = parse_rigs(
+            os.getenv("PROTOOLS_RIGS", ""), self.protools_port, self.bounce_cache
+        ) or [
+            Rig(
+                self.protools_host,
+                self.protools_host,
+                self.protools_port,
+                bounce_cache=self.bounce_cache,
+            )
+        ]
+        self.rig_health_interval = float(os.getenv("PROTOOLS_RIG_HEALTH_INTERVAL", "30"))
+
+        # Partial re-bounces (--range) select timeline samples; the mix
+        # starts at BOUNCE_TIMELINE_START on the timeline
+        self.timeline_start = int(os.getenv("BOUNCE_TIMELINE_START", "0"))
+
     def validate_config(self):
         """Validate that all required configuration is present."""
         if not self.masv_api_key:
@@ -76,106 +227,951 @@ class BounceAndSendApp:
         if not self.masv_team_id:
             raise ValueError("MASV_TEAM_ID not found in .env file")
 
+    @property
+    def pipeline(self):
+        """The bounce/upload pipeline, started on first use."""
+        with self._lock:
+            if self._pipeline is None:
+                self._pipeline = BouncePipeline(
+                    self._phase("bounce", self._bounce),
+                    self._phase("send", self._send),
+                    upload_workers=self.upload_workers,
+                    on_error=self._report_error,
+                    rigs=self.rigs,
+                    health_interval=self.rig_health_interval,
+                )
+            return self._pipeline
+
+    def _phase(self, name, step):
+        """
+        Wrap a pipeline step in a timing span (and a profile, if enabled).
+
+        Spans opened by the clients during the step are tagged with the job ID.
+        """
+
+        def run(job):
+            started = time.perf_counter()
+            try:
+                with timing.context(job=job.id), timing.profile(f"{job.id}-{name}"):
+                    with timing.span(
+                        f"job.{name}", waited=round(time.time() - job.created_at, 3)
+                    ):
+                        step(job)
+            finally:
+                job.timings[name] = time.perf_counter() - started
+
+        return run
+
+    def _get_masv(self):
+        """Return the MASV client shared by all upload workers."""
+        with self._masv_lock:
+            if self._masv is None:
+                masv = MASVClient(self.masv_api_key, self.masv_team_id)
+                with self._lock:
+                    self._masv = masv
+            return self._masv
+
+    def _rig(self, name=None):
+        """
+        Return a configured rig by name (default: the first one).
+
+        Raises:
+            ValueError: If no rig has that name
+        """
+        if name is None:
+            return self.rigs[0]
+        for rig in self.rigs:
+            if rig.name == name:
+                return rig
+        raise ValueError(
+            f"Unknown Pro Tools rig {name!r} (configured: "
+            f"{', '.join(rig.name for rig in self.rigs)})"
+        )
+
+    def rig_status(self):
+        """Health, queued jobs and current bounce of each Pro Tools rig."""
+        if self._pipeline is None:
+            return [{**rig.status(), "queued": 0, "bouncing": None} for rig in self.rigs]
+        return self._pipeline.status()
+
+    def enqueue(
+        self,
+        recipients=None,
+        portal_subdomain=None,
+        destinations=None,
+        session_path=None,
+        rig=None,
+        bounce_range=None,
+    ):
+        """
+        Queue a bounce-and-send job and return without waiting for it.
+
+        Bounces run one at a time on each rig; uploads of finished bounces
+        run concurrently with later bounces.
+
+        Args:
+            recipients: List of recipient email addresses (for email mode)
+            portal_subdomain: Portal subdomain (for portal mode)
+            destinations: Destinations to fan out to (default: MASV_DESTINATIONS
+                unless recipients or a portal are given)
+            session_path: Session file to open and bounce (default: the
+                session open in Pro Tools)
+            rig: Pro Tools rig to bounce on (default: the least busy one)
+            bounce_range: (start, end) seconds from the start of the mix; only
+                this part is re-bounced and spliced into the cached bounce
+
+        Returns:
+            Job: Handle to wait on (``job.result()``) or inspect
+        """
+        # Validate configuration before anything is queued
+        self.validate_config()
+        if rig is not None:
+            self._rig(rig)
+        job = Job(
+            recipients=recipients,
+            portal_subdomain=portal_subdomain,
+            destinations=destinations,
+            session_path=session_path,
+            rig=rig,
+            bounce_range=bounce_range,
+        )
+        self._start_preflight(job)
+        self.journal.record(job, "queued")
+        print(f"Queued job {job.id} (position {self.pipeline.queue_depth + 1})")
+        return self.pipeline.submit(job)
+
+    def resume_interrupted(self):
+        """
+        Pick up jobs left unfinished by a previous run that crashed or was killed.
+
+        Jobs whose upload had started are monitored and finalized (or
+        re-uploaded if the agent no longer knows the upload); jobs that had
+        finished bouncing are uploaded. Jobs interrupted mid-bounce are marked
+        failed - the session may have changed since, so they aren't bounced again.
+
+        Returns:
+            list: Resumed jobs
+        """
+        resumed = []
+        for job in self.journal.interrupted():
+            if job.phase in ("queued", "bouncing"):
+                job.finish(RuntimeError("Interrupted before the bounce finished"))
+                self.journal.record(job, "failed")
+                print(f"Job {job.id} was interrupted while bouncing - press again to redo it")
+                continue
+            missing = [path for path in job.files if not os.path.exists(path)]
+            if not job.files or missing:
+                job.finish(FileNotFoundError(f"Bounce files gone: {', '.join(missing)}"))
+                self.journal.record(job, "failed")
+                print(f"Job {job.id} can't be resumed: bounce files are gone")
+                continue
+            print(f"Resuming job {job.id} ({job.session_name}, {job.phase})")
+            resumed.append(self.pipeline.resume(job))
+        return resumed
+
+    def shutdown(self):
+        """Wait for queued bounces and in-flight uploads to finish, then disconnect."""
+        if self._pipeline is not None:
+            self._pipeline.shutdown(wait=True)
+            self._pipeline = None
+        self._hash_pool.shutdown(wait=True)
+        self._fanout_pool.shutdown(wait=True)
+        self._preflight_pool.shutdown(wait=True)
+        for rig in self.rigs:
+            rig.close()
+        if self._masv is not None:
+            self._masv.close()
+        self.journal.close()
+
     def bounce_and_send(self, recipients=None, portal_subdomain=None):
         """
         Main workflow: bounce Pro Tools session and send to MASV.
 
+        Queues the job and blocks until it is delivered.
+
         Args:
             recipients: List of recipient email addresses (for email mode)
             portal_subdomain: Portal subdomain (for portal mode)
+
+        Returns:
+            tuple: (bounce_path, package_id)
         """
         try:
-            # Validate configuration
-            self.validate_config()
+            job = self.enqueue(recipients, portal_subdomain)
+        except Exception as e:
+            print(f"\n✗ ERROR: {str(e)}")
+            raise
+        return job.result()
 
-            # Connect to Pro Tools
-            print("=" * 60)
-            print("BOUNCE AND SEND TO MASV")
-            print("=" * 60)
+    def _bounce(self, job):
+        """
+        Bounce the current session, or the job's session file, to disk.
 
-            with ProToolsClient(self.protools_host, self.protools_port) as pt:
+        Runs on the bounce worker of the job's rig.
+        """
+        print("=" * 60)
+        print("BOUNCE AND SEND TO MASV")
+        print("=" * 60)
+        self.journal.record(job, "bouncing")
+
+        # Don't start a bounce that can't be sent
+        if job.preflight is not None and job.preflight.done():
+            self._await_preflight(job)
+
+        rig = self._rig(job.rig)
+        if len(self.rigs) > 1:
+            print(f"Rig: {rig.name} ({rig.address})")
+        try:
+            pt = rig.client()
+            if job.session_path:
+                pt.open_session(job.session_path)
+
+            try:
                 # Get session info
                 session_info = pt.get_session_info()
-                session_name = session_info.get("session_name", "untitled")
-                print(f"\nSession: {session_name}")
+                job.session_name = session_info.get("session_name", "untitled")
+                print(f"\nSession: {job.session_name}")
 
                 # Bounce to disk
                 print(f"\nBouncing to: {self.bounce_dir}")
-                bounce_path = pt.bounce_to_disk(
-                    self.bounce_dir,
-                    file_name=session_name,
+                options = dict(
+                    file_name=job.session_name,
                     file_type=self.bounce_format,
                     bit_depth=self.bit_depth,
                     sample_rate=self.sample_rate,
+                    stems=self.stems or None,
                 )
+                if job.bounce_range:
+                    start, end = job.bounce_range
+                    bounced = pt.bounce_range(
+                        self.bounce_dir, start, end,
+                        timeline_start=self.timeline_start, **options
+                    )
+                else:
+                    bounced = pt.bounce_to_disk(self.bounce_dir, **options)
+            finally:
+                if job.session_path:
+                    # Batch jobs leave the session unsaved; a failed close
+                    # doesn't undo a finished bounce (the next open retries)
+                    try:
+                        pt.close_session(save=False)
+                    except Exception as e:
+                        print(f"Warning: could not close {job.session_path}: {e}")
+        except Exception:
+            # Connection may be stale (Pro Tools restarted); reconnect next job
+            rig.drop()
+            raise
+
+        # Stems mode returns one path per source
+        bounced = bounced if isinstance(bounced, list) else [bounced]
+        # Paths are as the rig sees them; uploads read them here
+        missing = [path for path in bounced if not os.path.isfile(path)]
+        if missing:
+            raise RuntimeError(
+                f"Bounce from {rig.name} not found on this machine: {missing[0]} - "
+                "session folders must be mounted at the same path here and on every rig"
+            )
+        job.files = bounced
+        job.bounce_path = job.files[0]
+        self._mark_own(job.files)
+        self.journal.record(job, "bounced")
+
+        if self.dedup:
+            # Start hashing now so it overlaps the wait for an upload worker
+            job.hash_future = self._hash_pool.submit(content_hash, job.files)
+
+    def _mark_own(self, paths):
+        """Remember files written by this app so the folder watcher skips them."""
+        for path in paths:
+            try:
+                self._own_files[path] = os.stat(path).st_mtime_ns
+            except OSError:
+                pass
+
+    def enqueue_files(self, files, session_name=None, destinations=None):
+        """
+        Queue already-rendered files for upload, skipping the bounce.
+
+        Args:
+            files: Paths to send as one package
+            session_name: Name used for the package (default: first file's name)
+            destinations: Destinations to fan out to (default: as for ``enqueue``)
+
+        Returns:
+            Job: Handle to wait on or inspect
+        """
+        self.validate_config()
+        job = Job(destinations=destinations)
+        job.files = list(files)
+        job.bounce_path = job.files[0]
+        job.session_name = session_name or os.path.splitext(
+            os.path.basename(job.files[0])
+        )[0]
+        self.journal.record(job, "bounced")
+        print(f"Queued job {job.id}: {len(job.files)} file(s) from {job.session_name}")
+        return self.pipeline.resume(job)
+
+    def send_session_folder(self, folder, destinations=None, full=False):
+        """
+        Send a session folder, uploading only what changed since the last delivery.
+
+        A manifest of every file's size and SHA-256 is built (unchanged
+        files aren't re-read) and compared with the manifest last delivered
+        to each destination. New and changed files are sent, in their
+        folder layout, together with session_manifest.json, which also lists
+        removed files and the package the delta builds on.
 
-            # Upload to MASV based on delivery mode
-            masv = MASVClient(self.masv_api_key, self.masv_team_id)
-
-            if self.delivery_mode == "portal":
-                # Portal upload
-                subdomain = portal_subdomain or self.portal_url
-                if not subdomain:
-                    raise ValueError("Portal URL/subdomain not configured in .env file")
-                print(f"\nSending to portal: {subdomain}")
-                package_id = masv.send_file(
-                    bounce_path,
-                    description=f"Pro Tools Bounce: {session_name}",
-                    portal_subdomain=subdomain,
+        Args:
+            folder: Session folder (containing the .ptx and Audio Files)
+            destinations: Destinations to send to (default: as for ``enqueue``)
+            full: Send every file, ignoring earlier deliveries
+
+        Returns:
+            dict: Destination key to package ID (the earlier package if
+            nothing changed)
+        """
+        self.validate_config()
+        folder = os.path.realpath(os.path.expanduser(folder))
+        job = Job(destinations=destinations)
+        destinations = self._destinations(job)
+        # Get the agent ready while the folder is hashed
+        self._start_preflight(job)
+
+        print(f"Scanning {folder}...")
+        started = time.perf_counter()
+        with timing.span("session.manifest"):
+            manifest = build_manifest(folder, self._hash_index)
+        self._hash_index.forget_missing(folder)
+        size = sum(entry["size"] for entry in manifest["files"].values())
+        print(
+            f"{len(manifest['files'])} files, {size / (1024 * 1024):.1f} MB "
+            f"({time.perf_counter() - started:.1f}s)"
+        )
+
+        masv = self._await_preflight(job)
+        futures = {
+            d.key: self._fanout_pool.submit(
+                contextvars.copy_context().run,
+                self._send_session_delta,
+                folder,
+                manifest,
+                d,
+                masv,
+                full,
+            )
+            for d in destinations
+        }
+        errors = [f.exception() for f in futures.values() if f.exception() is not None]
+        if errors:
+            raise errors[0]
+        return {key: future.result() for key, future in futures.items()}
+
+    def _send_session_delta(self, folder, manifest, destination, masv, full):
+        """
+        Send one destination the files it doesn't have yet (runs on the fan-out pool).
+
+        Returns:
+            str: Package ID
+        """
+        previous = None if full else self._session_deliveries.lookup(folder, destination.key)
+        changed, removed = diff_manifests(previous and previous["manifest"], manifest)
+        if previous and not changed and not removed:
+            print(
+                f"\n{destination.label} already has this session "
+                f"(package {previous['package_id']}) - skipping upload"
+            )
+            return previous["package_id"]
+
+        package_manifest = dict(
+            manifest,
+            base_package=previous["package_id"] if previous else None,
+            changed=changed,
+            removed=removed,
+        )
+        size = sum(manifest["files"][rel]["size"] for rel in changed)
+        print(
+            f"\nSending {len(changed)} new/changed file(s) ({size / (1024 * 1024):.1f} MB)"
+            + (f", {len(removed)} removed," if removed else "")
+            + f" to {destination.label}"
+        )
+        with timing.span("session.deliver", destination=destination.key, files=len(changed)):
+            root = stage_package(folder, changed, package_manifest)
+            try:
+                package_id = masv.send_files(
+                    [root],
+                    recipients=destination.recipients,
+                    description=f"Pro Tools Session: {manifest['session']}",
+                    name=manifest["session"],
+                    portal_subdomain=destination.portal_subdomain,
                     portal_password=self.portal_password
-                    if self.portal_password
+                    if self.portal_password and destination.portal_subdomain
                     else None,
+                    priority=destination.priority,
                 )
-                destination = f"Portal: {subdomain}"
-            else:
-                # Email upload
-                emails = recipients or [
-                    email.strip()
-                    for email in self.default_recipients.split(",")
-                    if email.strip()
-                ]
-                if not emails:
-                    raise ValueError("No recipients specified for email delivery")
-                print(f"\nSending to: {', '.join(emails)}")
-                package_id = masv.send_file(
-                    bounce_path,
-                    recipients=emails,
-                    description=f"Pro Tools Bounce: {session_name}",
+            finally:
+                shutil.rmtree(os.path.dirname(root), ignore_errors=True)
+        # The package was staged from the live files: if any changed after
+        # they were hashed, the recipient may not have what the manifest says
+        modified = self._hash_index.modified(
+            [os.path.join(folder, *rel.split("/")) for rel in changed]
+        )
+        if modified:
+            names = ", ".join(os.path.relpath(path, folder) for path in modified[:5])
+            more = f" and {len(modified) - 5} more" if len(modified) > 5 else ""
+            raise RuntimeError(
+                f"{len(modified)} file(s) changed while the session was being sent "
+                f"to {destination.label} ({names}{more}); package {package_id} was not "
+                "recorded - send the session again"
+            )
+        self._session_deliveries.record(folder, destination.key, package_id, manifest)
+        print(f"\n✓ Session sent to {destination.label} (package {package_id})")
+        return package_id
+
+    def _start_preflight(self, job):
+        """Start checking, in the background, that the job can be uploaded."""
+        job.preflight = self._preflight_pool.submit(self._preflight, job)
+        return job.preflight
+
+    def _preflight(self, job):
+        """
+        Check the MASV agent, account and the job's portals (runs on the preflight pool).
+
+        Returns:
+            MASVClient: The shared, ready client
+        """
+        with timing.context(job=job.id):
+            destinations = self._destinations(job)
+            masv = self._get_masv()
+            masv.preflight(
+                [d.portal_subdomain for d in destinations if d.portal_subdomain],
+                check_account=self.preflight_mode != "agent",
+            )
+        return masv
+
+    def _await_preflight(self, job):
+        """
+        Wait for the job's MASV preflight (starting it if needed).
+
+        Returns:
+            MASVClient: The shared, ready client
+
+        Raises:
+            RuntimeError: If the preflight failed
+        """
+        if job.preflight is None:
+            # Resumed and pre-rendered jobs skip enqueue
+            self._start_preflight(job)
+        with timing.span("masv.preflight_wait"):
+            try:
+                return job.preflight.result()
+            except Exception as e:
+                raise RuntimeError(f"MASV preflight failed: {e}") from e
+
+    def _resolve_watch_folders(self, folders=None):
+        """
+        Folders to watch: as given, WATCH_FOLDERS, or the open session's
+        Bounced Files folder.
+        """
+        folders = list(folders or self.watch_folders)
+        if not folders:
+            session_path = self._rig().client().get_session_path()
+            if not session_path:
+                raise ValueError(
+                    "No folders to watch: set WATCH_FOLDERS or open a session in Pro Tools"
                 )
-                destination = ", ".join(emails)
+            folders = [os.path.join(os.path.dirname(session_path), "Bounced Files")]
+        resolved = []
+        for folder in folders:
+            folder = os.path.abspath(os.path.expanduser(folder))
+            if not os.path.isdir(folder):
+                if not os.path.isdir(os.path.dirname(folder)):
+                    raise FileNotFoundError(f"Watch folder not found: {folder}")
+                # e.g. a session's Bounced Files before its first bounce
+                os.makedirs(folder)
+            resolved.append(folder)
+        return resolved
 
-            print("\n" + "=" * 60)
-            print(f"✓ SUCCESS!")
-            print(f"  File: {bounce_path}")
-            print(f"  Package ID: {package_id}")
-            print(f"  Destination: {destination}")
-            print("=" * 60)
+    def _on_watched_files(self, files, on_job=None):
+        """Queue a coalesced batch of new files, one job per folder."""
+        by_folder = {}
+        for path in files:
+            try:
+                mtime = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+            if self._own_files.get(path) == mtime:
+                continue
+            by_folder.setdefault(os.path.dirname(path), []).append(path)
 
-            return bounce_path, package_id
+        for folder, paths in by_folder.items():
+            # Name packages after the session: ".../<Session>/Bounced Files"
+            if os.path.basename(folder) == "Bounced Files":
+                folder = os.path.dirname(folder)
+            print(f"\nNew file(s) in {folder}: {', '.join(map(os.path.basename, paths))}")
+            job = self.enqueue_files(paths, session_name=os.path.basename(folder))
+            if on_job is not None:
+                on_job(job)
 
-        except Exception as e:
-            print(f"\n✗ ERROR: {str(e)}")
-            raise
+    def start_watching(self, folders=None, on_job=None):
+        """
+        Watch folders in a background thread.
+
+        Args:
+            folders: Folders to watch (default: see ``_resolve_watch_folders``)
+            on_job: Called with each job queued for new files
+
+        Returns:
+            FolderWatcher: Running watcher (call ``stop()`` to end it)
+        """
+        self.validate_config()
+        watcher = FolderWatcher(
+            self._resolve_watch_folders(folders),
+            lambda files: self._on_watched_files(files, on_job),
+            settle=self.watch_settle,
+            coalesce=self.watch_coalesce,
+        )
+        threading.Thread(target=watcher.run, name="folder-watch", daemon=True).start()
+        return watcher
 
-    def run_cli(self):
-        """Run in command-line mode."""
+    def run_watch(self, folders=None):
+        """
+        Send new files from watched folders until interrupted (Ctrl-C).
+
+        Args:
+            folders: Folders to watch (default: see ``_resolve_watch_folders``)
+        """
+        watcher = self.start_watching(folders)
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            print("\nStopping watcher...")
+        finally:
+            watcher.stop()
+
+    def _destinations(self, job):
+        """
+        Resolve where a job is delivered.
+
+        Explicit recipients or a portal on the job win; otherwise
+        MASV_DESTINATIONS (fan-out) if set, else the delivery mode defaults.
+
+        Returns:
+            list: Destinations
+        """
+        if job.deliveries:
+            # Resumed job: same destinations as before the interruption.
+            # Previews aren't destinations of their own; _send picks them up
+            # again (or _add_previews adds them) for these
+            return [
+                parse_destination(
+                    f"{delivery.get('destination', key)} "
+                    f"[{delivery.get('priority', 'normal')}]"
+                )
+                for key, delivery in job.deliveries.items()
+                if not delivery.get("preview")
+            ]
+        if job.destinations:
+            return job.destinations
+        if self.destinations and not (job.recipients or job.portal_subdomain):
+            return self.destinations
+
+        # Resolve the destination based on delivery mode
+        if self.delivery_mode == "portal":
+            subdomain = job.portal_subdomain or self.portal_url
+            if not subdomain:
+                raise ValueError("Portal URL/subdomain not configured in .env file")
+            return [Destination(portal_subdomain=subdomain)]
+        emails = job.recipients or [
+            email.strip() for email in self.default_recipients.split(",") if email.strip()
+        ]
+        if not emails:
+            raise ValueError("No recipients specified for email delivery")
+        return [Destination(recipients=emails)]
+
+    def _send(self, job):
+        """
+        Upload a finished bounce to every destination (runs on an upload worker).
+
+        Hashing, deliverables and compression happen once per job; the
+        uploads to each destination then run concurrently, limited by
+        MASV_FANOUT_CONCURRENCY across all jobs.
+        """
+        destinations = self._destinations(job)
+        job.destination = "; ".join(d.label for d in destinations)
+        for d in destinations:
+            job.deliveries.setdefault(
+                d.key,
+                {
+                    "destination": d.key,
+                    "preview": False,
+                    "label": d.label,
+                    "priority": d.priority,
+                    "status": "pending",
+                    "upload_id": None,
+                    "package_id": None,
+                    "error": None,
+                    "progress": None,
+                },
+            )
+
+        # Hash the bounce while the MASV client and agent get ready
+        digest = None
+        if self.dedup and not job.content_hash:
+            digest_future = job.hash_future or self._hash_pool.submit(
+                content_hash, job.files
+            )
+        masv = self._await_preflight(job)
+        if self.dedup:
+            if not job.content_hash:
+                with timing.span("dedup.hash_wait"):
+                    job.content_hash = digest_future.result()
+            digest = self._delivery_digest(job.content_hash)
+
+        # A resumed job's files were already prepared before its uploads started
+        # (previews start earlier, so they don't count)
+        prepared = any(
+            d["upload_id"] for d in job.deliveries.values() if not d.get("preview")
+        )
+        for delivery in job.deliveries.values():
+            if delivery["status"] == "uploading" and not masv.has_upload(
+                delivery["upload_id"]
+            ):
+                print(
+                    f"\nUpload {delivery['upload_id']} is unknown to the MASV Agent - "
+                    "uploading again"
+                )
+                delivery.update(status="pending", upload_id=None)
+
+        if digest and not prepared:
+            for d in destinations:
+                previous = self._delivered.lookup(digest, d.key)
+                if previous:
+                    job.deliveries[d.key].update(
+                        status="reused", package_id=previous["package_id"]
+                    )
+                    print(
+                        f"\nIdentical bounce already sent to {d.label} "
+                        f"(package {previous['package_id']}) - skipping upload"
+                    )
+
+        pending = [
+            d
+            for d in destinations
+            if job.deliveries[d.key]["status"] in ("pending", "uploading")
+        ]
+        job.reused = not pending
+        prepare = pending and not prepared
+        qc = None
+        if prepare:
+            if self.qc_policy == "block":
+                self._check_quality(job, list(job.files))
+            elif self.qc_policy != "off":
+                # Can't stop the send, so it doesn't wait for the analysis
+                qc = self._hash_pool.submit(
+                    contextvars.copy_context().run,
+                    self._check_quality,
+                    job,
+                    list(job.files),
+                )
+            if self.preview:
+                self._add_previews(job, pending)
+
+        # Previews go out first; the full-resolution files follow once prepared
+        previews = [
+            self._fanout_pool.submit(
+                contextvars.copy_context().run, self._deliver, job, d, masv, None, True
+            )
+            for d in destinations
+            if job.deliveries.get(self._preview_key(d), {}).get("status")
+            in ("pending", "uploading")
+        ]
+
+        if prepare:
+            if self.deliverables:
+                # Alternate formats come from the master, not extra bounces
+                from src.audio.resample import render_deliverables
+
+                with timing.span("audio.deliverables", formats=self.deliverables_spec):
+                    for path in list(job.files):
+                        job.files.extend(render_deliverables(path, self.deliverables))
+
+            if self.compress != "off" or self.compress_container:
+                with timing.span("compress", mode=self.compress):
+                    job.files = compress_for_upload(
+                        job.files, self.compress, container=self.compress_container
+                    )
+            self._mark_own(job.files)
+
+        # Upload to each remaining destination concurrently
+        futures = [
+            # Each upload runs in a copy of this context so its spans carry the job ID
+            self._fanout_pool.submit(
+                contextvars.copy_context().run, self._deliver, job, d, masv, digest
+            )
+            for d in pending
+        ]
+        errors = [f.exception() for f in futures if f.exception() is not None]
+        # A failed preview is reported but doesn't fail the job
+        for future in previews:
+            future.exception()
+        # Neither does QC in warn mode; its report is part of the job's result
+        if qc is not None and qc.exception() is not None:
+            print(f"Note: QC could not run: {qc.exception()}")
+
+        job.package_id = ", ".join(
+            d["package_id"]
+            for d in job.deliveries.values()
+            if d["package_id"] and not d.get("preview")
+        )
+        if errors:
+            self.journal.record(job, "uploading")
+            if len(destinations) == 1:
+                raise errors[0]
+            failed = [
+                d["label"]
+                for d in job.deliveries.values()
+                if d["status"] == "failed" and not d.get("preview")
+            ]
+            raise RuntimeError(
+                f"Delivery failed for {len(failed)} of {len(destinations)} destinations "
+                f"({'; '.join(failed)}): {errors[0]}"
+            )
+
+        self.journal.record(job, "done")
+        self._print_success(job)
+
+    def _check_quality(self, job, files):
+        """
+        Measure a job's WAV bounces and report any that fail QC.
+
+        Args:
+            job: Job the reports are added to
+            files: Bounce files to check (the job's files before deliverables
+                and compression are added)
+
+        Raises:
+            RuntimeError: If a file fails (or can't be checked) and
+                QC_POLICY is block
+        """
+        from src.audio.qc import QCLimits, analyze_quality
+        from src.audio.wav import HAS_NUMPY
+
+        wavs = [path for path in files if path.lower().endswith(".wav")]
+        if wavs and not HAS_NUMPY:
+            if self.qc_policy == "block":
+                raise RuntimeError(
+                    "QC needs NumPy (pip install numpy) - not sent (QC_POLICY=block)"
+                )
+            print(
+                "Note: QC skipped - NumPy isn't installed "
+                "(pip install numpy, or set QC_POLICY=off)"
+            )
+            return
+
+        limits = QCLimits(**self.qc_limits)
+        failed = []
+        for path in wavs:
+            name = os.path.basename(path)
+            try:
+                with timing.span("audio.qc", file=name):
+                    report = analyze_quality(path, limits)
+            except (RuntimeError, ValueError) as e:
+                if self.qc_policy == "block":
+                    raise RuntimeError(f"Could not check {name}: {e}") from e
+                print(f"Note: QC skipped for {name}: {e}")
+                continue
+            job.qc.append(report.as_dict())
+            if report.passed:
+                print(f"QC passed: {name} ({report})")
+                continue
+            marker = "✗" if self.qc_policy == "block" else "Warning:"
+            print(f"{marker} QC failed: {name} ({report})")
+            for problem in report.problems:
+                print(f"  - {problem}")
+            failed.append(name)
+        if failed and self.qc_policy == "block":
+            raise RuntimeError(
+                f"QC failed for {', '.join(failed)} - not sent (QC_POLICY=block)"
+            )
+
+    def _preview_key(self, destination):
+        """
+        Key of a destination's preview package in ``job.deliveries``.
+
+        Only a lookup key: the entry itself names its destination in
+        ``destination`` and is marked ``preview``.
+        """
+        return f"{destination.key}#preview"
+
+    def _add_previews(self, job, destinations):
+        """
+        Encode previews of a job's bounce files and queue them for each destination.
+
+        A preview that can't be encoded is skipped with a note; the
+        full-resolution delivery goes ahead either way.
+
+        Args:
+            job: Job whose bounce is previewed
+            destinations: Destinations that get the full-resolution files
+        """
+        destinations = [
+            d for d in destinations if self._preview_key(d) not in job.deliveries
+        ]
+        if not destinations:
+            # Resumed job whose previews were already queued
+            return
+        from src.audio.preview import encode_preview
+
+        try:
+            with timing.span("audio.preview"):
+                files = [encode_preview(path, self.preview_bitrate) for path in job.files]
+        except (RuntimeError, ValueError) as e:
+            print(f"Note: no preview sent: {e}")
+            return
+        self._mark_own(files)
+        for d in destinations:
+            job.deliveries[self._preview_key(d)] = dict(
+                job.deliveries[d.key],
+                label=f"{d.label} (preview)",
+                priority="high",
+                files=files,
+                preview=True,
+            )
+
+    def _deliver(self, job, destination, masv, digest, preview=False):
+        """
+        Upload a job's files to one destination (runs on the fan-out pool).
+
+        Args:
+            job: Job being delivered
+            destination: Destination to send to
+            masv: Shared MASV client
+            digest: Dedup key for the bounce, or None
+            preview: Send the destination's preview package instead
+        """
+        key = self._preview_key(destination) if preview else destination.key
+        delivery = job.deliveries[key]
+        files = delivery["files"] if preview else job.files
+        with timing.span("job.deliver", destination=key):
+            try:
+                if delivery["upload_id"] is None:
+                    # Multi-file packages are named after the session
+                    name = job.session_name if len(files) > 1 else None
+                    description = f"Pro Tools Bounce: {job.session_name}"
+                    if preview:
+                        name = f"{job.session_name} (preview)"
+                        description += " (preview)"
+                    print(f"\nSending to {delivery['label']}")
+                    delivery["upload_id"] = masv.start_upload(
+                        files,
+                        recipients=destination.recipients,
+                        description=description,
+                        name=name,
+                        portal_subdomain=destination.portal_subdomain,
+                        portal_password=self.portal_password
+                        if self.portal_password and destination.portal_subdomain
+                        else None,
+                        priority=delivery["priority"],
+                    )
+                    delivery["status"] = "uploading"
+                    # From here on a crash is recovered by resuming this upload
+                    self.journal.record(job, "uploading")
+                else:
+                    print(
+                        f"\nResuming upload {delivery['upload_id']} "
+                        f"to {delivery['label']}"
+                    )
+
+                masv.complete_upload(
+                    delivery["upload_id"],
+                    sum(os.path.getsize(path) for path in files),
+                    progress=lambda p: self._report_progress(job, key, p),
+                    priority=delivery["priority"],
+                )
+            except Exception as e:
+                delivery.update(status="failed", error=str(e))
+                print(f"\n✗ Delivery to {delivery['label']} failed: {e}")
+                raise
+            delivery.update(status="done", package_id=delivery["upload_id"])
+            if preview:
+                print(
+                    f"\n✓ Preview sent to {destination.label} "
+                    f"(package {delivery['package_id']})"
+                )
+            if digest:
+                self._delivered.record(
+                    digest, destination.key, delivery["package_id"], job.files
+                )
+
+    def _delivery_digest(self, master_hash):
+        """Dedup key for a bounce: its content hash plus any derived deliverables."""
+        if not self.deliverables:
+            return master_hash
+        # Deliverables are rendered deterministically from the master
+        return hashlib.sha256(f"{master_hash}|{self.deliverables_spec}".encode()).hexdigest()
+
+    def _report_progress(self, job, key, progress):
+        """Keep a delivery's latest upload progress (for status queries) and print it."""
+        job.progress = progress
+        job.deliveries[key]["progress"] = progress.as_dict()
+        prefix = f"[{job.deliveries[key]['label']}] " if len(job.deliveries) > 1 else ""
+        print(f"  {prefix}{progress}")
+
+    def _print_success(self, job):
+        """Print a delivered job's summary."""
+        print("\n" + "=" * 60)
+        print(f"✓ SUCCESS!")
+        for path in job.files:
+            print(f"  File: {path}")
+        if len(job.deliveries) > 1:
+            for delivery in job.deliveries.values():
+                print(f"  {delivery['label']}: package {delivery['package_id']} ({delivery['status']})")
+        else:
+            print(f"  Package ID: {job.package_id}")
+            print(f"  Destination: {job.destination}")
+        print("=" * 60)
+
+    def _report_error(self, job, error):
+        """Print a failed job's error and journal the failure."""
+        print(f"\n✗ ERROR: {str(error)}")
+        self.journal.record(job, "failed")
+
+    def run_cli(self, bounce_range=None):
+        """
+        Run in command-line mode.
+
+        Args:
+            bounce_range: Optional (start, end) seconds to re-bounce and
+                splice into the cached bounce instead of bouncing everything
+
+        Returns:
+            Job: The queued job, or None if nothing was queued
+        """
         print("Pro Tools Bounce and Send to MASV")
         print("-" * 40)
         print(f"Delivery mode: {self.delivery_mode}")
 
+        if self.destinations:
+            # Fan-out - deliver to every configured destination
+            print("Fanning out to:")
+            for destination in self.destinations:
+                print(f"  {destination.label}")
+            return self.enqueue(bounce_range=bounce_range)
+
         if self.delivery_mode == "portal":
             # Portal mode - use configured portal or prompt
             if self.portal_url:
                 print(f"Using portal: {self.portal_url}")
-                self.bounce_and_send()
+                return self.enqueue(bounce_range=bounce_range)
             else:
                 print("\nNo portal configured in .env file")
-                return
+                return None
         else:
             # Email mode - use default recipients or prompt
             if self.default_recipients:
                 print(f"Using default recipients: {self.default_recipients}")
-                self.bounce_and_send()
+                return self.enqueue(bounce_range=bounce_range)
             else:
                 # Prompt for recipients
                 recipients_input = input(
@@ -189,10 +1185,55 @@ class BounceAndSendApp:
 
                 if not recipients:
                     print("No recipients provided. Exiting.")
-                    return
+                    return None
 
-                # Execute bounce and send
-                self.bounce_and_send(recipients=recipients)
+                # Queue bounce and send
+                return self.enqueue(recipients=recipients, bounce_range=bounce_range)
+
+    def run_batch(self, paths, manifest_path=None):
+        """
+        Render and send many sessions, one after the other on each rig.
+
+        Each session is opened, bounced and closed in turn. Its upload starts
+        right away and runs while the next session renders. With several
+        Pro Tools rigs the sessions are spread across them (so they must be
+        reachable from every rig). A manifest of
+        the results and per-session timings is written at the end.
+
+        Args:
+            paths: Session files and/or folders containing sessions
+            manifest_path: Where to write the manifest (default:
+                batch-<timestamp>.json in the bounce directory)
+
+        Returns:
+            dict: The manifest
+        """
+        sessions = find_sessions(paths)
+        if not sessions:
+            raise ValueError("No Pro Tools sessions found")
+        manifest_path = manifest_path or os.path.join(
+            self.bounce_dir, f"batch-{time.strftime('%Y%m%d-%H%M%S')}.json"
+        )
+
+        print(f"Batch: {len(sessions)} session(s)")
+        started = time.perf_counter()
+        jobs = [self.enqueue(session_path=session) for session in sessions]
+        for job in jobs:
+            job.wait()
+        manifest = write_manifest(jobs, manifest_path, time.perf_counter() - started)
+
+        print("\n" + "=" * 60)
+        print(
+            f"Batch finished in {manifest['wall_seconds']:.0f}s: "
+            f"{manifest['succeeded']} sent, {manifest['failed']} failed"
+        )
+        for job in jobs:
+            status = "✓" if job.error is None else "✗"
+            detail = job.package_id if job.error is None else job.error
+            print(f"  {status} {os.path.basename(job.session_path)}: {detail}")
+        print(f"Manifest: {manifest_path}")
+        print("=" * 60)
+        return manifest
 
     def run_gui(self):
         """Run with GUI dialog."""
@@ -235,15 +1276,83 @@ def main():
     """Main entry point."""
     app = BounceAndSendApp()
 
-    # Check if running in GUI mode (default) or CLI mode
-    if "--cli" in sys.argv or not HAS_GUI:
-        app.run_cli()
-    else:
-        if not HAS_GUI:
-            print(
-                "Error: GUI mode requires tkinter. Use --cli flag or install tkinter."
+    if "--rigs" in sys.argv:
+        # Check and list the configured Pro Tools rigs
+        for rig in app.rigs:
+            rig.check()
+            state = "ok" if rig.healthy else f"unreachable ({rig.last_error})"
+            print(f"{rig.name:<16} {rig.address:<24} {state}")
+        app.shutdown()
+        sys.exit(0 if all(rig.healthy for rig in app.rigs) else 1)
+
+    # Finish uploads a crashed or killed earlier run left behind
+    try:
+        app.resume_interrupted()
+    except Exception as e:
+        print(f"Note: could not resume interrupted jobs: {e}")
+
+    if "--batch" in sys.argv:
+        # --batch <session.ptx|folder>... [--manifest results.json]
+        args = sys.argv[sys.argv.index("--batch") + 1 :]
+        manifest_path = None
+        if "--manifest" in args:
+            index = args.index("--manifest")
+            manifest_path = args[index + 1]
+            del args[index : index + 2]
+        try:
+            manifest = app.run_batch(
+                [arg for arg in args if not arg.startswith("--")], manifest_path
             )
+        finally:
+            app.shutdown()
+        sys.exit(1 if manifest["failed"] else 0)
+
+    if "--session-folder" in sys.argv:
+        # --session-folder <folder> [--full]: send only files changed since last time
+        args = sys.argv[sys.argv.index("--session-folder") + 1 :]
+        if not args or args[0].startswith("--"):
+            print("✗ --session-folder needs a session folder")
+            sys.exit(2)
+        try:
+            app.send_session_folder(args[0], full="--full" in sys.argv)
+        except Exception as e:
+            print(f"\n✗ ERROR: {e}")
             sys.exit(1)
+        finally:
+            app.shutdown()
+        return
+
+    if "--watch" in sys.argv:
+        # --watch [folder...]: send files bounced by hand as they appear
+        folders = [
+            arg for arg in sys.argv[sys.argv.index("--watch") + 1 :] if not arg.startswith("--")
+        ]
+        try:
+            app.run_watch(folders)
+        finally:
+            app.shutdown()
+        return
+
+    # Check if running in GUI mode (default) or CLI mode
+    bounce_range = None
+    if "--range" in sys.argv:
+        # --range 10:00-10:30: re-bounce only that part of the mix
+        from src.audio.splice import parse_range
+
+        args = sys.argv[sys.argv.index("--range") + 1 :]
+        try:
+            bounce_range = parse_range(args[0] if args else "")
+        except ValueError as e:
+            print(f"✗ {e}")
+            sys.exit(2)
+
+    if "--cli" in sys.argv or bounce_range or not _has_gui():
+        job = app.run_cli(bounce_range)
+        # Let queued bounces and uploads finish before exiting
+        app.shutdown()
+        if job is not None and job.error is not None:
+            sys.exit(1)
+    else:
         app.run_gui()
 
 
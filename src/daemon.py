@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Bounce and Send daemon.
+
+Keeps the Pro Tools connection, its registration and a ready MASV client
+alive between hotkey presses. The hotkey runs src/hotkey.py, which hands
+the job to this process over a Unix socket and exits immediately.
+"""
+
+import errno
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.bounce_and_send import BounceAndSendApp
+from src.state import state_dir
+
+
+def socket_path():
+    """Path of the daemon's Unix socket (BOUNCE_DAEMON_SOCKET overrides)."""
+    return os.getenv("BOUNCE_DAEMON_SOCKET") or str(state_dir() / "daemon.sock")
+
+
+class BounceDaemon:
+    """Long-running owner of a BounceAndSendApp that accepts jobs over a socket."""
+
+    def __init__(self, app, coalesce_window=10.0, keep_jobs=100):
+        """
+        Initialize the daemon.
+
+        Args:
+            app: BounceAndSendApp holding the pipeline and client connections
+            coalesce_window: Seconds during which a repeat press for the same
+                destination joins the running bounce instead of queueing
+            keep_jobs: Number of finished jobs kept for status queries
+        """
+        self.app = app
+        self.coalesce_window = coalesce_window
+        self.keep_jobs = keep_jobs
+        self._jobs = {}
+        self._submitted = {}
+        self._lock = threading.Lock()
+        self._watcher = None
+
+    def warm_up(self):
+        """
+        Verify (and if needed start) the MASV Agent ahead of the first press,
+        then resume any jobs a previous run left unfinished and start
+        watching WATCH_FOLDERS, if set.
+        """
+        try:
+            self.app.validate_config()
+            self.app._get_masv()._ensure_server_running()
+        except Exception as e:
+            print(f"Note: MASV warm-up failed: {e}")
+            return
+        try:
+            for job in self.app.resume_interrupted():
+                self._track(job)
+        except Exception as e:
+            print(f"Note: could not resume interrupted jobs: {e}")
+        if self.app.watch_folders:
+            try:
+                self._watcher = self.app.start_watching(on_job=self._track)
+            except Exception as e:
+                print(f"Note: could not watch folders: {e}")
+
+    def _track(self, job):
+        """Make a job started outside ``submit`` visible to status queries."""
+        with self._lock:
+            self._jobs[job.id] = job
+            self._submitted[job.id] = time.monotonic()
+
+    def _job_key(self, recipients, portal_subdomain):
+        """Destination key used to coalesce duplicate presses."""
+        if self.app.delivery_mode == "portal":
+            return ("portal", portal_subdomain or self.app.portal_url)
+        return ("email", tuple(sorted(recipients or [])))
+
+    def submit(self, recipients=None, portal_subdomain=None, rig=None, bounce_range=None):
+        """
+        Queue a job, or join an identical one that hasn't finished bouncing.
+
+        Single-flight: a press for the same destination while a job is still
+        queued, or bouncing and submitted within the coalesce window, returns
+        that job instead of starting a second offline bounce. A press for a
+        named rig only joins jobs on that rig, and a partial re-bounce only
+        joins one of the same range.
+
+        Returns:
+            tuple: (job, coalesced)
+        """
+        key = self._job_key(recipients, portal_subdomain)
+        with self._lock:
+            for job in self._jobs.values():
+                if self._job_key(job.recipients, job.portal_subdomain) != key:
+                    continue
+                if rig is not None and job.rig != rig:
+                    continue
+                if job.bounce_range != bounce_range:
+                    continue
+                age = time.monotonic() - self._submitted[job.id]
+                if job.phase == "queued" or (
+                    job.phase == "bouncing" and age < self.coalesce_window
+                ):
+                    return job, True
+
+            job = self.app.enqueue(
+                recipients, portal_subdomain, rig=rig, bounce_range=bounce_range
+            )
+            self._jobs[job.id] = job
+            self._submitted[job.id] = time.monotonic()
+            self._prune()
+            return job, False
+
+    def _prune(self):
+        """Forget the oldest finished jobs beyond ``keep_jobs``."""
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[: max(0, len(finished) - self.keep_jobs)]:
+            del self._jobs[job_id]
+            del self._submitted[job_id]
+
+    def status(self, job_id=None):
+        """Return status dicts for one job or all known jobs."""
+        with self._lock:
+            jobs = [self._jobs[job_id]] if job_id in self._jobs else []
+            if job_id is None:
+                jobs = list(self._jobs.values())
+        return [
+            {
+                "job_id": job.id,
+                "phase": job.phase,
+                "session": job.session_name,
+                "rig": job.rig,
+                "range": list(job.bounce_range) if job.bounce_range else None,
+                "files": job.files,
+                "package_id": job.package_id,
+                "destination": job.destination,
+                "progress": job.progress.as_dict() if job.progress else None,
+                "deliveries": list(job.deliveries.values()),
+                "qc": job.qc,
+                "error": str(job.error) if job.error else None,
+            }
+            for job in jobs
+        ]
+
+    def config(self):
+        """Delivery settings the hotkey script needs to prompt the user."""
+        return {
+            "delivery_mode": self.app.delivery_mode,
+            "portal_url": self.app.portal_url,
+            "default_recipients": self.app.default_recipients,
+        }
+
+    def handle(self, request):
+        """
+        Dispatch one request from the hotkey client.
+
+        Args:
+            request: Decoded JSON request with an ``action`` key
+
+        Returns:
+            dict: JSON-serialisable response
+        """
+        action = request.get("action")
+        if action == "submit":
+            bounce_range = None
+            if request.get("range"):
+                from src.audio.splice import parse_range
+
+                bounce_range = parse_range(request["range"])
+            job, coalesced = self.submit(
+                recipients=request.get("recipients") or None,
+                portal_subdomain=request.get("portal_subdomain") or None,
+                rig=request.get("rig") or None,
+                bounce_range=bounce_range,
+            )
+            return {"ok": True, "job_id": job.id, "coalesced": coalesced}
+        if action == "status":
+            return {"ok": True, "jobs": self.status(request.get("job_id"))}
+        if action == "rigs":
+            return {
+                "ok": True,
+                "rigs": self.app.rig_status(),
+                "queue_depth": self.app.pipeline.queue_depth,
+            }
+        if action == "config":
+            return {"ok": True, **self.config()}
+        if action == "ping":
+            return {"ok": True}
+        return {"ok": False, "error": f"Unknown action: {action}"}
+
+    @staticmethod
+    def _remove_stale_socket(path):
+        """
+        Remove a socket left behind by a previous run.
+
+        Raises:
+            RuntimeError: If a daemon still answers on it, or it can't be checked
+        """
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            probe.settimeout(2.0)
+            try:
+                probe.connect(path)
+            except OSError as e:
+                if e.errno != errno.ECONNREFUSED:
+                    raise RuntimeError(f"Can't check existing daemon socket {path}: {e}") from e
+            else:
+                raise RuntimeError(f"A Bounce and Send daemon is already listening on {path}")
+        # Nobody listening: stale socket from a run that didn't clean up
+        os.unlink(path)
+
+    def serve_forever(self, path=None):
+        """
+        Listen on the Unix socket until interrupted.
+
+        Args:
+            path: Socket path (default: socket_path())
+
+        Raises:
+            RuntimeError: If another daemon is already listening on the socket
+        """
+        path = path or socket_path()
+        if os.path.exists(path):
+            self._remove_stale_socket(path)
+
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                try:
+                    request = json.loads(self.rfile.readline() or b"{}")
+                    response = daemon.handle(request)
+                except Exception as e:
+                    response = {"ok": False, "error": str(e)}
+                self.wfile.write(json.dumps(response).encode() + b"\n")
+
+        server = socketserver.ThreadingUnixStreamServer(path, Handler)
+        server.daemon_threads = True
+        os.chmod(path, 0o600)
+
+        def stop(signum, frame):
+            threading.Thread(target=server.shutdown, daemon=True).start()
+
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, stop)
+            signal.signal(signal.SIGINT, stop)
+
+        print(f"Bounce and Send daemon listening on {path}")
+        threading.Thread(target=self.warm_up, daemon=True).start()
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+            if os.path.exists(path):
+                os.unlink(path)
+            if self._watcher is not None:
+                self._watcher.stop()
+            print("Waiting for queued jobs to finish...")
+            self.app.shutdown()
+
+
+def main():
+    """Main entry point."""
+    # The app loads .env, so read daemon settings after creating it
+    app = BounceAndSendApp()
+    coalesce_window = float(os.getenv("BOUNCE_COALESCE_WINDOW", "10"))
+    try:
+        BounceDaemon(app, coalesce_window).serve_forever()
+    except RuntimeError as e:
+        print(f"✗ {e}")
+        app.shutdown()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Thin hotkey client for the Bounce and Send daemon.
+
+Standard library only and no project imports, so it starts in a few
+milliseconds (run it with ``python -S``). Exit status: 0 done, 1 the
+daemon refused the request, 2 no daemon is listening (the caller may fall
+back to bounce_and_send.py), 3 the request was sent but no reply came back
+(a submitted job may still be queued, so don't bounce again).
+
+Usage:
+    hotkey.py config
+    hotkey.py submit [--portal SUBDOMAIN] [--recipients a@x.com,b@y.com] [--rig NAME]
+                     [--range 10:00-10:30]
+    hotkey.py status [JOB_ID]
+    hotkey.py rigs
+"""
+
+import json
+import os
+import shlex
+import socket
+import sys
+
+REFUSED = 1
+NO_DAEMON = 2
+NO_REPLY = 3
+
+
+class NoDaemon(Exception):
+    """Nothing accepted the connection, so the request was never sent."""
+
+
+def load_env():
+    """
+    Read the project's .env into the environment, as the daemon does.
+
+    A minimal stand-in for python-dotenv's load_dotenv(): the first .env
+    found walking up from this file, KEY=VALUE lines, optional quotes.
+    Variables already set in the environment win.
+    """
+    folder = os.path.dirname(os.path.abspath(__file__))
+    while not os.path.isfile(os.path.join(folder, ".env")):
+        parent = os.path.dirname(folder)
+        if parent == folder:
+            return
+        folder = parent
+    try:
+        with open(os.path.join(folder, ".env")) as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return
+    for line in lines:
+        line = line.strip()
+        if line.startswith("export "):
+            line = line[len("export "):]
+        key, sep, value = line.partition("=")
+        key, value = key.strip(), value.strip()
+        if not sep or not key or key.startswith("#"):
+            continue
+        if len(value) >= 2 and value[0] in "'\"" and value[-1] == value[0]:
+            value = value[1:-1]
+        else:
+            value = value.split(" #", 1)[0].strip()
+        os.environ.setdefault(key, value)
+
+
+def socket_path():
+    """Must match src/daemon.py: BOUNCE_DAEMON_SOCKET or the state directory."""
+    if os.getenv("BOUNCE_DAEMON_SOCKET"):
+        return os.environ["BOUNCE_DAEMON_SOCKET"]
+    state = os.getenv("MASV_PROTOOLS_STATE_DIR", "~/.masv_protools")
+    return os.path.join(os.path.expanduser(state), "daemon.sock")
+
+
+def request(payload, timeout=5.0):
+    """
+    Send one JSON request to the daemon and return its JSON response.
+
+    Raises NoDaemon if the connection fails; OSError or ValueError once
+    the request may have reached the daemon.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        try:
+            sock.connect(socket_path())
+        except OSError as e:
+            raise NoDaemon(e) from e
+        sock.sendall(json.dumps(payload).encode() + b"\n")
+        data = b""
+        while not data.endswith(b"\n"):
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            data += chunk
+    return json.loads(data)
+
+
+def main(argv):
+    """Main entry point."""
+    load_env()
+    action = argv[0] if argv else "submit"
+    payload = {"action": action}
+    args = argv[1:]
+    while args:
+        flag = args.pop(0)
+        value = args.pop(0) if args else ""
+        if flag == "--portal":
+            payload["portal_subdomain"] = value
+        elif flag == "--recipients":
+            payload["recipients"] = [e.strip() for e in value.split(",") if e.strip()]
+        elif flag == "--rig":
+            payload["rig"] = value
+        elif flag == "--range":
+            payload["range"] = value
+        elif action == "status":
+            payload["job_id"] = flag
+
+    try:
+        response = request(payload)
+    except NoDaemon:
+        return NO_DAEMON
+    except (OSError, ValueError) as e:
+        print(
+            f"Error: no reply from the daemon ({e}) - the request may still have "
+            "been queued; check with: hotkey.py status",
+            file=sys.stderr,
+        )
+        return NO_REPLY
+
+    if not response.get("ok"):
+        print(f"Error: {response.get('error')}", file=sys.stderr)
+        return REFUSED
+
+    if action == "config":
+        # Shell assignments for eval in run_bounce_and_send.sh
+        for key in ("delivery_mode", "portal_url", "default_recipients"):
+            print(f"{key.upper()}={shlex.quote(response.get(key) or '')}")
+    elif action == "submit":
+        joined = " (joined pending bounce)" if response.get("coalesced") else ""
+        print(f"Queued job {response['job_id']}{joined}")
+    else:
+        print(json.dumps(response, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,3 +1,16 @@
 from .client import MASVClient
+from .progress import UploadProgress
+from .scheduler import BandwidthScheduler
+from .transport import AgentTransport, CLITransport, HTTPTransport
+from .watcher import UploadWatch, UploadWatcher
 
-__all__ = ["MASVClient"]
+__all__ = [
+    "MASVClient",
+    "BandwidthScheduler",
+    "AgentTransport",
+    "CLITransport",
+    "HTTPTransport",
+    "UploadProgress",
+    "UploadWatch",
+    "UploadWatcher",
+]
@@ -0,0 +1,96 @@
+"""Minimal client for the MASV web API, used to validate settings before an upload."""
+
+import http.client
+import json
+import os
+from typing import Optional
+from urllib.parse import quote, urlsplit
+
+DEFAULT_API_URL = "https://api.massive.app/v1"
+
+
+class MASVWebAPI:
+    """
+    Read-only checks against the MASV web API.
+
+    Rejections (bad API key, unknown team or portal) raise RuntimeError;
+    network problems raise OSError so callers can decide whether an
+    unreachable API should block anything.
+    """
+
+    def __init__(self, api_key: str, url: Optional[str] = None, timeout: float = 10):
+        """
+        Initialize the API client.
+
+        Args:
+            api_key: MASV API key
+            url: API base URL (default: MASV_API_URL or api.massive.app/v1)
+            timeout: Socket timeout in seconds
+        """
+        parts = urlsplit(url or os.getenv("MASV_API_URL", DEFAULT_API_URL))
+        self.https = parts.scheme == "https"
+        self.host = parts.hostname or "api.massive.app"
+        self.port = parts.port
+        self.base_path = parts.path.rstrip("/")
+        self.api_key = api_key
+        self.timeout = timeout
+
+    def _get(self, path: str):
+        """
+        GET an API path.
+
+        Returns:
+            tuple: (HTTP status, decoded JSON body or None)
+
+        Raises:
+            OSError: If the API is unreachable
+        """
+        conn_class = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+        conn = conn_class(self.host, self.port, timeout=self.timeout)
+        try:
+            conn.request(
+                "GET",
+                self.base_path + path,
+                headers={"X-API-KEY": self.api_key, "Accept": "application/json"},
+            )
+            response = conn.getresponse()
+            data = response.read()
+        except http.client.HTTPException as e:
+            raise OSError(f"MASV API request failed: {e}") from e
+        finally:
+            conn.close()
+        try:
+            body = json.loads(data) if data.strip() else None
+        except ValueError:
+            body = None
+        return response.status, body
+
+    def check_team(self, team_id: str) -> None:
+        """
+        Check that the API key is valid and can use the team.
+
+        Raises:
+            RuntimeError: If the key is rejected or the team doesn't exist
+            OSError: If the API is unreachable
+        """
+        status, _ = self._get(f"/teams/{quote(team_id, safe='')}")
+        if status in (401, 403):
+            raise RuntimeError("MASV rejected the API key (check MASV_API_KEY)")
+        if status == 404:
+            raise RuntimeError(f"MASV team {team_id} not found (check MASV_TEAM_ID)")
+        if status >= 400:
+            raise OSError(f"MASV API returned {status}")
+
+    def check_portal(self, subdomain: str) -> None:
+        """
+        Check that a portal exists.
+
+        Raises:
+            RuntimeError: If there's no portal with this subdomain
+            OSError: If the API is unreachable
+        """
+        status, _ = self._get(f"/subdomains/{quote(subdomain, safe='')}/portals")
+        if status == 404:
+            raise RuntimeError(f"MASV portal '{subdomain}' not found (check the portal subdomain)")
+        if status >= 400:
+            raise OSError(f"MASV API returned {status}")
@@ -1,28 +1,142 @@
-"""MASV Agent CLI wrapper for file transfers."""
+"""MASV Agent wrapper for file transfers."""
 
-import json
+import hashlib
 import os
 import subprocess
+import threading
 import time
+from contextlib import nullcontext
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, Iterator, List, Optional, Union
+
+from ..state import JsonStore
+from ..timing import span, timed
+from . import throughput
+from .api import MASVWebAPI
+from .progress import ProgressTracker, UploadProgress
+from .scheduler import BandwidthScheduler, parse_schedule
+from .transport import AgentTransport, CLITransport, HTTPTransport
+from .watcher import UploadWatcher
+
+# Defaults for settings read when a client is created (after .env is loaded)
+
+# Seconds a successful agent check is trusted before checking again
+# (MASV_AGENT_CHECK_TTL)
+AGENT_CHECK_TTL = 300.0
+
+# Seconds to wait for a freshly started agent server to answer
+# (MASV_AGENT_START_TIMEOUT)
+AGENT_START_TIMEOUT = 20.0
+
+# Seconds without any bytes moving before an upload counts as stalled
+# (MASV_STALL_TIMEOUT)
+STALL_TIMEOUT = 60.0
+
+# Monitoring never gives up sooner than this, however small the upload
+MIN_MONITOR_TIMEOUT = 120
+
+# Allowed time as a multiple of the time the upload should take at the observed rate
+DEADLINE_FACTOR = 3
+
+# Assumed throughput before anything has been measured (1 MB/s)
+DEFAULT_RATE = 1_000_000
+
+# Longest poll interval while a bandwidth limit is being enforced
+SCHEDULED_POLL_INTERVAL = 2.0
+
+_agent_stamps = JsonStore("agent_verified.json")
+
+
+def _path_size(path: str) -> int:
+    """Size in bytes of a file, or of all files under a directory."""
+    if not os.path.isdir(path):
+        return os.path.getsize(path)
+    return sum(
+        os.path.getsize(os.path.join(root, f))
+        for root, _, files in os.walk(path)
+        for f in files
+    )
 
 
 class MASVClient:
-    """Client for uploading files via MASV Agent CLI."""
+    """Client for uploading files via the MASV Agent."""
 
-    def __init__(self, api_key: str, team_id: str):
+    def __init__(
+        self, api_key: str, team_id: str, transport: Optional[AgentTransport] = None
+    ):
         """
         Initialize MASV client.
 
         Args:
             api_key: MASV API key from account settings
             team_id: MASV team ID
+            transport: Agent transport to use (default: chosen by
+                MASV_AGENT_TRANSPORT - 'auto', 'http' or 'cli')
         """
         self.api_key = api_key
         self.team_id = team_id
-        self._check_masv_agent()
+        self.transport_mode = os.getenv("MASV_AGENT_TRANSPORT", "auto").lower()
+        self.agent_check_ttl = float(os.getenv("MASV_AGENT_CHECK_TTL", AGENT_CHECK_TTL))
+        self.agent_start_timeout = float(
+            os.getenv("MASV_AGENT_START_TIMEOUT", AGENT_START_TIMEOUT)
+        )
+        self.stall_timeout = float(os.getenv("MASV_STALL_TIMEOUT", STALL_TIMEOUT))
+        self.transport = transport or self._select_transport()
+        self._watcher: Optional[UploadWatcher] = None
+        self._watcher_lock = threading.Lock()
+        # Optional upload bandwidth cap, e.g. "40" or "09:00-19:00=40" (Mbit/s)
+        schedule = parse_schedule(os.getenv("MASV_BANDWIDTH_LIMIT", ""))
+        self.scheduler: Optional[BandwidthScheduler] = None
+        if schedule:
+            self.scheduler = BandwidthScheduler(
+                schedule,
+                lambda upload_id: self.transport.pause_upload(upload_id),
+                lambda upload_id: self.transport.resume_upload(upload_id),
+            )
+        # Account checks passed in preflight (what -> time), trusted like agent checks
+        self._api = MASVWebAPI(api_key)
+        self._checked = {}
+        self._stamp_key = hashlib.sha256(
+            f"{self.transport_mode}:{api_key}".encode()
+        ).hexdigest()[:16]
+        if not self._agent_recently_verified():
+            self._check_masv_agent()
+
+    def _agent_recently_verified(self) -> bool:
+        """Return True if the agent passed its checks within the check TTL."""
+        verified_at = _agent_stamps.load().get(self._stamp_key, 0)
+        return time.time() - verified_at < self.agent_check_ttl
+
+    def _mark_agent_verified(self, verified: bool = True) -> None:
+        """Record (or clear) the time the agent server was last seen ready."""
+
+        def update(stamps):
+            if verified:
+                stamps[self._stamp_key] = time.time()
+            else:
+                stamps.pop(self._stamp_key, None)
+
+        _agent_stamps.update(update)
 
+    def _select_transport(self) -> AgentTransport:
+        """
+        Pick the agent transport.
+
+        In 'auto' mode the HTTP API is used when the agent server answers,
+        otherwise the masv CLI.
+        """
+        if self.transport_mode == "cli":
+            return CLITransport(self.api_key)
+        http = HTTPTransport(self.api_key)
+        if self.transport_mode == "http" or http.ping():
+            return http
+        return CLITransport(self.api_key)
+
+    def close(self) -> None:
+        """Release connections held by the agent transport."""
+        self.transport.close()
+
+    @timed("masv.check_agent")
     def _check_masv_agent(self) -> None:
         """
         Check if MASV Agent is installed and accessible.
@@ -30,6 +144,11 @@ class MASVClient:
         Raises:
             RuntimeError: If MASV Agent is not found
         """
+        if isinstance(self.transport, HTTPTransport) and self.transport.ping():
+            # The agent server is answering, so it is installed and ready
+            self._mark_agent_verified()
+            return
+
         try:
             # Just check if masv command exists using help (doesn't need server)
             result = subprocess.run(
@@ -44,41 +163,119 @@ class MASVClient:
                 "https://developer.massive.io/transfer-agent/latest/"
             ) from e
 
+    @timed("masv.ensure_server")
     def _ensure_server_running(self) -> None:
         """
         Ensure MASV Agent server is running with proper authentication.
 
         The server needs to be started with the API key for authentication.
+        Skipped entirely if the agent was verified within MASV_AGENT_CHECK_TTL.
+
+        Raises:
+            RuntimeError: If the server does not become ready in time
         """
+        if self._agent_recently_verified():
+            return
+
         # Check if server is already running
-        try:
-            result = subprocess.run(
-                ["masv", "upload", "ls"],
-                capture_output=True,
-                text=True,
-                timeout=5,
-                env={**os.environ, "MASV_API_KEY": self.api_key},
-            )
-            if result.returncode == 0:
-                return  # Server is running and authenticated
-        except subprocess.SubprocessError:
-            pass
+        if self.transport.ping():
+            self._mark_agent_verified()
+            return  # Server is running and authenticated
 
         # Start the server with API key in background
         print("Starting MASV Agent server...")
         try:
             # Start server in background (don't wait for it to exit)
-            subprocess.Popen(
+            server = subprocess.Popen(
                 ["masv", "server", "start", "--api-key", self.api_key],
                 stdout=subprocess.DEVNULL,
                 stderr=subprocess.DEVNULL,
             )
-            # Give server time to start
-            time.sleep(3)
-            print("MASV Agent server started")
         except Exception as e:
             # Server might already be running, that's ok
             print(f"Note: {e}")
+            server = None
+
+        # Probe over HTTP where possible - it avoids a fork per attempt
+        probe = self.transport
+        if self.transport_mode != "cli" and not isinstance(probe, HTTPTransport):
+            probe = HTTPTransport(self.api_key)
+
+        started = time.monotonic()
+        if not self._wait_until_ready(probe, server, self.agent_start_timeout):
+            raise RuntimeError(
+                f"MASV Agent server did not become ready within {self.agent_start_timeout:.0f}s"
+            )
+        print(f"MASV Agent server started ({time.monotonic() - started:.1f}s)")
+
+        if self.transport_mode == "auto" and probe is not self.transport:
+            # Server is up now, prefer the HTTP API for the rest of the run
+            self.transport = probe
+        self._mark_agent_verified()
+
+    def _wait_until_ready(
+        self,
+        probe: AgentTransport,
+        server: Optional[subprocess.Popen],
+        timeout: float,
+    ) -> bool:
+        """
+        Poll the agent until it answers, backing off from 50ms to 500ms.
+
+        Args:
+            probe: Transport used to ping the agent
+            server: The ``masv server start`` process, if we launched one
+            timeout: Overall deadline in seconds
+
+        Returns:
+            bool: True once the agent answers, False on timeout or if the
+            server process exits with an error
+        """
+        deadline = time.monotonic() + timeout
+        delay = 0.05
+        while True:
+            if probe.ping():
+                return True
+            if server is not None and server.poll() not in (None, 0):
+                return False
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, 0.5)
+
+    @timed("masv.preflight")
+    def preflight(self, portal_subdomains: List[str] = (), check_account: bool = True) -> None:
+        """
+        Make sure an upload can start: agent running, API key, team and portals valid.
+
+        Meant to run in the background while the bounce renders, so a
+        problem is reported before the bounce finishes rather than after.
+        The account checks need the MASV web API; if it can't be reached
+        they are skipped with a note (the upload itself will tell).
+
+        Args:
+            portal_subdomains: Portals the job delivers to
+            check_account: Also validate the API key, team and portals
+
+        Raises:
+            RuntimeError: If the agent can't be started or a setting is rejected
+        """
+        self._ensure_server_running()
+        if not check_account:
+            return
+        checks = [("team", self.team_id, self._api.check_team)]
+        checks += [("portal", s, self._api.check_portal) for s in portal_subdomains]
+        for kind, value, check in checks:
+            key = f"{kind}:{value}"
+            if time.time() - self._checked.get(key, 0) < self.agent_check_ttl:
+                continue
+            try:
+                check(value)
+            except OSError as e:
+                print(f"Note: could not check MASV {kind} {value}: {e}")
+                continue
+            self._checked[key] = time.time()
 
     def send_file(
         self,
@@ -88,6 +285,7 @@ class MASVClient:
         name: Optional[str] = None,
         portal_subdomain: Optional[str] = None,
         portal_password: Optional[str] = None,
+        priority: str = "normal",
     ) -> str:
         """
         Upload and send a file using MASV Agent (email or portal).
@@ -99,6 +297,7 @@ class MASVClient:
             name: Optional package name (defaults to filename)
             portal_subdomain: Portal subdomain (for portal delivery)
             portal_password: Optional portal password (for portal delivery)
+            priority: 'high', 'normal' or 'backup' (under a bandwidth limit)
 
         Returns:
             str: Upload ID
@@ -107,17 +306,121 @@ class MASVClient:
             FileNotFoundError: If file doesn't exist
             RuntimeError: If upload fails
         """
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"File not found: {file_path}")
+        return self.send_files(
+            [file_path],
+            recipients=recipients,
+            description=description,
+            name=name,
+            portal_subdomain=portal_subdomain,
+            portal_password=portal_password,
+            priority=priority,
+        )
+
+    def send_files(
+        self,
+        paths: Union[str, List[str]],
+        recipients: Optional[List[str]] = None,
+        description: str = "Pro Tools Bounce",
+        name: Optional[str] = None,
+        portal_subdomain: Optional[str] = None,
+        portal_password: Optional[str] = None,
+        progress: Optional[Callable[[UploadProgress], None]] = None,
+        priority: str = "normal",
+    ) -> str:
+        """
+        Upload several files (or a directory) as a single MASV package.
+
+        One upload is started, monitored and finalized for the whole set,
+        e.g. all stems of a delivery.
+
+        Args:
+            paths: List of files, or a directory whose contents are sent
+            recipients: List of recipient email addresses (for email delivery)
+            description: Package description
+            name: Optional package name (defaults to the file or directory name)
+            portal_subdomain: Portal subdomain (for portal delivery)
+            portal_password: Optional portal password (for portal delivery)
+            progress: Called with each UploadProgress while uploading
+                (default: print it)
+            priority: 'high', 'normal' or 'backup' (under a bandwidth limit)
+
+        Returns:
+            str: Upload ID
+
+        Raises:
+            FileNotFoundError: If a path doesn't exist
+            RuntimeError: If upload fails
+        """
+        paths = self._check_paths(paths)
+        upload_id = self.start_upload(
+            paths,
+            recipients=recipients,
+            description=description,
+            name=name,
+            portal_subdomain=portal_subdomain,
+            portal_password=portal_password,
+            priority=priority,
+        )
+        self.complete_upload(
+            upload_id,
+            sum(_path_size(path) for path in paths),
+            progress=progress,
+            priority=priority,
+        )
+        return upload_id
+
+    @staticmethod
+    def _check_paths(paths: Union[str, List[str]]) -> List[str]:
+        """Normalize a path or list of paths and check they exist."""
+        if isinstance(paths, (str, os.PathLike)):
+            paths = [paths]
+        paths = [os.fspath(path) for path in paths]
+        if not paths:
+            raise ValueError("No files to send")
+        for path in paths:
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"File not found: {path}")
+        return paths
+
+    def start_upload(
+        self,
+        paths: Union[str, List[str]],
+        recipients: Optional[List[str]] = None,
+        description: str = "Pro Tools Bounce",
+        name: Optional[str] = None,
+        portal_subdomain: Optional[str] = None,
+        portal_password: Optional[str] = None,
+        priority: str = "normal",
+    ) -> str:
+        """
+        Start uploading files as one package without waiting for it.
+
+        Pair with ``complete_upload``; keeping the returned ID lets an
+        interrupted upload be completed later, even from another process.
+        Arguments are the same as for ``send_files``. Under a bandwidth
+        limit this waits while the budget is taken by uploads of the same
+        or higher priority.
+
+        Returns:
+            str: Upload ID
+
+        Raises:
+            FileNotFoundError: If a path doesn't exist
+            RuntimeError: If the upload can't be started
+        """
+        paths = self._check_paths(paths)
 
         # Ensure server is running
         self._ensure_server_running()
 
-        file_size = os.path.getsize(file_path)
-        file_name = Path(file_path).name
+        file_size = sum(_path_size(path) for path in paths)
+        if len(paths) == 1:
+            file_name = Path(paths[0]).name
+        else:
+            file_name = f"{Path(paths[0]).name} + {len(paths) - 1} more"
 
         if name is None:
-            name = file_name
+            name = Path(paths[0]).name
 
         # Determine delivery mode
         if portal_subdomain:
@@ -126,204 +429,255 @@ class MASVClient:
             print(
                 f"Uploading {file_name} ({file_size / (1024 * 1024):.2f} MB) to portal {portal_subdomain}..."
             )
-            cmd = [
-                "masv",
-                "upload",
-                "start",
-                "portal",
-                "--subdomain",
-                portal_subdomain,
-                "--sender",
-                sender_email,
-                "--name",
-                name,
-                "--description",
-                description,
-                file_path,
-            ]
-            if portal_password:
-                cmd.extend(["--password", portal_password])
+            delivery = "portal"
+            params = {
+                "subdomain": portal_subdomain,
+                "sender": sender_email,
+                "password": portal_password,
+            }
         elif recipients:
             # Email upload
             print(
                 f"Uploading {file_name} ({file_size / (1024 * 1024):.2f} MB) to {', '.join(recipients)}..."
             )
-            emails = ",".join(recipients)
-            cmd = [
-                "masv",
-                "upload",
-                "start",
-                "email",
-                "--emails",
-                emails,
-                "--team-id",
-                self.team_id,
-                "--name",
-                name,
-                "--description",
-                description,
-                file_path,
-            ]
+            delivery = "email"
+            params = {"emails": recipients, "team_id": self.team_id}
         else:
             raise ValueError(
                 "Must provide either recipients (for email) or portal_subdomain (for portal)"
             )
 
-        # Set API key in environment
-        env = {**os.environ, "MASV_API_KEY": self.api_key}
-
-        try:
-            # Start the upload
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=300,  # 5 minute timeout for starting upload
-                check=True,
-                env=env,
-            )
+        if self.scheduler is not None:
+            with span("masv.bandwidth_wait", priority=priority):
+                self.scheduler.admit(priority)
 
-            # Parse upload ID from output
-            # MASV Agent typically returns upload info in stdout
-            upload_id = self._extract_upload_id(result.stdout)
+        # Start the upload
+        with span("masv.upload_start", delivery=delivery, bytes=file_size):
+            try:
+                upload_id = self.transport.start_upload(
+                    delivery, paths, name=name, description=description, **params
+                )
+            except RuntimeError:
+                if self.transport.ping():
+                    raise
+                # Cached readiness was stale (agent stopped since) - restart and retry
+                self._mark_agent_verified(False)
+                self._ensure_server_running()
+                upload_id = self.transport.start_upload(
+                    delivery, paths, name=name, description=description, **params
+                )
+        print(f"Upload started with ID: {upload_id}")
 
-            if not upload_id:
-                raise RuntimeError("Failed to extract upload ID from MASV Agent output")
+        return upload_id
 
-            print(f"Upload started with ID: {upload_id}")
+    def complete_upload(
+        self,
+        upload_id: str,
+        size: Optional[int] = None,
+        progress: Optional[Callable[[UploadProgress], None]] = None,
+        priority: str = "normal",
+    ) -> None:
+        """
+        Wait for a started upload to finish, then finalize it.
 
-            # Monitor upload progress
-            self._monitor_upload(upload_id, env)
+        Args:
+            upload_id: Upload ID from ``start_upload``
+            size: Total bytes, used for ETA, the deadline and throughput tracking
+            progress: Called with each UploadProgress (default: print it)
+            priority: 'high', 'normal' or 'backup' (under a bandwidth limit)
 
-            # Finalize the upload
-            self._finalize_upload(upload_id, env)
+        Raises:
+            RuntimeError: If the upload fails or stalls
+        """
+        started = time.monotonic()
+        self._monitor_upload(upload_id, size or 0, progress, priority)
+        if size:
+            throughput.record(size, time.monotonic() - started)
 
-            print("Package sent successfully!")
-            return upload_id
+        # Finalize the upload
+        self._finalize_upload(upload_id)
 
-        except subprocess.TimeoutExpired as e:
-            raise RuntimeError(f"Upload command timed out: {e}")
-        except subprocess.CalledProcessError as e:
-            raise RuntimeError(f"Upload failed: {e.stderr if e.stderr else e.stdout}")
+        print("Package sent successfully!")
 
-    def _extract_upload_id(self, output: str) -> Optional[str]:
+    def has_upload(self, upload_id: str) -> bool:
         """
-        Extract upload ID from MASV Agent command output.
+        Check whether the agent still knows about an upload.
 
         Args:
-            output: Command output string
+            upload_id: Upload ID
 
         Returns:
-            Upload ID or None if not found
+            bool: True if the upload is in the agent's transfer list
         """
-        # MASV Agent may output JSON or text
-        # Try to parse as JSON first
-        try:
-            data = json.loads(output)
-            if "id" in data:
-                return data["id"]
-        except (json.JSONDecodeError, TypeError):
-            pass
-
-        # Look for ID in text output
-        # Common patterns: "Upload ID: xxx" or "id: xxx"
-        lines = output.split("\n")
-        for line in lines:
-            if "id" in line.lower() and ":" in line:
-                parts = line.split(":", 1)
-                if len(parts) == 2:
-                    potential_id = parts[1].strip()
-                    # Clean up quotes, commas, and whitespace
-                    potential_id = potential_id.strip("\"'`, \t\n\r")
-                    if potential_id:
-                        return potential_id
-
-        return None
+        return any(
+            t.get("package_id") == upload_id for t in self.transport.list_transfers()
+        )
+
+    def _get_watcher(self) -> UploadWatcher:
+        """Return the shared status watcher, creating it on first use."""
+        with self._watcher_lock:
+            if self._watcher is None:
+                # A bandwidth limit needs frequent readings to be enforced
+                max_interval = 10.0 if self.scheduler is None else SCHEDULED_POLL_INTERVAL
+                self._watcher = UploadWatcher(
+                    lambda: self.transport.list_transfers(), max_interval=max_interval
+                )
+            return self._watcher
+
+    def watch_upload(
+        self, upload_id: str, size: int = 0, priority: str = "normal"
+    ) -> Iterator[UploadProgress]:
+        """
+        Follow an upload until the agent reports it complete.
+
+        Yields a snapshot per status update with smoothed throughput and ETA.
+        There is no fixed time limit: the upload may take DEADLINE_FACTOR
+        times as long as its size implies at the observed rate (or the
+        measured uplink before a rate is seen). If no bytes move for
+        MASV_STALL_TIMEOUT seconds the agent is checked and restarted if
+        needed; a second stall fails the upload. An upload the agent doesn't
+        list (or whose status can't be read) moves no bytes, so it fails the
+        same way rather than being assumed sent.
+
+        The last snapshot is always 'complete': reported by the agent, or
+        dropped from its list after all bytes were sent.
 
+        Under a bandwidth limit each reading is reported to the scheduler,
+        which may hold the upload paused; paused time counts neither as a
+        stall nor against the deadline.
+
+        Args:
+            upload_id: Upload ID to follow
+            size: Total bytes of the upload (the agent's figure is used if it
+                reports one)
+            priority: Bandwidth priority ('high', 'normal' or 'backup')
+
+        Yields:
+            UploadProgress: Current progress
+
+        Raises:
+            RuntimeError: If the upload fails, stalls twice or overruns its deadline
+        """
+        watcher = self._get_watcher()
+        tracker = ProgressTracker(upload_id, size)
+        fallback_rate = throughput.estimate(DEFAULT_RATE)
+        seen = False
+        missing = 0
+        recovered = False
+        scheduler = self.scheduler
+        scheduled = scheduler.tracking(upload_id, priority) if scheduler else nullcontext()
+        with watcher.watch(upload_id) as watch, scheduled:
+            while True:
+                fresh = watch.wait(timeout=watcher.max_interval * 2)
+                transfer = watch.transfer if fresh else None
+
+                if transfer is not None:
+                    seen = True
+                    missing = 0
+                    state = transfer.get("state", "").lower()
+                    progress = tracker.update(
+                        state, transfer.get("progress", 0), transfer.get("size")
+                    )
+                    if scheduler is not None:
+                        scheduler.report(upload_id, progress.bytes_sent)
+                    if state == "complete":
+                        yield progress
+                        return
+                    if state in ("error", "failed"):
+                        raise RuntimeError(f"Upload failed with state: {state}")
+                else:
+                    missing += fresh
+                    progress = tracker.snapshot()
+                    # Dropped from the list once everything was sent
+                    if (
+                        seen
+                        and missing >= 3
+                        and tracker.total_bytes
+                        and progress.bytes_sent >= tracker.total_bytes
+                    ):
+                        yield tracker.snapshot("complete")
+                        return
+                yield progress
+
+                paused_for = 0.0
+                if scheduler is not None:
+                    paused_for = scheduler.paused_seconds(upload_id)
+                    if scheduler.paused(upload_id):
+                        # Held back by the bandwidth limit, not stalled
+                        tracker.reset_stall()
+                        continue
+
+                if progress.stalled_for > self.stall_timeout:
+                    if recovered and not seen:
+                        raise RuntimeError(
+                            f"Upload {upload_id} never appeared in the MASV Agent's "
+                            f"transfer list ({progress.elapsed:.0f}s) - not finalized"
+                        )
+                    if recovered:
+                        raise RuntimeError(
+                            f"Upload stalled: no progress for {progress.stalled_for:.0f}s"
+                        )
+                    recovered = True
+                    print(
+                        f"  No progress for {progress.stalled_for:.0f}s - checking MASV Agent..."
+                    )
+                    self._mark_agent_verified(False)
+                    self._ensure_server_running()
+                    tracker.reset_stall()
+
+                rate = tracker.rate or fallback_rate
+                limit = max(MIN_MONITOR_TIMEOUT, tracker.total_bytes / rate * DEADLINE_FACTOR)
+                if progress.elapsed - paused_for > limit:
+                    raise RuntimeError(
+                        f"Upload still at {progress.percent:.1f}% after "
+                        f"{progress.elapsed:.0f}s (limit {limit:.0f}s at the observed rate)"
+                    )
+
+    @timed("masv.monitor")
     def _monitor_upload(
-        self, upload_id: str, env: dict, poll_interval: int = 2
+        self,
+        upload_id: str,
+        size: int = 0,
+        progress: Optional[Callable[[UploadProgress], None]] = None,
+        priority: str = "normal",
     ) -> None:
         """
         Monitor upload progress until complete.
 
+        Status comes from the client's shared UploadWatcher, so concurrent
+        uploads share a single transfer-list request per poll tick.
+
         Args:
             upload_id: Upload ID to monitor
-            env: Environment variables including API key
-            poll_interval: Seconds between status checks
+            size: Total bytes of the upload
+            progress: Called with each UploadProgress (default: print it)
+            priority: Bandwidth priority ('high', 'normal' or 'backup')
+
+        Raises:
+            RuntimeError: If the upload fails, stalls or can't be confirmed
+                (see watch_upload)
         """
         print("Monitoring upload progress...")
-        max_attempts = 60  # 2 minutes max with 2 second intervals
+        report = progress or (lambda p: print(f"  {p}"))
+        for snapshot in self.watch_upload(upload_id, size, priority):
+            report(snapshot)
 
-        for attempt in range(max_attempts):
-            try:
-                # Use 'masv upload ls' to check status - more reliable than 'status' command
-                result = subprocess.run(
-                    ["masv", "upload", "ls"],
-                    capture_output=True,
-                    text=True,
-                    timeout=10,
-                    check=True,
-                    env=env,
-                )
-
-                # Parse JSON output to find our upload
-                try:
-                    data = json.loads(result.stdout)
-                    transfers = data.get("transfers", [])
-
-                    for transfer in transfers:
-                        if transfer.get("package_id") == upload_id:
-                            state = transfer.get("state", "").lower()
-                            progress = transfer.get("progress", 0)
-                            size = transfer.get("size", 1)
-
-                            if state == "complete":
-                                print("  Upload complete: 100%")
-                                return
-                            elif state in ["error", "failed"]:
-                                raise RuntimeError(f"Upload failed with state: {state}")
-                            else:
-                                # Calculate percentage
-                                percent = (progress / size * 100) if size > 0 else 0
-                                print(f"  Upload in progress: {percent:.1f}%")
-
-                except json.JSONDecodeError:
-                    # If we can't parse, just continue
-                    print("  Upload in progress...")
-
-                time.sleep(poll_interval)
-
-            except subprocess.CalledProcessError as e:
-                # If ls fails, just wait and retry
-                print("  Checking upload status...")
-                time.sleep(poll_interval)
-
-        # If we get here, assume it completed (uploads are usually fast)
-        print("  Upload appears complete (monitoring timeout)")
-
-    def _finalize_upload(self, upload_id: str, env: dict) -> None:
+    @timed("masv.finalize")
+    def _finalize_upload(self, upload_id: str) -> None:
         """
         Finalize the upload to notify recipients.
 
         Args:
             upload_id: Upload ID to finalize
-            env: Environment variables including API key
         """
         print("Finalizing and sending package...")
         try:
-            subprocess.run(
-                ["masv", "upload", "finalize", upload_id],
-                capture_output=True,
-                text=True,
-                timeout=30,
-                check=True,
-                env=env,
-            )
+            self.transport.finalize_upload(upload_id)
             print("Package finalized successfully")
-        except subprocess.CalledProcessError as e:
+        except RuntimeError as e:
             # MASV may auto-finalize uploads, so this error is often benign
             # Check if upload is already complete/finalized
-            error_output = e.stderr if e.stderr else e.stdout
+            error_output = str(e)
             if (
                 "no rows in result set" in error_output
                 or "not found" in error_output.lower()
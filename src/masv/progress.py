@@ -0,0 +1,162 @@
+"""Upload progress snapshots: smoothed throughput, ETA and stall tracking."""
+
+import time
+from typing import Optional
+
+# Weight of the newest rate sample in the moving average
+SMOOTHING = 0.3
+
+
+class UploadProgress:
+    """One observation of an upload, as yielded by ``MASVClient.watch_upload``."""
+
+    def __init__(
+        self,
+        upload_id: str,
+        state: str,
+        bytes_sent: int,
+        total_bytes: int,
+        rate: Optional[float],
+        elapsed: float,
+        stalled_for: float,
+    ):
+        """
+        Initialize a snapshot.
+
+        Args:
+            upload_id: Upload being watched
+            state: Agent state ('transferring', 'complete', ...; 'unknown'
+                while the agent doesn't list the upload)
+            bytes_sent: Bytes uploaded so far
+            total_bytes: Total bytes of the upload
+            rate: Smoothed throughput in bytes per second (None until measured)
+            elapsed: Seconds since monitoring started
+            stalled_for: Seconds since bytes_sent last increased
+        """
+        self.upload_id = upload_id
+        self.state = state
+        self.bytes_sent = bytes_sent
+        self.total_bytes = total_bytes
+        self.rate = rate
+        self.elapsed = elapsed
+        self.stalled_for = stalled_for
+
+    @property
+    def percent(self) -> float:
+        """Completion percentage."""
+        if self.total_bytes <= 0:
+            return 100.0 if self.state == "complete" else 0.0
+        return min(self.bytes_sent / self.total_bytes * 100, 100.0)
+
+    @property
+    def eta(self) -> Optional[float]:
+        """Estimated seconds remaining, or None until a rate is known."""
+        if self.state == "complete":
+            return 0.0
+        if not self.rate:
+            return None
+        return max(self.total_bytes - self.bytes_sent, 0) / self.rate
+
+    def as_dict(self) -> dict:
+        """JSON-serialisable form (e.g. for daemon status)."""
+        return {
+            "upload_id": self.upload_id,
+            "state": self.state,
+            "bytes_sent": self.bytes_sent,
+            "total_bytes": self.total_bytes,
+            "percent": round(self.percent, 1),
+            "mb_per_second": round(self.rate / 1e6, 2) if self.rate else None,
+            "eta_seconds": round(self.eta, 1) if self.eta is not None else None,
+            "stalled_for": round(self.stalled_for, 1),
+        }
+
+    def __str__(self) -> str:
+        if self.state == "complete":
+            return "Upload complete: 100%"
+        if self.state == "unknown":
+            return "Checking upload status..."
+        if self.state == "paused":
+            return f"Upload paused (bandwidth limit): {self.percent:.1f}%"
+        text = f"Upload in progress: {self.percent:.1f}%"
+        if self.rate:
+            text += f" at {self.rate / 1e6:.1f} MB/s"
+        if self.eta is not None:
+            minutes, seconds = divmod(int(self.eta), 60)
+            text += f", ~{minutes}:{seconds:02d} left"
+        if self.stalled_for >= 10:
+            text += f" (no progress for {self.stalled_for:.0f}s)"
+        return text
+
+
+class ProgressTracker:
+    """Turn raw (bytes sent, time) readings into UploadProgress snapshots."""
+
+    def __init__(self, upload_id: str, total_bytes: int, smoothing: float = SMOOTHING):
+        """
+        Initialize the tracker.
+
+        Args:
+            upload_id: Upload being watched
+            total_bytes: Expected upload size (updated from the agent if it reports one)
+            smoothing: Weight of the newest rate sample
+        """
+        self.upload_id = upload_id
+        self.total_bytes = total_bytes
+        self.smoothing = smoothing
+        self.rate: Optional[float] = None
+        self.started = time.monotonic()
+        self._last_bytes = 0
+        self._last_time = self.started
+        self._last_moved = self.started
+
+    def update(self, state: str, bytes_sent: int, total_bytes: Optional[int] = None):
+        """
+        Fold in a reading from the agent.
+
+        Args:
+            state: Agent transfer state
+            bytes_sent: Bytes uploaded so far
+            total_bytes: Size reported by the agent, if any
+
+        Returns:
+            UploadProgress: Snapshot after this reading
+        """
+        now = time.monotonic()
+        if total_bytes:
+            self.total_bytes = total_bytes
+        if bytes_sent > self._last_bytes:
+            sample = (bytes_sent - self._last_bytes) / max(now - self._last_time, 1e-3)
+            self.rate = (
+                sample
+                if self.rate is None
+                else self.smoothing * sample + (1 - self.smoothing) * self.rate
+            )
+            self._last_bytes = bytes_sent
+            self._last_time = now
+            self._last_moved = now
+        return self.snapshot(state)
+
+    def reset_stall(self) -> None:
+        """Restart the stall clock (e.g. after the agent was restarted)."""
+        self._last_moved = time.monotonic()
+
+    def snapshot(self, state: str = "unknown"):
+        """
+        Current progress without a new reading.
+
+        Args:
+            state: State to report
+
+        Returns:
+            UploadProgress: Snapshot
+        """
+        now = time.monotonic()
+        return UploadProgress(
+            self.upload_id,
+            state,
+            self._last_bytes,
+            self.total_bytes,
+            self.rate,
+            now - self.started,
+            now - self._last_moved,
+        )
@@ -0,0 +1,375 @@
+"""Bandwidth budget for concurrent uploads: token bucket, priorities, schedules."""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Upload priorities, most important first
+PRIORITIES = {"high": 0, "normal": 1, "backup": 2}
+
+# Seconds of budget that may be used in one burst
+BURST_SECONDS = 4.0
+
+# A limit applying between two minutes of the day: (start, end, bytes per second)
+Window = Tuple[int, int, float]
+
+
+def _minutes(text: str) -> int:
+    """Minute of the day for 'HH:MM'."""
+    hours, _, minutes = text.strip().partition(":")
+    value = int(hours) * 60 + int(minutes or 0)
+    if not 0 <= value <= 24 * 60:
+        raise ValueError(f"Invalid time of day: {text!r}")
+    return value
+
+
+def parse_schedule(spec: str) -> List[Window]:
+    """
+    Parse a bandwidth limit, optionally per time of day.
+
+    "40" caps uploads at 40 Mbit/s all day; "09:00-19:00=40, 19:00-09:00=400"
+    caps them at 40 during the day and 400 at night. Times not covered by
+    any window are unlimited, as is an empty spec.
+
+    Args:
+        spec: Limit in megabits per second, or comma-separated
+            'HH:MM-HH:MM=<Mbit/s>' windows
+
+    Returns:
+        list: (start minute, end minute, bytes per second) windows
+
+    Raises:
+        ValueError: If the spec is malformed
+    """
+    windows = []
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        period, _, mbps = item.rpartition("=")
+        try:
+            rate = float(mbps) * 1_000_000 / 8
+            if period:
+                start, _, end = period.partition("-")
+                window = (_minutes(start), _minutes(end), rate)
+            else:
+                window = (0, 24 * 60, rate)
+        except ValueError:
+            raise ValueError(
+                f"Invalid bandwidth limit {item!r} (expected <Mbit/s> or HH:MM-HH:MM=<Mbit/s>)"
+            )
+        if rate <= 0:
+            raise ValueError(f"Bandwidth limit must be positive: {item!r}")
+        windows.append(window)
+    return windows
+
+
+def limit_at(schedule: List[Window], when: Optional[float] = None) -> Optional[float]:
+    """
+    Bandwidth limit in force at a given time.
+
+    Args:
+        schedule: Windows from ``parse_schedule``
+        when: Epoch seconds (default: now, local time)
+
+    Returns:
+        float: Bytes per second, or None if unlimited
+    """
+    now = time.localtime(when)
+    minute = now.tm_hour * 60 + now.tm_min
+    for start, end, rate in schedule:
+        # Windows may wrap past midnight, e.g. 19:00-09:00
+        inside = start <= minute < end if start <= end else minute >= start or minute < end
+        if inside:
+            return rate
+    return None
+
+
+class TokenBucket:
+    """Byte budget refilled at ``rate`` per second, holding at most ``capacity``."""
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Initialize a full bucket.
+
+        Args:
+            rate: Refill rate in bytes per second
+            capacity: Maximum tokens (bytes) the bucket holds
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._last = time.monotonic()
+
+    def refill(self) -> float:
+        """Add the tokens accrued since the last call; returns the balance."""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._last) * self.rate)
+        self._last = now
+        return self.tokens
+
+    def take(self, amount: float) -> float:
+        """Spend tokens (the balance may go negative); returns the balance."""
+        self.refill()
+        self.tokens -= amount
+        return self.tokens
+
+
+class BandwidthScheduler:
+    """
+    Keep the combined rate of concurrent uploads within a budget.
+
+    The agent picks its own upload rate, so the budget is enforced from
+    the bytes each upload actually moves, as seen while monitoring it:
+    when the token bucket runs dry the lowest-priority running upload is
+    paused, and when it has refilled the highest-priority paused upload is
+    resumed. New uploads wait while the budget is exhausted. Outside any
+    scheduled window, or when the agent can't pause uploads, nothing is
+    paused and uploads run at full speed.
+
+    Decisions are made under the scheduler's lock, but the agent's pause
+    and resume calls (which may be slow) are made after releasing it, in
+    the order they were decided, so a slow agent never holds up progress
+    reports or other uploads.
+    """
+
+    def __init__(
+        self,
+        schedule: List[Window],
+        pause: Callable[[str], None],
+        resume: Callable[[str], None],
+        burst_seconds: float = BURST_SECONDS,
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            schedule: Limit windows from ``parse_schedule``
+            pause: Called with an upload ID to pause it in the agent
+            resume: Called with an upload ID to resume it
+            burst_seconds: Seconds of budget the bucket holds
+        """
+        self.schedule = schedule
+        self.pause = pause
+        self.resume = resume
+        self.burst_seconds = burst_seconds
+        self.can_pause = True
+        self._bucket = TokenBucket(0, 0)
+        self._limit: Optional[float] = None
+        # upload ID -> {"priority", "sent", "paused_at", "paused_total", "order"}
+        self._uploads: Dict[str, dict] = {}
+        self._order = 0
+        self._changed = threading.Condition()
+        # Agent calls decided but not yet made: ("pause" | "resume", upload ID)
+        self._pending = deque()
+        # Held by the one thread currently making agent calls
+        self._calling = threading.Lock()
+
+    @property
+    def limit(self) -> Optional[float]:
+        """Bytes per second allowed right now, or None if unlimited."""
+        return limit_at(self.schedule)
+
+    def _update_limit(self) -> Optional[float]:
+        """Apply the current schedule window to the bucket (caller holds the lock)."""
+        limit = self.limit
+        if limit != self._limit:
+            self._limit = limit
+            if limit is not None:
+                self._bucket = TokenBucket(limit, limit * self.burst_seconds)
+        return limit
+
+    def _over_budget(self) -> bool:
+        """True if the bucket is empty under the current limit (caller holds the lock)."""
+        return self._update_limit() is not None and self._bucket.refill() < 0
+
+    def admit(self, priority: str = "normal", timeout: Optional[float] = None) -> None:
+        """
+        Wait until a new upload may start.
+
+        While the budget is exhausted, a new upload waits for running
+        uploads of the same or higher priority, so low-priority work never
+        delays more important uploads.
+
+        Args:
+            priority: Priority of the upload about to start
+            timeout: Maximum seconds to wait (default: no limit)
+        """
+        rank = PRIORITIES[priority]
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._changed:
+            while self._over_budget() and any(
+                PRIORITIES[u["priority"]] <= rank and u["paused_at"] is None
+                for u in self._uploads.values()
+            ):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return
+                # Re-check as the bucket refills, even without progress reports
+                self._changed.wait(1.0 if remaining is None else min(remaining, 1.0))
+
+    def track(self, upload_id: str, priority: str = "normal") -> None:
+        """
+        Start managing an upload's bandwidth.
+
+        Args:
+            upload_id: Upload ID
+            priority: 'high', 'normal' or 'backup'
+        """
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown upload priority: {priority}")
+        with self._changed:
+            if upload_id not in self._uploads:
+                self._order += 1
+                self._uploads[upload_id] = {
+                    "priority": priority,
+                    "sent": None,
+                    "paused_at": None,
+                    "paused_total": 0.0,
+                    "order": self._order,
+                }
+
+    @contextmanager
+    def tracking(self, upload_id: str, priority: str = "normal"):
+        """Manage an upload's bandwidth for the duration of a block."""
+        self.track(upload_id, priority)
+        try:
+            yield
+        finally:
+            self.release(upload_id)
+
+    def release(self, upload_id: str) -> None:
+        """Stop managing an upload (finished, failed or given up on)."""
+        with self._changed:
+            upload = self._uploads.pop(upload_id, None)
+            if upload is not None and upload["paused_at"] is not None:
+                self._pending.append(("resume", upload_id))
+            self._changed.notify_all()
+        self._call_agent()
+
+    def report(self, upload_id: str, bytes_sent: int) -> None:
+        """
+        Account for an upload's progress and rebalance.
+
+        Args:
+            upload_id: Upload ID
+            bytes_sent: Bytes the agent reports sent so far
+        """
+        with self._changed:
+            upload = self._uploads.get(upload_id)
+            if upload is None:
+                return
+            if upload["sent"] is not None and bytes_sent > upload["sent"]:
+                if self._update_limit() is not None:
+                    self._bucket.take(bytes_sent - upload["sent"])
+            upload["sent"] = bytes_sent
+            self._rebalance()
+            self._changed.notify_all()
+        self._call_agent()
+
+    def paused(self, upload_id: str) -> bool:
+        """True if the scheduler is holding the upload paused."""
+        with self._changed:
+            upload = self._uploads.get(upload_id)
+            return upload is not None and upload["paused_at"] is not None
+
+    def paused_seconds(self, upload_id: str) -> float:
+        """Total seconds the upload has been held paused."""
+        with self._changed:
+            upload = self._uploads.get(upload_id)
+            if upload is None:
+                return 0.0
+            total = upload["paused_total"]
+            if upload["paused_at"] is not None:
+                total += time.monotonic() - upload["paused_at"]
+            return total
+
+    def _rebalance(self) -> None:
+        """
+        Decide whether to pause or resume one upload to track the budget.
+
+        The upload's state is updated right away and the agent call is
+        queued for ``_call_agent`` (caller holds the lock).
+        """
+        limit = self._update_limit()
+        paused = [(i, u) for i, u in self._uploads.items() if u["paused_at"] is not None]
+        running = [(i, u) for i, u in self._uploads.items() if u["paused_at"] is None]
+
+        if limit is None:
+            # Unlimited right now: everything runs at full speed
+            for upload_id, upload in paused:
+                self._mark_resumed(upload_id, upload)
+            return
+
+        tokens = self._bucket.refill()
+        if tokens < 0 and running and self.can_pause:
+            # Least important first; among equals the newest
+            upload_id, upload = max(
+                running, key=lambda r: (PRIORITIES[r[1]["priority"]], r[1]["order"])
+            )
+            upload["paused_at"] = time.monotonic()
+            self._pending.append(("pause", upload_id))
+        elif tokens >= self._bucket.capacity / 2 and paused:
+            # Most important first; among equals the oldest
+            upload_id, upload = min(
+                paused, key=lambda r: (PRIORITIES[r[1]["priority"]], r[1]["order"])
+            )
+            self._mark_resumed(upload_id, upload)
+
+    def _mark_resumed(self, upload_id: str, upload: dict) -> None:
+        """Count a paused upload as running and queue its resume (caller holds the lock)."""
+        upload["paused_total"] += time.monotonic() - upload["paused_at"]
+        upload["paused_at"] = None
+        self._pending.append(("resume", upload_id))
+
+    def _call_agent(self) -> None:
+        """
+        Make the queued pause/resume calls, without holding the scheduler lock.
+
+        Only one thread makes calls at a time, in the order they were
+        queued; a thread that finds another one calling leaves its calls to
+        that thread.
+        """
+        while self._calling.acquire(blocking=False):
+            try:
+                while True:
+                    with self._changed:
+                        if not self._pending:
+                            break
+                        action, upload_id = self._pending.popleft()
+                    if action == "pause":
+                        self._pause_now(upload_id)
+                    else:
+                        self._resume_now(upload_id)
+            finally:
+                self._calling.release()
+            with self._changed:
+                # Calls queued after the last check but before the release
+                if not self._pending:
+                    return
+
+    def _pause_now(self, upload_id: str) -> None:
+        """Pause an upload in the agent; stop pausing altogether if it can't."""
+        try:
+            self.pause(upload_id)
+        except Exception as e:
+            print(f"  Note: MASV Agent can't pause uploads ({e}) - limiting new uploads only")
+            with self._changed:
+                self.can_pause = False
+                upload = self._uploads.get(upload_id)
+                if upload is not None and upload["paused_at"] is not None:
+                    upload["paused_at"] = None
+                self._changed.notify_all()
+
+    def _resume_now(self, upload_id: str) -> None:
+        """Resume an upload in the agent; if that fails it stays counted as paused."""
+        try:
+            self.resume(upload_id)
+        except Exception as e:
+            print(f"  Warning: could not resume upload {upload_id}: {e}")
+            with self._changed:
+                upload = self._uploads.get(upload_id)
+                if upload is not None and upload["paused_at"] is None:
+                    upload["paused_at"] = time.monotonic()
@@ -0,0 +1,51 @@
+"""Measured upload throughput, remembered between runs."""
+
+import os
+from typing import Optional
+
+from ..state import JsonStore
+
+# Weight of the newest measurement in the moving average
+SMOOTHING = 0.3
+
+_store = JsonStore("throughput.json")
+
+
+def record(num_bytes: int, seconds: float) -> None:
+    """
+    Fold a completed upload into the moving-average throughput.
+
+    Args:
+        num_bytes: Bytes uploaded
+        seconds: Wall time from upload start to completion
+    """
+    if seconds < 1 or num_bytes <= 0:
+        # Too short to say anything about the link
+        return
+    rate = num_bytes / seconds
+
+    def update(data):
+        previous = data.get("bytes_per_second")
+        data["bytes_per_second"] = (
+            rate if previous is None else SMOOTHING * rate + (1 - SMOOTHING) * previous
+        )
+
+    _store.update(update)
+
+
+def estimate(default: Optional[float] = None) -> Optional[float]:
+    """
+    Best guess at the current upload throughput.
+
+    MASV_UPLINK_MBPS (megabits per second) overrides the measured value.
+
+    Args:
+        default: Value returned when nothing has been measured yet
+
+    Returns:
+        float: Bytes per second, or ``default``
+    """
+    override = os.getenv("MASV_UPLINK_MBPS")
+    if override:
+        return float(override) * 1_000_000 / 8
+    return _store.load().get("bytes_per_second", default)
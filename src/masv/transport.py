@@ -0,0 +1,373 @@
+"""Transports for talking to the local MASV Agent."""
+
+import http.client
+import json
+import os
+import select
+import subprocess
+import threading
+from typing import List, Optional
+from urllib.parse import quote, urlsplit
+
+DEFAULT_AGENT_URL = "http://localhost:8080/api/v1"
+
+
+def extract_upload_id(output: str) -> Optional[str]:
+    """
+    Extract upload ID from MASV Agent command output.
+
+    Args:
+        output: Command output string
+
+    Returns:
+        Upload ID or None if not found
+    """
+    # MASV Agent may output JSON or text
+    # Try to parse as JSON first
+    try:
+        data = json.loads(output)
+        if "id" in data:
+            return data["id"]
+    except (json.JSONDecodeError, TypeError):
+        pass
+
+    # Look for ID in text output
+    # Common patterns: "Upload ID: xxx" or "id: xxx"
+    lines = output.split("\n")
+    for line in lines:
+        if "id" in line.lower() and ":" in line:
+            parts = line.split(":", 1)
+            if len(parts) == 2:
+                potential_id = parts[1].strip()
+                # Clean up quotes, commas, and whitespace
+                potential_id = potential_id.strip("\"'`, \t\n\r")
+                if potential_id:
+                    return potential_id
+
+    return None
+
+
+class AgentTransport:
+    """
+    Interface to the MASV Agent.
+
+    Upload parameters use the agent CLI's option names: ``subdomain``,
+    ``sender`` and ``password`` for portal uploads, ``emails`` and
+    ``team_id`` for email uploads, plus ``name`` and ``description``.
+    Failures are reported as RuntimeError.
+    """
+
+    name = "base"
+
+    def ping(self) -> bool:
+        """Return True if the agent server is up and accepts our API key."""
+        raise NotImplementedError
+
+    def list_transfers(self) -> List[dict]:
+        """Return the agent's transfer list."""
+        raise NotImplementedError
+
+    def start_upload(self, delivery: str, files: List[str], **params) -> str:
+        """
+        Start an upload.
+
+        Args:
+            delivery: 'portal' or 'email'
+            files: Paths to upload as one package
+            **params: Upload options (see class docstring)
+
+        Returns:
+            str: Upload ID
+        """
+        raise NotImplementedError
+
+    def finalize_upload(self, upload_id: str) -> None:
+        """Finalize an upload so the package is delivered."""
+        raise NotImplementedError
+
+    def pause_upload(self, upload_id: str) -> None:
+        """Pause a running upload (used by the bandwidth scheduler)."""
+        raise NotImplementedError
+
+    def resume_upload(self, upload_id: str) -> None:
+        """Resume a paused upload."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release any resources held by the transport."""
+
+
+class CLITransport(AgentTransport):
+    """Talk to the agent by running the ``masv`` command line tool."""
+
+    name = "cli"
+
+    def __init__(self, api_key: str, binary: str = "masv"):
+        """
+        Initialize CLI transport.
+
+        Args:
+            api_key: MASV API key passed to the CLI via environment
+            binary: Name or path of the masv executable
+        """
+        self.binary = binary
+        self.env = {**os.environ, "MASV_API_KEY": api_key}
+
+    def _run(self, args: List[str], timeout: float) -> subprocess.CompletedProcess:
+        """Run a masv subcommand, raising CalledProcessError on failure."""
+        return subprocess.run(
+            [self.binary, *args],
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+            check=True,
+            env=self.env,
+        )
+
+    def ping(self) -> bool:
+        """Return True if ``masv upload ls`` succeeds."""
+        try:
+            self._run(["upload", "ls"], timeout=5)
+            return True
+        except (subprocess.SubprocessError, OSError):
+            return False
+
+    def list_transfers(self) -> List[dict]:
+        """Return the transfer list reported by ``masv upload ls``."""
+        result = self._run(["upload", "ls"], timeout=10)
+        return json.loads(result.stdout).get("transfers", [])
+
+    def start_upload(self, delivery: str, files: List[str], **params) -> str:
+        """Start an upload with ``masv upload start``."""
+        if delivery == "portal":
+            cmd = [
+                "upload",
+                "start",
+                "portal",
+                "--subdomain",
+                params["subdomain"],
+                "--sender",
+                params["sender"],
+            ]
+        elif delivery == "email":
+            cmd = [
+                "upload",
+                "start",
+                "email",
+                "--emails",
+                ",".join(params["emails"]),
+                "--team-id",
+                params["team_id"],
+            ]
+        else:
+            raise ValueError(f"Unknown delivery type: {delivery}")
+
+        cmd.extend(["--name", params["name"], "--description", params["description"]])
+        cmd.extend(files)
+        if params.get("password"):
+            cmd.extend(["--password", params["password"]])
+
+        try:
+            # 5 minute timeout for starting upload
+            result = self._run(cmd, timeout=300)
+        except subprocess.TimeoutExpired as e:
+            raise RuntimeError(f"Upload command timed out: {e}")
+        except subprocess.CalledProcessError as e:
+            raise RuntimeError(f"Upload failed: {e.stderr if e.stderr else e.stdout}")
+
+        upload_id = extract_upload_id(result.stdout)
+        if not upload_id:
+            raise RuntimeError("Failed to extract upload ID from MASV Agent output")
+        return upload_id
+
+    def finalize_upload(self, upload_id: str) -> None:
+        """Finalize an upload with ``masv upload finalize``."""
+        try:
+            self._run(["upload", "finalize", upload_id], timeout=30)
+        except subprocess.CalledProcessError as e:
+            raise RuntimeError(e.stderr if e.stderr else e.stdout)
+
+    def pause_upload(self, upload_id: str) -> None:
+        """Pause an upload with ``masv upload pause``."""
+        try:
+            self._run(["upload", "pause", upload_id], timeout=30)
+        except subprocess.CalledProcessError as e:
+            raise RuntimeError(e.stderr if e.stderr else e.stdout)
+
+    def resume_upload(self, upload_id: str) -> None:
+        """Resume an upload with ``masv upload resume``."""
+        try:
+            self._run(["upload", "resume", upload_id], timeout=30)
+        except subprocess.CalledProcessError as e:
+            raise RuntimeError(e.stderr if e.stderr else e.stdout)
+
+
+class HTTPTransport(AgentTransport):
+    """
+    Talk to the agent's local HTTP API over pooled keep-alive connections.
+
+    Connections are reused across requests (and threads), so a status
+    check is a single request on an open socket instead of a process
+    spawn. Pooled connections the agent has closed are discarded before
+    use. A request that still fails on a pooled connection is retried on a
+    fresh one only if it's a GET or wasn't fully sent, so a start or
+    finalize the agent may already have acted on is never sent twice.
+    """
+
+    name = "http"
+
+    def __init__(
+        self,
+        api_key: str,
+        url: Optional[str] = None,
+        timeout: float = 10,
+        max_idle: int = 4,
+    ):
+        """
+        Initialize HTTP transport.
+
+        Args:
+            api_key: MASV API key sent with each request
+            url: Agent API base URL (default: MASV_AGENT_URL or localhost:8080)
+            timeout: Socket timeout in seconds
+            max_idle: Number of idle connections kept open for reuse
+        """
+        parts = urlsplit(url or os.getenv("MASV_AGENT_URL", DEFAULT_AGENT_URL))
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or 8080
+        self.base_path = parts.path.rstrip("/")
+        self.api_key = api_key
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self._idle: List[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _is_dropped(conn: http.client.HTTPConnection) -> bool:
+        """True if an idle connection was closed by the agent (readable at EOF)."""
+        if conn.sock is None:
+            return True
+        try:
+            return bool(select.select([conn.sock], [], [], 0)[0])
+        except (OSError, ValueError):
+            return True
+
+    def _acquire(self):
+        """Take a live idle connection from the pool or open a new one."""
+        while True:
+            with self._lock:
+                conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                break
+            if not self._is_dropped(conn):
+                return conn, True
+            conn.close()
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        return conn, False
+
+    def _release(self, conn: http.client.HTTPConnection) -> None:
+        """Return a connection to the pool, closing it if the pool is full."""
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def _request(self, method: str, path: str, body: Optional[dict] = None):
+        """
+        Send a request to the agent and decode the JSON response.
+
+        Returns:
+            Decoded response body (None if empty)
+
+        Raises:
+            RuntimeError: If the agent returns an error status
+            OSError: If the agent is unreachable
+        """
+        payload = json.dumps(body).encode() if body is not None else None
+        headers = {"X-API-KEY": self.api_key, "Accept": "application/json"}
+        if payload is not None:
+            headers["Content-Type"] = "application/json"
+
+        while True:
+            conn, reused = self._acquire()
+            sent = False
+            try:
+                conn.request(method, self.base_path + path, body=payload, headers=headers)
+                sent = True
+                response = conn.getresponse()
+                data = response.read()
+            except (http.client.HTTPException, OSError):
+                conn.close()
+                if reused and (method == "GET" or not sent):
+                    # Pooled connection went stale; nothing was acted on
+                    continue
+                raise
+            if response.will_close:
+                conn.close()
+            else:
+                self._release(conn)
+            break
+
+        text = data.decode("utf-8", errors="replace")
+        if response.status >= 400:
+            raise RuntimeError(f"MASV Agent returned {response.status}: {text}")
+        return json.loads(text) if text.strip() else None
+
+    def ping(self) -> bool:
+        """Return True if the agent answers an authenticated request."""
+        try:
+            self._request("GET", "/uploads")
+            return True
+        except (RuntimeError, OSError, ValueError):
+            return False
+
+    def list_transfers(self) -> List[dict]:
+        """Return the agent's transfer list."""
+        data = self._request("GET", "/uploads")
+        if isinstance(data, dict):
+            return data.get("transfers", [])
+        return data or []
+
+    def start_upload(self, delivery: str, files: List[str], **params) -> str:
+        """Start an upload via ``POST /uploads/<delivery>``."""
+        if delivery not in ("portal", "email"):
+            raise ValueError(f"Unknown delivery type: {delivery}")
+        body = {key: value for key, value in params.items() if value}
+        body["files"] = [os.path.abspath(path) for path in files]
+        try:
+            data = self._request("POST", f"/uploads/{delivery}", body)
+        except OSError as e:
+            raise RuntimeError(f"Upload failed: {e}")
+        upload_id = (data or {}).get("id")
+        if not upload_id:
+            raise RuntimeError("Failed to extract upload ID from MASV Agent output")
+        return upload_id
+
+    def finalize_upload(self, upload_id: str) -> None:
+        """Finalize an upload via ``POST /uploads/<id>/finalize``."""
+        try:
+            self._request("POST", f"/uploads/{quote(upload_id, safe='')}/finalize")
+        except OSError as e:
+            raise RuntimeError(str(e))
+
+    def pause_upload(self, upload_id: str) -> None:
+        """Pause an upload via ``POST /uploads/<id>/pause``."""
+        try:
+            self._request("POST", f"/uploads/{quote(upload_id, safe='')}/pause")
+        except OSError as e:
+            raise RuntimeError(str(e))
+
+    def resume_upload(self, upload_id: str) -> None:
+        """Resume an upload via ``POST /uploads/<id>/resume``."""
+        try:
+            self._request("POST", f"/uploads/{quote(upload_id, safe='')}/resume")
+        except OSError as e:
+            raise RuntimeError(str(e))
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
@@ -0,0 +1,164 @@
+"""Shared upload-status watcher for MASV Agent transfers."""
+
+import threading
+from typing import Callable, Dict, List, Optional
+
+
+class UploadWatch:
+    """Status handle for a single package registered with an UploadWatcher."""
+
+    def __init__(self, watcher: "UploadWatcher", package_id: str):
+        """
+        Initialize the handle.
+
+        Args:
+            watcher: Watcher that publishes status for this package
+            package_id: MASV package/upload ID being watched
+        """
+        self.package_id = package_id
+        self.transfer: Optional[dict] = None
+        self._watcher = watcher
+        self._cond = threading.Condition()
+        self._version = 0
+        self._seen = 0
+
+    def _publish(self, transfer: Optional[dict]) -> None:
+        """Store the latest transfer entry and wake any waiter."""
+        with self._cond:
+            self.transfer = transfer
+            self._version += 1
+            self._cond.notify_all()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for the next status update from the watcher.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            bool: True if a new status was published (see ``transfer``),
+            False if the wait timed out
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._version != self._seen, timeout)
+            updated = self._version != self._seen
+            self._seen = self._version
+            return updated
+
+    def close(self) -> None:
+        """Stop watching this package."""
+        self._watcher._unwatch(self)
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
+
+
+class UploadWatcher:
+    """
+    Poll the MASV Agent transfer list once per tick for all active uploads.
+
+    A single background thread fetches the transfer list, indexes it by
+    ``package_id`` and fans each entry out to the registered UploadWatch
+    handles. The poll interval starts at ``min_interval`` and grows by
+    ``backoff`` on every tick up to ``max_interval``; registering a new
+    upload resets it so fresh uploads get fast feedback while long
+    transfers are polled less often. The thread exits when nothing is
+    being watched.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[], List[dict]],
+        min_interval: float = 0.5,
+        max_interval: float = 10.0,
+        backoff: float = 1.5,
+    ):
+        """
+        Initialize the watcher.
+
+        Args:
+            fetch: Callable returning the agent's current transfer list
+            min_interval: Poll interval (seconds) right after an upload starts
+            max_interval: Upper bound on the poll interval
+            backoff: Multiplier applied to the interval after each tick
+        """
+        self.fetch = fetch
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._watches: Dict[str, List[UploadWatch]] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._interval = min_interval
+
+    def watch(self, package_id: str) -> UploadWatch:
+        """
+        Start watching a package.
+
+        Args:
+            package_id: MASV package/upload ID
+
+        Returns:
+            UploadWatch: Handle receiving status updates for the package
+        """
+        handle = UploadWatch(self, package_id)
+        with self._lock:
+            self._watches.setdefault(package_id, []).append(handle)
+            self._interval = self.min_interval
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="masv-upload-watcher", daemon=True
+                )
+                self._thread.start()
+        self._wake.set()
+        return handle
+
+    def _unwatch(self, handle: UploadWatch) -> None:
+        """Remove a handle; the poll thread stops once none remain."""
+        with self._lock:
+            handles = self._watches.get(handle.package_id, [])
+            if handle in handles:
+                handles.remove(handle)
+            if not handles:
+                self._watches.pop(handle.package_id, None)
+            idle = not self._watches
+        if idle:
+            self._wake.set()
+
+    def _run(self) -> None:
+        """Poll loop: one fetch per tick shared by every watched upload."""
+        while True:
+            with self._lock:
+                if not self._watches:
+                    self._thread = None
+                    return
+                interval = self._interval
+                self._interval = min(self._interval * self.backoff, self.max_interval)
+
+            self._wake.clear()
+            try:
+                transfers = self.fetch()
+            except Exception:
+                # Status is temporarily unavailable; waiters time out and retry
+                transfers = None
+
+            if transfers is not None:
+                index = {t.get("package_id"): t for t in transfers}
+                with self._lock:
+                    watched = [
+                        (handle, index.get(package_id))
+                        for package_id, handles in self._watches.items()
+                        for handle in handles
+                    ]
+                for handle, transfer in watched:
+                    handle._publish(transfer)
+
+            # New registrations cut the sleep short so they get fast feedback
+            self._wake.wait(interval)
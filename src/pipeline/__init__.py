@@ -0,0 +1,12 @@
+from .destinations import Destination, parse_destination, parse_destinations
+from .jobs import BouncePipeline, Job
+from .journal import JobJournal
+
+__all__ = [
+    "BouncePipeline",
+    "Destination",
+    "Job",
+    "JobJournal",
+    "parse_destination",
+    "parse_destinations",
+]
@@ -0,0 +1,86 @@
+"""Batch mode helpers: find session files and write a results manifest."""
+
+import json
+import os
+import time
+from typing import List
+
+# Pro Tools keeps automatic backups here; they are never batch-rendered
+BACKUP_FOLDER = "Session File Backups"
+
+
+def find_sessions(paths: List[str]) -> List[str]:
+    """
+    Expand session files and folders into a list of .ptx files.
+
+    Folders are searched recursively, skipping Pro Tools' backup folders.
+
+    Args:
+        paths: Session files and/or folders containing sessions
+
+    Returns:
+        list: Absolute session paths, in the order given (folders sorted),
+        without duplicates
+
+    Raises:
+        FileNotFoundError: If a path doesn't exist
+    """
+    sessions = {}
+    for path in paths:
+        path = os.path.abspath(os.path.expanduser(path))
+        if os.path.isfile(path):
+            sessions.setdefault(path, None)
+        elif os.path.isdir(path):
+            found = []
+            for root, dirs, files in os.walk(path):
+                dirs[:] = sorted(d for d in dirs if d != BACKUP_FOLDER)
+                found += [
+                    os.path.join(root, name)
+                    for name in files
+                    if name.lower().endswith(".ptx") and not name.startswith("._")
+                ]
+            for session in sorted(found):
+                sessions.setdefault(session, None)
+        else:
+            raise FileNotFoundError(f"Session or folder not found: {path}")
+    return list(sessions)
+
+
+def write_manifest(jobs, path: str, wall_seconds: float) -> dict:
+    """
+    Write a JSON manifest of a batch's results.
+
+    Args:
+        jobs: Finished jobs, in batch order
+        path: Where to write the manifest
+        wall_seconds: Time the whole batch took
+
+    Returns:
+        dict: The manifest
+    """
+    manifest = {
+        "finished_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "wall_seconds": round(wall_seconds, 2),
+        "succeeded": sum(job.error is None for job in jobs),
+        "failed": sum(job.error is not None for job in jobs),
+        "sessions": [
+            {
+                "session_path": job.session_path,
+                "session": job.session_name,
+                "rig": job.rig,
+                "status": "failed" if job.error is not None else "done",
+                "files": job.files,
+                "package_id": job.package_id,
+                "destination": job.destination,
+                "deliveries": list(job.deliveries.values()),
+                "qc": job.qc,
+                "timings": {name: round(s, 2) for name, s in job.timings.items()},
+                "error": str(job.error) if job.error is not None else None,
+            }
+            for job in jobs
+        ],
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
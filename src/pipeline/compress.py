@@ -0,0 +1,197 @@
+"""Optional lossless compression of bounces before upload."""
+
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Optional
+
+from ..masv import throughput
+
+# Assumed uplink when nothing has been measured yet (100 Mbit/s)
+DEFAULT_UPLINK = 100_000_000 / 8
+
+# Seconds of audio encoded to measure speed and ratio
+SAMPLE_SECONDS = 10
+
+# Formats that don't gain anything from deflate inside a container
+_STORED_EXTENSIONS = {".flac", ".zip", ".mp3", ".m4a", ".aac", ".ogg", ".opus"}
+
+
+def find_flac() -> Optional[str]:
+    """Path of the flac encoder (FLAC_BINARY overrides), or None."""
+    return shutil.which(os.getenv("FLAC_BINARY", "flac"))
+
+
+@lru_cache(maxsize=4)
+def _supports_threads(binary: str) -> bool:
+    """True if this flac build can encode one file on several threads (1.5+)."""
+    result = subprocess.run([binary, "--help"], capture_output=True, text=True)
+    return "--threads" in result.stdout + result.stderr
+
+
+def encode_flac(path: str, binary: str, threads: int = 1) -> str:
+    """
+    Losslessly encode a WAV file to FLAC next to the original.
+
+    Args:
+        path: WAV file
+        binary: flac executable
+        threads: Encoder threads (used if the flac build supports it)
+
+    Returns:
+        str: Path of the .flac file
+    """
+    out = os.path.splitext(path)[0] + ".flac"
+    cmd = [binary, "--silent", "--force", "-5", "-o", out, path]
+    if threads > 1 and _supports_threads(binary):
+        cmd.insert(1, f"--threads={threads}")
+    try:
+        subprocess.run(cmd, capture_output=True, text=True, check=True)
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"FLAC encode failed for {path}: {e.stderr}")
+    return out
+
+
+def flac_encodable(path: str) -> bool:
+    """True if FLAC can hold a WAV file's samples (integer PCM, not float)."""
+    from ..audio.wav import WavReader
+
+    try:
+        with WavReader(path) as reader:
+            return not reader.is_float
+    except ValueError:
+        return False
+
+
+def measure_flac(path: str, binary: str) -> Optional[tuple]:
+    """
+    Encode the first few seconds of a WAV to estimate speed and ratio.
+
+    Args:
+        path: WAV file
+        binary: flac executable
+
+    Returns:
+        tuple: (input bytes per second, compressed/original size ratio),
+        or None if the file can't be encoded as FLAC
+    """
+    from ..audio.wav import WavReader, WavWriter
+
+    try:
+        reader = WavReader(path)
+    except ValueError:
+        return None
+    with reader, tempfile.TemporaryDirectory() as tmp:
+        if reader.is_float:
+            # FLAC has no floating-point sample format
+            return None
+        frames = min(reader.frames, reader.sample_rate * SAMPLE_SECONDS)
+        sample = os.path.join(tmp, "sample.wav")
+        with WavWriter(sample, reader.sample_rate, reader.channels, reader.bits) as w:
+            w.write(reader.read_raw(0, frames))
+        size = os.path.getsize(sample)
+
+        started = time.perf_counter()
+        encoded = encode_flac(sample, binary)
+        elapsed = max(time.perf_counter() - started, 1e-3)
+        return size / elapsed, os.path.getsize(encoded) / size
+
+
+def bundle(files: List[str], dest: str) -> str:
+    """
+    Pack files into one zip; compressed formats are stored, others deflated.
+
+    Args:
+        files: Files to pack (stored by base name)
+        dest: Zip file path
+
+    Returns:
+        str: dest
+    """
+    with zipfile.ZipFile(dest, "w") as archive:
+        for path in files:
+            stored = os.path.splitext(path)[1].lower() in _STORED_EXTENSIONS
+            archive.write(
+                path,
+                os.path.basename(path),
+                compress_type=zipfile.ZIP_STORED if stored else zipfile.ZIP_DEFLATED,
+            )
+    return dest
+
+
+def compress_for_upload(
+    files: List[str],
+    mode: str = "auto",
+    workers: Optional[int] = None,
+    container: Optional[str] = None,
+) -> List[str]:
+    """
+    Losslessly shrink files before upload when it pays off.
+
+    In 'auto' mode a short sample is encoded first; compression only runs
+    if the estimated encode time is less than the upload time it saves at
+    the measured uplink throughput. 'always' skips that check. WAV files
+    FLAC can't encode (floating-point samples) are sent as they are in
+    every mode.
+
+    Args:
+        files: Files about to be uploaded
+        mode: 'auto', 'always' or 'off'
+        workers: Parallel encodes (default: CPU count)
+        container: 'zip' to send multiple files as one archive
+
+    Returns:
+        list: Files to upload instead (the input list if nothing changed)
+    """
+    if mode == "off":
+        return files
+    workers = workers or os.cpu_count() or 1
+    wavs = [path for path in files if path.lower().endswith((".wav", ".wave"))]
+    binary = find_flac()
+    result = list(files)
+
+    if wavs and not binary:
+        print("Note: flac not found - uploading WAV files uncompressed")
+        wavs = []
+    for path in [p for p in wavs if not flac_encodable(p)]:
+        print(
+            f"Note: FLAC skipped for {os.path.basename(path)} "
+            "(floating-point or unsupported WAV) - uploading it uncompressed"
+        )
+        wavs.remove(path)
+    if wavs:
+        encode = mode == "always"
+        if not encode:
+            measured = measure_flac(wavs[0], binary)
+            if measured:
+                encode_rate, ratio = measured
+                total = sum(os.path.getsize(path) for path in wavs)
+                parallel = workers if _supports_threads(binary) else min(workers, len(wavs))
+                uplink = throughput.estimate(DEFAULT_UPLINK)
+                encode_time = total / (encode_rate * parallel)
+                saved_time = total * (1 - ratio) / uplink
+                encode = encode_time < saved_time
+                print(
+                    f"Compression: ~{(1 - ratio) * 100:.0f}% smaller, "
+                    f"encode ~{encode_time:.1f}s vs ~{saved_time:.1f}s upload saved "
+                    f"at {uplink * 8 / 1e6:.0f} Mbit/s - "
+                    f"{'compressing' if encode else 'skipping'}"
+                )
+
+        if encode:
+            threads = max(1, workers // len(wavs))
+            with ThreadPoolExecutor(max_workers=min(workers, len(wavs))) as pool:
+                encoded = dict(
+                    zip(wavs, pool.map(lambda p: encode_flac(p, binary, threads), wavs))
+                )
+            result = [encoded.get(path, path) for path in result]
+
+    if container == "zip" and len(result) > 1:
+        first = os.path.splitext(result[0])[0]
+        result = [bundle(result, f"{first}.zip")]
+    return result
@@ -0,0 +1,117 @@
+"""Content-hash index of delivered bounces, used to skip identical re-uploads."""
+
+import hashlib
+import mmap
+import os
+import time
+from typing import List, Optional, Union
+
+from ..state import JsonStore
+
+CHUNK_SIZE = 8 * 1024 * 1024
+
+
+def file_hash(path: str, chunk_size: int = CHUNK_SIZE) -> str:
+    """
+    SHA-256 of a file, streamed through an mmap in fixed-size chunks.
+
+    hashlib releases the GIL on large buffers, so several files can be
+    hashed concurrently from a thread pool.
+
+    Args:
+        path: File to hash
+        chunk_size: Bytes fed to the hash per update
+
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return digest.hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            try:
+                for offset in range(0, size, chunk_size):
+                    digest.update(view[offset : offset + chunk_size])
+            finally:
+                view.release()
+    return digest.hexdigest()
+
+
+def content_hash(paths: Union[str, List[str]]) -> str:
+    """
+    Hash the content of one or more files as a single delivery.
+
+    For several files the digest covers each file's name and hash, so the
+    same set of stems hashes the same regardless of order.
+
+    Args:
+        paths: File path or list of file paths
+
+    Returns:
+        str: Hex digest
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+    if len(paths) == 1:
+        return file_hash(paths[0])
+    digest = hashlib.sha256()
+    for name, value in sorted((os.path.basename(p), file_hash(p)) for p in paths):
+        digest.update(f"{name}\0{value}\n".encode())
+    return digest.hexdigest()
+
+
+def destination_key(
+    recipients: Optional[List[str]] = None, portal_subdomain: Optional[str] = None
+) -> str:
+    """
+    Normalised destination string used in the index.
+
+    Args:
+        recipients: Recipient email addresses (for email delivery)
+        portal_subdomain: Portal subdomain (for portal delivery)
+
+    Returns:
+        str: e.g. 'portal:clientname' or 'email:a@x.com,b@y.com'
+    """
+    if portal_subdomain:
+        return f"portal:{portal_subdomain.lower()}"
+    return "email:" + ",".join(sorted(e.strip().lower() for e in recipients or []))
+
+
+class DeliveryIndex:
+    """Persistent map of (content hash, destination) to the delivered package."""
+
+    def __init__(self, store: Optional[JsonStore] = None):
+        """
+        Initialize the index.
+
+        Args:
+            store: Backing store (default: delivered.json in the state directory)
+        """
+        self.store = store or JsonStore("delivered.json")
+
+    def lookup(self, digest: str, destination: str) -> Optional[dict]:
+        """
+        Find a previous delivery of identical content to the same destination.
+
+        Returns:
+            dict: Entry with package_id, files and delivered_at, or None
+        """
+        return self.store.load().get(f"{digest}:{destination}")
+
+    def record(
+        self, digest: str, destination: str, package_id: str, files: List[str]
+    ) -> None:
+        """Remember a completed delivery."""
+
+        def update(index):
+            index[f"{digest}:{destination}"] = {
+                "package_id": package_id,
+                "files": files,
+                "delivered_at": time.time(),
+            }
+
+        self.store.update(update)
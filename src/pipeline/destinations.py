@@ -0,0 +1,105 @@
+"""Delivery destinations: one portal or one group of email recipients."""
+
+from typing import List, Optional
+
+from ..masv.scheduler import PRIORITIES
+from .dedup import destination_key
+
+
+class Destination:
+    """Where a package is sent: a MASV portal or a list of email recipients."""
+
+    def __init__(
+        self,
+        recipients: Optional[List[str]] = None,
+        portal_subdomain: Optional[str] = None,
+        priority: str = "normal",
+    ):
+        """
+        Initialize a destination.
+
+        Args:
+            recipients: Recipient email addresses (for email delivery)
+            portal_subdomain: Portal subdomain (for portal delivery)
+            priority: Upload priority under a bandwidth limit ('high',
+                'normal' or 'backup')
+
+        Raises:
+            ValueError: If neither (or both) are given, or the priority is unknown
+        """
+        if bool(recipients) == bool(portal_subdomain):
+            raise ValueError("A destination needs either recipients or a portal subdomain")
+        if priority not in PRIORITIES:
+            raise ValueError(
+                f"Unknown priority {priority!r} (expected {', '.join(PRIORITIES)})"
+            )
+        self.recipients = list(recipients) if recipients else None
+        self.portal_subdomain = portal_subdomain
+        self.priority = priority
+
+    @property
+    def key(self) -> str:
+        """Normalised form, e.g. 'portal:clientname' (also the spec syntax)."""
+        return destination_key(self.recipients, self.portal_subdomain)
+
+    @property
+    def label(self) -> str:
+        """Human-readable form for messages."""
+        if self.portal_subdomain:
+            return f"Portal: {self.portal_subdomain}"
+        return ", ".join(self.recipients)
+
+    def __repr__(self) -> str:
+        return f"Destination({self.key!r})"
+
+
+def parse_destination(spec: str) -> Destination:
+    """
+    Parse one destination, e.g. 'portal:clientname' or 'email:a@x.com,b@y.com'.
+
+    A priority may follow in brackets, e.g. 'portal:archive [backup]'.
+
+    Args:
+        spec: Destination spec
+
+    Returns:
+        Destination: Parsed destination
+
+    Raises:
+        ValueError: If the spec is malformed
+    """
+    spec, priority = spec.strip(), "normal"
+    if spec.endswith("]") and "[" in spec:
+        spec, _, priority = spec[:-1].rpartition("[")
+        priority = priority.strip().lower()
+    kind, _, target = spec.strip().partition(":")
+    kind = kind.strip().lower()
+    if kind == "portal" and target.strip():
+        return Destination(portal_subdomain=target.strip(), priority=priority)
+    if kind == "email":
+        recipients = [e.strip() for e in target.split(",") if e.strip()]
+        if recipients:
+            return Destination(recipients=recipients, priority=priority)
+    raise ValueError(
+        f"Invalid destination {spec!r} (expected portal:<subdomain> or email:<a@x,b@y>)"
+    )
+
+
+def parse_destinations(spec: str) -> List[Destination]:
+    """
+    Parse a semicolon-separated destination list.
+
+    Example: "portal:clientname; email:producer@x.com,mixer@y.com"
+
+    Args:
+        spec: Destination specs separated by ';'
+
+    Returns:
+        list: Destinations, duplicates removed, in order
+    """
+    destinations = {}
+    for item in spec.split(";"):
+        if item.strip():
+            destination = parse_destination(item)
+            destinations.setdefault(destination.key, destination)
+    return list(destinations.values())
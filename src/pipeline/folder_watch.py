@@ -0,0 +1,262 @@
+"""Watch bounce folders and hand finished files on in coalesced batches."""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+# Files picked up by default (what Pro Tools bounces and exports)
+AUDIO_EXTENSIONS = (".wav", ".aif", ".aiff", ".mp3", ".m4a", ".mp4", ".mov")
+
+# inotify event flags (linux/inotify.h)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_MODIFY = 0x00000002
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+_EVENT = struct.Struct("iIII")
+
+
+class _PollEvents:
+    """Change detection by comparing folder listings (works everywhere)."""
+
+    name = "polling"
+
+    def __init__(self, folders: List[str], interval: float):
+        """
+        Initialize from the folders' current contents.
+
+        Args:
+            folders: Folders to watch
+            interval: Seconds between scans
+        """
+        self.folders = folders
+        self.interval = interval
+        self._seen = self._scan()
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        """Map of path to (size, mtime) for the files in the folders."""
+        found = {}
+        for folder in self.folders:
+            try:
+                entries = list(os.scandir(folder))
+            except OSError:
+                continue
+            for entry in entries:
+                try:
+                    if entry.is_file():
+                        stat = entry.stat()
+                        found[entry.path] = (stat.st_size, stat.st_mtime_ns)
+                except OSError:
+                    continue
+        return found
+
+    def wait(self, timeout: float) -> Tuple[Set[str], Set[str]]:
+        """
+        Wait for changes.
+
+        Returns:
+            tuple: (changed paths, paths known to be closed after writing) -
+            polling can't see closes, so the second set is always empty
+        """
+        time.sleep(min(timeout, self.interval))
+        current = self._scan()
+        changed = {path for path, sig in current.items() if self._seen.get(path) != sig}
+        self._seen = current
+        return changed, set()
+
+    def close(self) -> None:
+        """Nothing to release."""
+
+
+class _InotifyEvents:
+    """Change detection with Linux inotify (through libc, no extra packages)."""
+
+    name = "inotify"
+
+    def __init__(self, folders: List[str]):
+        """
+        Add an inotify watch for each folder.
+
+        Raises:
+            OSError: If inotify isn't available
+        """
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._folders = {}
+        mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_MODIFY
+        for folder in folders:
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(folder), mask)
+            if wd < 0:
+                error = ctypes.get_errno()
+                os.close(self._fd)
+                raise OSError(error, f"Cannot watch {folder}")
+            self._folders[wd] = folder
+
+    def wait(self, timeout: float) -> Tuple[Set[str], Set[str]]:
+        """
+        Wait for changes.
+
+        Returns:
+            tuple: (changed paths, paths closed after writing or moved in)
+        """
+        changed, closed = set(), set()
+        if not select.select([self._fd], [], [], timeout)[0]:
+            return changed, closed
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return changed, closed
+        offset = 0
+        while offset + _EVENT.size <= len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            name = data[offset + _EVENT.size : offset + _EVENT.size + length]
+            offset += _EVENT.size + length
+            folder = self._folders.get(wd)
+            name = os.fsdecode(name.rstrip(b"\0"))
+            if folder is None or not name:
+                continue
+            path = os.path.join(folder, name)
+            changed.add(path)
+            if mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                closed.add(path)
+        return changed, closed
+
+    def close(self) -> None:
+        """Release the inotify descriptor."""
+        os.close(self._fd)
+
+
+class FolderWatcher:
+    """
+    Watch folders for new files and report them once they are complete.
+
+    A file counts as complete once its size and modification time have not
+    changed for ``settle`` seconds (or soon after it was closed, where
+    inotify reports that). Complete files are held until nothing new has
+    appeared for ``coalesce`` seconds, so a burst - e.g. all stems of one
+    bounce - is delivered as one batch. Files already present when watching
+    starts are ignored.
+    """
+
+    def __init__(
+        self,
+        folders: List[str],
+        on_files: Callable[[List[str]], None],
+        settle: float = 3.0,
+        coalesce: float = 5.0,
+        poll_interval: float = 1.0,
+        extensions=AUDIO_EXTENSIONS,
+    ):
+        """
+        Initialize the watcher.
+
+        Args:
+            folders: Folders to watch (not recursive)
+            on_files: Called with each batch of complete files
+            settle: Seconds a file must stay unchanged to count as complete
+            coalesce: Seconds without new files before a batch is delivered
+            poll_interval: Seconds between scans when polling
+            extensions: File extensions to pick up (lowercase)
+        """
+        self.folders = [os.path.abspath(os.path.expanduser(f)) for f in folders]
+        self.on_files = on_files
+        self.settle = settle
+        self.coalesce = coalesce
+        self.poll_interval = poll_interval
+        self.extensions = tuple(extensions)
+        # path -> (size, mtime, time of last change, closed)
+        self._pending: Dict[str, Tuple[int, int, float, bool]] = {}
+        self._ready: List[str] = []
+        self._last_activity = 0.0
+        self._stop = threading.Event()
+        self._events = None
+
+    def _open_events(self):
+        """inotify where available, otherwise polling."""
+        if sys.platform.startswith("linux"):
+            try:
+                return _InotifyEvents(self.folders)
+            except (OSError, AttributeError) as e:
+                print(f"Note: inotify unavailable ({e}) - polling instead")
+        return _PollEvents(self.folders, self.poll_interval)
+
+    def _wanted(self, path: str) -> bool:
+        """True for files of a watched type (not hidden or temporary)."""
+        name = os.path.basename(path)
+        return not name.startswith(".") and name.lower().endswith(self.extensions)
+
+    def _note_change(self, path: str, closed: bool, now: float) -> None:
+        """Start or restart the settle clock for a changed file."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            # Deleted or renamed away before it settled
+            self._pending.pop(path, None)
+            return
+        previous = self._pending.get(path)
+        closed = closed or (previous is not None and previous[3])
+        self._pending[path] = (stat.st_size, stat.st_mtime_ns, now, closed)
+        self._last_activity = now
+
+    def _check_settled(self, now: float) -> None:
+        """Move files that stopped changing from pending to ready."""
+        for path, (size, mtime, changed_at, closed) in list(self._pending.items()):
+            # A close only shortens the wait; the size must still hold steady
+            settle = min(self.settle, 0.5) if closed else self.settle
+            if now - changed_at < settle:
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                del self._pending[path]
+                continue
+            if (stat.st_size, stat.st_mtime_ns) != (size, mtime):
+                self._pending[path] = (stat.st_size, stat.st_mtime_ns, now, closed)
+                self._last_activity = now
+                continue
+            del self._pending[path]
+            if stat.st_size > 0 and path not in self._ready:
+                self._ready.append(path)
+                self._last_activity = now
+
+    def _flush(self, now: float) -> None:
+        """Deliver ready files once the burst they belong to is over."""
+        if not self._ready or self._pending or now - self._last_activity < self.coalesce:
+            return
+        files, self._ready = self._ready, []
+        try:
+            self.on_files(files)
+        except Exception as e:
+            print(f"✗ Could not send {len(files)} file(s): {e}")
+
+    def run(self) -> None:
+        """Watch until ``stop`` is called (blocking)."""
+        self._events = self._open_events()
+        print(f"Watching ({self._events.name}): {', '.join(self.folders)}")
+        try:
+            while not self._stop.is_set():
+                changed, closed = self._events.wait(
+                    timeout=min(self.poll_interval, self.settle / 2)
+                )
+                now = time.monotonic()
+                for path in changed:
+                    if self._wanted(path):
+                        self._note_change(path, path in closed, now)
+                self._check_settled(now)
+                self._flush(now)
+        finally:
+            self._events.close()
+
+    def stop(self) -> None:
+        """Stop watching; ``run`` returns after the current wait."""
+        self._stop.set()
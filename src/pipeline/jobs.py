@@ -0,0 +1,397 @@
+"""Job queue that overlaps Pro Tools bounces with MASV uploads."""
+
+import queue
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+
+class Job:
+    """A single bounce-and-send request moving through the pipeline."""
+
+    def __init__(
+        self,
+        recipients: Optional[List[str]] = None,
+        portal_subdomain: Optional[str] = None,
+        destinations: Optional[list] = None,
+        session_path: Optional[str] = None,
+        rig: Optional[str] = None,
+        bounce_range: Optional[tuple] = None,
+    ):
+        """
+        Initialize a job.
+
+        Args:
+            recipients: Recipient email addresses (for email mode)
+            portal_subdomain: Portal subdomain (for portal mode)
+            destinations: Destinations to fan the bounce out to (overrides
+                recipients/portal_subdomain)
+            session_path: Session file to open and bounce (default: the
+                session already open in Pro Tools)
+            rig: Name of the Pro Tools rig to bounce on (default: the least
+                busy one); set to the rig used once the bounce starts
+            bounce_range: (start, end) in seconds from the start of the mix
+                to re-bounce and splice into the previous bounce
+        """
+        self.id = uuid.uuid4().hex[:12]
+        self.recipients = recipients
+        self.portal_subdomain = portal_subdomain
+        self.destinations = destinations
+        self.session_path = session_path
+        self.rig = rig
+        self.bounce_range = bounce_range
+        self.phase = "queued"
+        self.created_at = time.time()
+        self.session_name: Optional[str] = None
+        self.bounce_path: Optional[str] = None
+        self.files: List[str] = []
+        self.content_hash: Optional[str] = None
+        self.hash_future: Optional[Future] = None
+        # MASV preflight, started when the job is queued; resolves to the MASV client
+        self.preflight: Optional[Future] = None
+        self.reused = False
+        self.progress = None
+        self.package_id: Optional[str] = None
+        self.destination: Optional[str] = None
+        # Per-destination status, keyed by destination key
+        self.deliveries: Dict[str, dict] = {}
+        # QC report of each checked bounce file
+        self.qc: List[dict] = []
+        # Seconds spent in each pipeline step, e.g. {"bounce": 41.2, "send": 63.0}
+        self.timings: Dict[str, float] = {}
+        self.error: Optional[BaseException] = None
+        self._done = threading.Event()
+
+    @property
+    def done(self) -> bool:
+        """True once the job has finished or failed."""
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the job finishes.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            bool: True if the job finished within the timeout
+        """
+        return self._done.wait(timeout)
+
+    def result(self, timeout: Optional[float] = None):
+        """
+        Wait for the job and return its outcome.
+
+        Returns:
+            tuple: (bounce_path, package_id)
+
+        Raises:
+            TimeoutError: If the job is still running after ``timeout``
+            Exception: Whatever error failed the job
+        """
+        if not self.wait(timeout):
+            raise TimeoutError(f"Job {self.id} still {self.phase}")
+        if self.error is not None:
+            raise self.error
+        return self.bounce_path, self.package_id
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        """Mark the job done (or failed) and wake waiters."""
+        self.error = error
+        self.phase = "failed" if error is not None else "done"
+        self._done.set()
+
+
+class _Lane:
+    """One serial bounce worker (per Pro Tools rig) and its queue."""
+
+    def __init__(self, rig=None):
+        """
+        Initialize the lane.
+
+        Args:
+            rig: Rig the lane bounces on (None for a single unnamed worker)
+        """
+        self.rig = rig
+        self.name = rig.name if rig is not None else None
+        self.queue: "queue.Queue[Optional[Job]]" = queue.Queue()
+        self.current: Optional[Job] = None
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def load(self) -> int:
+        """Jobs queued or bouncing on this lane."""
+        return self.queue.qsize() + (self.current is not None)
+
+
+class BouncePipeline:
+    """
+    Run bounces one at a time per Pro Tools rig while uploads proceed concurrently.
+
+    Pro Tools can only run one offline bounce at a time, so each rig gets
+    a single worker thread that takes jobs off its queue and calls
+    ``bounce``; with several rigs, the rigs bounce concurrently. A job goes
+    to the rig it names (``job.rig``) or else to the least busy healthy
+    one. Each finished bounce is handed to one shared thread pool that
+    calls ``upload``, letting the next bounce start while earlier ones are
+    still uploading.
+    """
+
+    def __init__(
+        self,
+        bounce: Callable[[Job], None],
+        upload: Callable[[Job], None],
+        upload_workers: int = 3,
+        on_error: Optional[Callable[[Job, BaseException], None]] = None,
+        rigs: Optional[list] = None,
+        health_interval: float = 30.0,
+    ):
+        """
+        Initialize the pipeline.
+
+        Args:
+            bounce: Called on a bounce thread; sets ``job.bounce_path``
+            upload: Called on an upload worker; sets ``job.package_id``
+            upload_workers: Maximum number of concurrent uploads
+            on_error: Optional callback for failed jobs
+            rigs: Pro Tools rigs (objects with ``name``, ``healthy`` and
+                ``check()``), one bounce worker each (default: one worker)
+            health_interval: Seconds between rig health checks
+        """
+        self.bounce = bounce
+        self.upload = upload
+        self.on_error = on_error
+        self._lanes = [_Lane(rig) for rig in rigs] if rigs else [_Lane()]
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        # Held while moving jobs between lanes and while ending the queues, so
+        # no job lands behind a lane's end-of-queue marker
+        self._moving = threading.Lock()
+        self._uploads = ThreadPoolExecutor(
+            max_workers=upload_workers, thread_name_prefix="upload"
+        )
+        for lane in self._lanes:
+            lane.thread = threading.Thread(
+                target=self._bounce_loop,
+                args=(lane,),
+                name=f"bounce-{lane.name}" if lane.name else "bounce",
+                daemon=True,
+            )
+            lane.thread.start()
+        self._health = None
+        if rigs:
+            self._health = threading.Thread(
+                target=self._health_loop,
+                args=(health_interval,),
+                name="rig-health",
+                daemon=True,
+            )
+            self._health.start()
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of jobs waiting for a bounce worker."""
+        return sum(lane.queue.qsize() for lane in self._lanes)
+
+    def status(self) -> List[dict]:
+        """
+        Health and load of each rig.
+
+        Returns:
+            list: One dict per rig with its health, queued job count and
+            the ID of the job bouncing on it
+        """
+        return [
+            {
+                **(lane.rig.status() if lane.rig is not None else {"rig": None}),
+                "queued": lane.queue.qsize(),
+                "bouncing": lane.current.id if lane.current else None,
+            }
+            for lane in self._lanes
+        ]
+
+    def resume(self, job: Job) -> Job:
+        """
+        Hand an already-bounced job straight to the upload workers.
+
+        Args:
+            job: Job whose bounce files already exist
+
+        Returns:
+            Job: The same job
+
+        Raises:
+            RuntimeError: If the pipeline has been shut down
+        """
+        with self._moving:
+            if self._stop.is_set():
+                raise RuntimeError("Bounce pipeline is shut down")
+            job.phase = "uploading"
+            self._uploads.submit(self._upload, job)
+        return job
+
+    def submit(self, job: Job) -> Job:
+        """
+        Enqueue a job on its rig and return immediately.
+
+        Args:
+            job: Job to run
+
+        Returns:
+            Job: The same job, for chaining ``.wait()``/``.result()``
+
+        Raises:
+            ValueError: If the job names a rig that isn't configured
+            RuntimeError: If the pipeline has been shut down
+        """
+        # Checked under the same lock that ends the queues, so a job is
+        # either ahead of the end-of-queue markers or refused
+        with self._moving:
+            if self._stop.is_set():
+                raise RuntimeError("Bounce pipeline is shut down")
+            self._dispatch(job).queue.put(job)
+        return job
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop accepting work.
+
+        Jobs already queued are still bounced and uploaded.
+
+        Args:
+            wait: Block until queued bounces and running uploads finish
+        """
+        with self._moving:
+            self._stop.set()
+        if self._health is not None:
+            self._health.join()
+        with self._moving:
+            for lane in self._lanes:
+                lane.queue.put(None)
+        if wait:
+            self._close_uploads()
+        else:
+            threading.Thread(
+                target=self._close_uploads, name="pipeline-shutdown", daemon=True
+            ).start()
+
+    def _close_uploads(self) -> None:
+        """Shut the upload pool once no bounce worker can hand it more work."""
+        for lane in self._lanes:
+            lane.thread.join()
+        self._uploads.shutdown(wait=True)
+
+    def _dispatch(self, job: Job, exclude: Optional[_Lane] = None) -> _Lane:
+        """Lane for a job: its named rig, else the least busy healthy one."""
+        with self._lock:
+            if job.rig is not None:
+                for lane in self._lanes:
+                    if lane.name == job.rig:
+                        return lane
+                raise ValueError(f"Unknown Pro Tools rig: {job.rig}")
+            lanes = [lane for lane in self._lanes if lane is not exclude] or self._lanes
+            healthy = [lane for lane in lanes if lane.rig is None or lane.rig.healthy]
+            return min(healthy or lanes, key=lambda lane: lane.load)
+
+    def _health_loop(self, interval: float) -> None:
+        """Check every rig, then move waiting jobs off rigs that stopped answering."""
+        while True:
+            for lane in self._lanes:
+                lane.rig.check()
+            if len(self._lanes) > 1:
+                for lane in self._lanes:
+                    if not lane.rig.healthy:
+                        self._move_queued(lane)
+            if self._stop.wait(interval):
+                return
+
+    def _move_queued(self, lane: _Lane) -> None:
+        """Re-dispatch jobs queued on a lane that weren't pinned to its rig."""
+        with self._moving:
+            if self._stop.is_set() or not any(other.rig.healthy for other in self._lanes):
+                return
+            kept = []
+            while True:
+                try:
+                    job = lane.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if job.rig is not None:
+                    kept.append(job)
+                    continue
+                target = self._dispatch(job, exclude=lane)
+                print(
+                    f"Pro Tools rig {lane.name} is unreachable - "
+                    f"moving job {job.id} to {target.name}"
+                )
+                target.queue.put(job)
+            for job in kept:
+                lane.queue.put(job)
+
+    def _move(self, job: Job, lane: _Lane) -> bool:
+        """
+        Hand a job from an unreachable lane to a healthy one.
+
+        Returns:
+            bool: False if no other rig is healthy or the pipeline is
+            shutting down (the other workers may have exited), in which case
+            the job stays with ``lane``
+        """
+        with self._moving:
+            if self._stop.is_set():
+                return False
+            target = self._dispatch(job, exclude=lane)
+            if not target.rig.healthy:
+                return False
+            print(
+                f"Pro Tools rig {lane.name} is unreachable - "
+                f"moving job {job.id} to {target.name}"
+            )
+            target.queue.put(job)
+            return True
+
+    def _fail(self, job: Job, error: BaseException) -> None:
+        """Record a job failure."""
+        job.finish(error)
+        if self.on_error:
+            self.on_error(job, error)
+
+    def _bounce_loop(self, lane: _Lane) -> None:
+        """Bounce worker for one rig: serial, one job at a time."""
+        while True:
+            job = lane.queue.get()
+            if job is None:
+                return
+            if (
+                job.rig is None
+                and len(self._lanes) > 1
+                and not self._stop.is_set()
+                and not lane.rig.check()
+                and self._move(job, lane)
+            ):
+                # Unpinned job on a rig that went away: another rig took it
+                continue
+            job.rig = lane.name
+            job.phase = "bouncing"
+            lane.current = job
+            try:
+                self.bounce(job)
+            except Exception as e:
+                self._fail(job, e)
+                continue
+            finally:
+                lane.current = None
+            job.phase = "uploading"
+            self._uploads.submit(self._upload, job)
+
+    def _upload(self, job: Job) -> None:
+        """Upload worker: runs concurrently with the next bounce."""
+        try:
+            self.upload(job)
+        except Exception as e:
+            self._fail(job, e)
+            return
+        job.finish()
@@ -0,0 +1,250 @@
+"""Durable record of job progress, used to resume work after a crash."""
+
+import fcntl
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import List, Optional
+
+from ..state import state_dir
+from .dedup import destination_key
+from .jobs import Job
+
+# Phases after which nothing is left to resume
+FINISHED_PHASES = ("done", "failed")
+
+# Finished jobs older than this are dropped from the journal
+KEEP_FINISHED_DAYS = 30
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    phase TEXT NOT NULL,
+    owner TEXT NOT NULL,
+    recipients TEXT,
+    portal_subdomain TEXT,
+    session_name TEXT,
+    bounce_path TEXT,
+    files TEXT,
+    content_hash TEXT,
+    upload_id TEXT,
+    package_id TEXT,
+    destination TEXT,
+    error TEXT,
+    updated_at REAL NOT NULL,
+    deliveries TEXT
+)
+"""
+
+# Columns added after the first release, with their types
+_ADDED_COLUMNS = {"deliveries": "TEXT"}
+
+_COLUMNS = (
+    "id, phase, owner, recipients, portal_subdomain, session_name, bounce_path, "
+    "files, content_hash, upload_id, package_id, destination, error, updated_at, "
+    "deliveries"
+)
+
+
+def _lease_held(path: str) -> bool:
+    """True if some live process holds the lock on a lease file."""
+    try:
+        fd = os.open(path, os.O_RDWR)
+    except OSError:
+        return False
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return True
+    finally:
+        os.close(fd)
+    # Nobody holds it - the owner is gone
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+    return False
+
+
+class JobJournal:
+    """
+    SQLite journal of each job's phase, bounce files and upload ID.
+
+    Every phase change is committed before the pipeline moves on, so if
+    the process dies mid-job the next run can see how far the job got.
+    Each process holds an flock on its own lease file while it runs and
+    rows name that lease as their owner; only jobs whose owner's lock is
+    free (the process exited, crashed or the machine rebooted) are offered
+    for resume, so the daemon and one-shot runs never pick up each other's
+    live jobs.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Open (or create) the journal.
+
+        Args:
+            path: Database file (default: jobs.db in the state directory)
+        """
+        self.path = path or str(state_dir() / "jobs.db")
+        self._lock = threading.Lock()
+
+        leases = os.path.join(os.path.dirname(self.path), "leases")
+        os.makedirs(leases, exist_ok=True)
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._leases = leases
+        self._lease_path = os.path.join(leases, f"{self.owner}.lock")
+        # Locked before it appears under its final name, so a sweep by
+        # another process never sees (and removes) it unlocked
+        pending = os.path.join(leases, f"{self.owner}.tmp")
+        self._lease = open(pending, "w")
+        fcntl.flock(self._lease, fcntl.LOCK_EX)
+        os.replace(pending, self._lease_path)
+        self._sweep_leases()
+
+        with self._connect() as db:
+            db.execute(_SCHEMA)
+            existing = {row[1] for row in db.execute("PRAGMA table_info(jobs)")}
+            for column, kind in _ADDED_COLUMNS.items():
+                if column not in existing:
+                    db.execute(f"ALTER TABLE jobs ADD COLUMN {column} {kind}")
+            db.execute(
+                "DELETE FROM jobs WHERE phase IN (?, ?) AND updated_at < ?",
+                FINISHED_PHASES + (time.time() - KEEP_FINISHED_DAYS * 86400,),
+            )
+
+    def _sweep_leases(self) -> None:
+        """Remove lease files left by processes that are gone."""
+        for name in os.listdir(self._leases):
+            if name.endswith(".lock") and name != f"{self.owner}.lock":
+                # Removes the file if nobody holds it
+                _lease_held(os.path.join(self._leases, name))
+
+    def close(self) -> None:
+        """
+        Release this process's lease and remove its file.
+
+        Unfinished jobs it still owns become available for resume by the
+        next run. Safe to call more than once.
+        """
+        if self._lease is None:
+            return
+        try:
+            os.remove(self._lease_path)
+        except OSError:
+            pass
+        self._lease.close()
+        self._lease = None
+
+    @contextmanager
+    def _connect(self):
+        """Short-lived connection; one writer at a time within the process."""
+        with self._lock:
+            db = sqlite3.connect(self.path, timeout=10)
+            try:
+                with db:
+                    yield db
+            finally:
+                db.close()
+
+    def record(self, job: Job, phase: str) -> None:
+        """
+        Store the job's current state under a phase.
+
+        Args:
+            job: Job to record
+            phase: Phase reached ('queued', 'bouncing', 'bounced',
+                'uploading', 'done' or 'failed')
+        """
+        with self._connect() as db:
+            db.execute(
+                f"INSERT OR REPLACE INTO jobs ({_COLUMNS}) VALUES "
+                "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job.id,
+                    phase,
+                    self.owner,
+                    json.dumps(job.recipients),
+                    job.portal_subdomain,
+                    job.session_name,
+                    job.bounce_path,
+                    json.dumps(job.files),
+                    job.content_hash,
+                    ",".join(
+                        d["upload_id"] for d in job.deliveries.values() if d.get("upload_id")
+                    )
+                    or None,
+                    job.package_id,
+                    job.destination,
+                    str(job.error) if job.error is not None else None,
+                    time.time(),
+                    json.dumps(job.deliveries),
+                ),
+            )
+
+    def interrupted(self) -> List[Job]:
+        """
+        Claim and return unfinished jobs whose owning process is gone.
+
+        Claiming moves the rows to this process, so a job is resumed by
+        exactly one process.
+
+        Returns:
+            list: Jobs rebuilt from the journal, oldest first, with
+            ``phase`` set to the last phase recorded
+        """
+        with self._connect() as db:
+            db.row_factory = sqlite3.Row
+            rows = db.execute(
+                "SELECT * FROM jobs WHERE phase NOT IN (?, ?) ORDER BY updated_at",
+                FINISHED_PHASES,
+            ).fetchall()
+            claimed = []
+            for row in rows:
+                owner = row["owner"]
+                if owner == self.owner or _lease_held(
+                    os.path.join(self._leases, f"{owner}.lock")
+                ):
+                    continue
+                cursor = db.execute(
+                    "UPDATE jobs SET owner = ? WHERE id = ? AND owner = ?",
+                    (self.owner, row["id"], owner),
+                )
+                if cursor.rowcount:
+                    claimed.append(row)
+
+        jobs = []
+        for row in claimed:
+            job = Job(
+                recipients=json.loads(row["recipients"]),
+                portal_subdomain=row["portal_subdomain"],
+            )
+            job.id = row["id"]
+            job.phase = row["phase"]
+            job.session_name = row["session_name"]
+            job.bounce_path = row["bounce_path"]
+            job.files = json.loads(row["files"] or "[]")
+            job.content_hash = row["content_hash"]
+            job.destination = row["destination"]
+            job.deliveries = json.loads(row["deliveries"] or "{}")
+            if not job.deliveries and row["upload_id"] and (
+                job.recipients or job.portal_subdomain
+            ):
+                # Written before per-destination deliveries were journaled
+                key = destination_key(job.recipients, job.portal_subdomain)
+                job.deliveries[key] = {
+                    "destination": key,
+                    "preview": False,
+                    "label": job.destination,
+                    "status": "uploading",
+                    "upload_id": row["upload_id"],
+                    "package_id": None,
+                    "error": None,
+                    "progress": None,
+                }
+            jobs.append(job)
+        return jobs
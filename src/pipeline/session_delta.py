@@ -0,0 +1,263 @@
+"""Delta transfer of Pro Tools session folders using a content-hash manifest."""
+
+import json
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from ..state import JsonStore
+from .batch import BACKUP_FOLDER
+from .dedup import file_hash
+
+# Written at the top of every session package
+MANIFEST_NAME = "session_manifest.json"
+
+# Files never worth sending (Finder/Pro Tools housekeeping)
+_SKIP_FILES = {".DS_Store", "Thumbs.db", MANIFEST_NAME}
+
+
+def session_files(folder: str) -> List[str]:
+    """
+    List the files of a session folder, relative to it.
+
+    Hidden files and Pro Tools' automatic backups are left out.
+
+    Args:
+        folder: Session folder (the one holding the .ptx)
+
+    Returns:
+        list: Relative paths with '/' separators, sorted
+    """
+    found = []
+    for root, dirs, files in os.walk(folder):
+        dirs[:] = sorted(d for d in dirs if d != BACKUP_FOLDER and not d.startswith("."))
+        for name in files:
+            if name.startswith(".") or name in _SKIP_FILES:
+                continue
+            path = os.path.relpath(os.path.join(root, name), folder)
+            found.append(path.replace(os.sep, "/"))
+    return sorted(found)
+
+
+class HashIndex:
+    """
+    Persistent map of file path to content hash, valid while (mtime, size) match.
+
+    Unchanged audio files are not read again, so re-scanning a session
+    folder only costs one stat per file.
+    """
+
+    def __init__(self, store: Optional[JsonStore] = None, workers: Optional[int] = None):
+        """
+        Initialize the index.
+
+        Args:
+            store: Backing store (default: file_hashes.json in the state directory)
+            workers: Files hashed concurrently (default: up to 8, by CPU count)
+        """
+        self.store = store or JsonStore("file_hashes.json")
+        self.workers = workers or min(8, os.cpu_count() or 1)
+
+    @staticmethod
+    def _file_state(path: str) -> List[int]:
+        """(mtime, size) of a file."""
+        st = os.stat(path)
+        return [st.st_mtime_ns, st.st_size]
+
+    def hashes(self, paths: List[str]) -> Dict[str, str]:
+        """
+        Return the SHA-256 of each file, hashing only new or modified ones.
+
+        Args:
+            paths: Absolute file paths
+
+        Returns:
+            dict: Path to hex digest
+        """
+        known = self.store.load()
+        states = {path: self._file_state(path) for path in paths}
+        result, stale = {}, []
+        for path, state in states.items():
+            entry = known.get(path)
+            if entry and entry["state"] == state:
+                result[path] = entry["sha256"]
+            else:
+                stale.append(path)
+
+        if stale:
+            # file_hash releases the GIL on its mmap chunks, so threads scale
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                for path, digest in zip(stale, pool.map(file_hash, stale)):
+                    result[path] = digest
+
+            def update(index):
+                for path in stale:
+                    index[path] = {"state": states[path], "sha256": result[path]}
+
+            self.store.update(update)
+        return result
+
+    def modified(self, paths: List[str]) -> List[str]:
+        """
+        Return the files changed (or removed) since they were last hashed.
+
+        Args:
+            paths: Absolute file paths
+
+        Returns:
+            list: Paths whose (mtime, size) no longer match the index
+        """
+        known = self.store.load()
+        result = []
+        for path in paths:
+            entry = known.get(path)
+            try:
+                state = self._file_state(path)
+            except OSError:
+                state = None
+            if entry is None or entry["state"] != state:
+                result.append(path)
+        return result
+
+    def forget_missing(self, folder: str) -> None:
+        """Drop entries for files under ``folder`` that no longer exist."""
+        prefix = os.path.join(folder, "")
+
+        def update(index):
+            for path in [p for p in index if p.startswith(prefix)]:
+                if not os.path.exists(path):
+                    del index[path]
+
+        self.store.update(update)
+
+
+def build_manifest(folder: str, index: Optional[HashIndex] = None) -> dict:
+    """
+    Describe every file of a session folder by size and content hash.
+
+    Args:
+        folder: Session folder
+        index: Hash index to reuse (default: the one in the state directory)
+
+    Returns:
+        dict: ``{"session": name, "created_at": ..., "files": {relpath:
+        {"size": ..., "sha256": ...}}}``
+
+    Raises:
+        FileNotFoundError: If the folder doesn't exist
+    """
+    folder = os.path.realpath(folder)
+    if not os.path.isdir(folder):
+        raise FileNotFoundError(f"Session folder not found: {folder}")
+    index = index or HashIndex()
+    relpaths = session_files(folder)
+    paths = [os.path.join(folder, *rel.split("/")) for rel in relpaths]
+    hashes = index.hashes(paths)
+    return {
+        "session": os.path.basename(folder),
+        "created_at": time.time(),
+        "files": {
+            rel: {"size": os.path.getsize(path), "sha256": hashes[path]}
+            for rel, path in zip(relpaths, paths)
+        },
+    }
+
+
+def diff_manifests(previous: Optional[dict], current: dict) -> Tuple[List[str], List[str]]:
+    """
+    Compare two session manifests.
+
+    Args:
+        previous: Manifest of the last delivery, or None
+        current: Manifest of the folder now
+
+    Returns:
+        tuple: (new or changed relative paths, removed relative paths)
+    """
+    old = (previous or {}).get("files", {})
+    new = current["files"]
+    changed = [rel for rel, entry in new.items() if old.get(rel, {}).get("sha256") != entry["sha256"]]
+    removed = sorted(rel for rel in old if rel not in new)
+    return changed, removed
+
+
+def stage_package(folder: str, changed: List[str], manifest: dict) -> str:
+    """
+    Lay out the files to send in a temporary tree mirroring the session folder.
+
+    Files are hard-linked where possible (copied otherwise), so staging a
+    package of large audio files is nearly free. The manifest is written at
+    the top. Remove the returned directory's parent once the upload is done.
+
+    Hard links share the live files, so a file edited while the package
+    uploads is sent as edited: check ``HashIndex.modified`` afterwards
+    before trusting the manifest.
+
+    Args:
+        folder: Session folder
+        changed: Relative paths to include
+        manifest: Manifest written as session_manifest.json
+
+    Returns:
+        str: Staged session folder, named like the original
+    """
+    folder = os.path.realpath(folder)
+    # Next to the session, so hard links stay on the same volume
+    try:
+        staging = tempfile.mkdtemp(prefix=".masv-delta-", dir=os.path.dirname(folder))
+    except OSError:
+        staging = tempfile.mkdtemp(prefix="masv-delta-")
+    root = os.path.join(staging, os.path.basename(folder))
+    os.makedirs(root)
+    for rel in changed:
+        source = os.path.join(folder, *rel.split("/"))
+        target = os.path.join(root, *rel.split("/"))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        try:
+            os.link(source, target)
+        except OSError:
+            shutil.copy2(source, target)
+    with open(os.path.join(root, MANIFEST_NAME), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return root
+
+
+class SessionDeliveries:
+    """Persistent record of the manifest last delivered per (session folder, destination)."""
+
+    def __init__(self, store: Optional[JsonStore] = None):
+        """
+        Initialize the record.
+
+        Args:
+            store: Backing store (default: session_deliveries.json in the state directory)
+        """
+        self.store = store or JsonStore("session_deliveries.json")
+
+    @staticmethod
+    def _key(folder: str, destination: str) -> str:
+        return f"{os.path.realpath(folder)}:{destination}"
+
+    def lookup(self, folder: str, destination: str) -> Optional[dict]:
+        """
+        Return the last delivery of this session folder to the destination.
+
+        Returns:
+            dict: Entry with package_id, manifest and delivered_at, or None
+        """
+        return self.store.load().get(self._key(folder, destination))
+
+    def record(self, folder: str, destination: str, package_id: str, manifest: dict) -> None:
+        """Remember a completed delivery and the manifest it brought the recipient to."""
+
+        def update(index):
+            index[self._key(folder, destination)] = {
+                "package_id": package_id,
+                "manifest": manifest,
+                "delivered_at": time.time(),
+            }
+
+        self.store.update(update)
@@ -1,3 +1,5 @@
-from .client import ProToolsClient
+from .cache import BounceCache
+from .client import ProToolsClient, parse_stems
+from .rigs import Rig, parse_rigs
 
-__all__ = ['ProToolsClient']
+__all__ = ['BounceCache', 'ProToolsClient', 'Rig', 'parse_rigs', 'parse_stems']
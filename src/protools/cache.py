@@ -0,0 +1,176 @@
+"""Cache of previous bounces, reused while the session file is unchanged."""
+
+import hashlib
+import json
+import os
+import time
+
+from ..state import JsonStore
+
+
+class BounceCache:
+    """
+    Remember bounces by session and settings.
+
+    An entry is valid while the session file's mtime and size match the
+    values recorded at bounce time and the bounced files are still on disk
+    unmodified. Only the saved session file is fingerprinted, so unsaved
+    edits in Pro Tools are not seen. Total size of cached bounces is kept
+    under ``max_bytes`` by deleting the least recently used ones.
+    """
+
+    def __init__(self, max_bytes=20 * 1024**3, store=None):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Size limit for all cached bounce files together
+            store: Backing store (default: bounce_cache.json in the state directory)
+        """
+        self.max_bytes = max_bytes
+        self.store = store or JsonStore("bounce_cache.json")
+
+    @staticmethod
+    def _key(session_path, settings):
+        """Cache key: session identity plus bounce settings."""
+        blob = json.dumps(
+            [os.path.realpath(session_path), settings], sort_keys=True, default=str
+        )
+        return hashlib.sha256(blob.encode()).hexdigest()[:24]
+
+    @staticmethod
+    def _session_fingerprint(session_path):
+        """Change fingerprint of the saved session file."""
+        st = os.stat(session_path)
+        return [st.st_mtime_ns, st.st_size]
+
+    @staticmethod
+    def _file_state(path):
+        """(mtime, size) of a bounced file, or None if it's gone."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return [st.st_mtime_ns, st.st_size]
+
+    def lookup(self, session_path, settings):
+        """
+        Return the cached bounce for this session state, if still valid.
+
+        Args:
+            session_path: Path of the .ptx session file
+            settings: Bounce settings (file name, format, stems, ...)
+
+        Returns:
+            str or list: Cached path(s) as returned by bounce_to_disk, or None
+        """
+        key = self._key(session_path, settings)
+        try:
+            fingerprint = self._session_fingerprint(session_path)
+        except OSError:
+            return None
+
+        def check(index):
+            entry = index.get(key)
+            if entry is None:
+                return None
+            valid = entry["session"] == fingerprint and all(
+                self._file_state(path) == state for path, state in entry["files"]
+            )
+            if not valid:
+                del index[key]
+                return None
+            entry["last_used"] = time.time()
+            return entry["result"]
+
+        return self.store.update(check)
+
+    def previous(self, session_path, settings):
+        """
+        Return the last bounce for these settings even if the session changed since.
+
+        Used as the base for a partial re-bounce; the bounced files must
+        still be on disk unmodified.
+
+        Args:
+            session_path: Path of the .ptx session file
+            settings: Bounce settings (file name, format, stems, ...)
+
+        Returns:
+            str or list: Cached path(s) as returned by bounce_to_disk, or None
+        """
+        key = self._key(session_path, settings)
+
+        def check(index):
+            entry = index.get(key)
+            if entry is None or not all(
+                self._file_state(path) == state for path, state in entry["files"]
+            ):
+                return None
+            entry["last_used"] = time.time()
+            return entry["result"]
+
+        return self.store.update(check)
+
+    def add(self, session_path, settings, result):
+        """
+        Record a fresh bounce and evict old ones over the size limit.
+
+        Args:
+            session_path: Path of the .ptx session file
+            settings: Bounce settings used
+            result: Path or list of paths returned by the bounce
+        """
+        paths = result if isinstance(result, list) else [result]
+        try:
+            fingerprint = self._session_fingerprint(session_path)
+        except OSError:
+            return
+        files = [[path, self._file_state(path)] for path in paths]
+        if any(state is None for _, state in files):
+            return
+
+        def update(index):
+            index[self._key(session_path, settings)] = {
+                "session_path": os.path.realpath(session_path),
+                "session": fingerprint,
+                "files": files,
+                "result": result,
+                "last_used": time.time(),
+            }
+            self._evict(index)
+
+        self.store.update(update)
+
+    def invalidate(self, session_path=None):
+        """
+        Drop entries (files are left on disk).
+
+        Args:
+            session_path: Only drop this session's entries (default: all)
+        """
+
+        target = session_path and os.path.realpath(session_path)
+
+        def update(index):
+            for key in list(index):
+                if target is None or index[key]["session_path"] == target:
+                    del index[key]
+
+        self.store.update(update)
+
+    def _evict(self, index):
+        """Delete least recently used bounces until under ``max_bytes``."""
+        total = sum(state[1] for entry in index.values() for _, state in entry["files"])
+        for key in sorted(index, key=lambda k: index[k]["last_used"]):
+            if total <= self.max_bytes or len(index) <= 1:
+                break
+            entry = index.pop(key)
+            in_use = {path for other in index.values() for path, _ in other["files"]}
+            for path, state in entry["files"]:
+                total -= state[1]
+                if path not in in_use:
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
@@ -1,50 +1,51 @@
 """Pro Tools Scripting API Client Wrapper."""
 
+import math
 import os
-import sys
+import time
 
-import grpc
+from ..timing import span, timed
 
-# Add generated directory to path
-generated_path = os.path.abspath(
-    os.path.join(os.path.dirname(__file__), "../../generated")
-)
-sys.path.insert(0, generated_path)
+# Generated gRPC code is loaded on first use, not at import time
+from .ptsl import ptsl_pb2, ptsl_pb2_grpc
 
-# Import generated gRPC code
-# Note: The proto file generates modules at PTSL/2025/06/0_pb2.py
-try:
-    from PTSL._2025._06 import _0_pb2 as ptsl_pb2
-    from PTSL._2025._06 import _0_pb2_grpc as ptsl_pb2_grpc
-except ImportError:
-    # Alternative import path
-    import importlib.util
 
-    pb2_path = os.path.join(generated_path, "PTSL/2025/06/0_pb2.py")
-    grpc_path = os.path.join(generated_path, "PTSL/2025/06/0_pb2_grpc.py")
+def parse_stems(spec):
+    """
+    Parse a stems spec like "Dialog,Music,output:Out 1-2".
 
-    spec_pb2 = importlib.util.spec_from_file_location("ptsl_pb2", pb2_path)
-    ptsl_pb2 = importlib.util.module_from_spec(spec_pb2)
-    spec_pb2.loader.exec_module(ptsl_pb2)
+    Entries are bus names, or output paths prefixed with 'output:'.
 
-    spec_grpc = importlib.util.spec_from_file_location("ptsl_pb2_grpc", grpc_path)
-    ptsl_pb2_grpc = importlib.util.module_from_spec(spec_grpc)
-    spec_grpc.loader.exec_module(ptsl_pb2_grpc)
+    Args:
+        spec: Comma-separated mix sources
+
+    Returns:
+        list: (source type, name) tuples, e.g. ('EMSType_Bus', 'Dialog')
+    """
+    stems = []
+    for source in spec.split(","):
+        source_type, _, source_name = source.strip().rpartition(":")
+        if source_name:
+            stems.append((f"EMSType_{source_type.capitalize() or 'Bus'}", source_name))
+    return stems
 
 
 class ProToolsClient:
     """Client for interacting with Pro Tools via the Scripting API."""
 
-    def __init__(self, host="localhost", port=31416):
+    def __init__(self, host="localhost", port=31416, bounce_cache=None):
         """
         Initialize Pro Tools client.
 
         Args:
             host: Pro Tools Scripting API host (default: localhost)
             port: Pro Tools Scripting API port (default: 31416)
+            bounce_cache: Optional BounceCache; unchanged sessions reuse
+                the previous bounce instead of exporting again
         """
         self.host = host
         self.port = port
+        self.bounce_cache = bounce_cache
         self.channel = None
         self.stub = None
         self.session_id = None
@@ -54,14 +55,18 @@ class ProToolsClient:
         address = f"{self.host}:{self.port}"
         print(f"Connecting to Pro Tools at {address}...")
 
-        self.channel = grpc.insecure_channel(address)
-        self.stub = ptsl_pb2_grpc.PTSLStub(self.channel)
+        with span("protools.connect", address=address):
+            import grpc
+
+            self.channel = grpc.insecure_channel(address)
+            self.stub = ptsl_pb2_grpc.PTSLStub(self.channel)
 
         print("Connected to Pro Tools!")
 
         # Register the connection (required by Pro Tools SDK)
         self._register_connection()
 
+    @timed("protools.register")
     def _register_connection(self):
         """Register this client connection with Pro Tools."""
         import json
@@ -100,6 +105,7 @@ class ProToolsClient:
             self.channel.close()
             print("Disconnected from Pro Tools")
 
+    @timed("protools.session_info")
     def get_session_info(self):
         """
         Get information about the currently open Pro Tools session.
@@ -130,6 +136,106 @@ class ProToolsClient:
 
         return session_data
 
+    @timed("protools.session_path")
+    def get_session_path(self):
+        """
+        Get the path of the currently open session file.
+
+        Returns:
+            str: Path to the .ptx file, or empty string if unavailable
+        """
+        import json
+
+        header = ptsl_pb2.RequestHeader(
+            command=ptsl_pb2.CId_GetSessionPath, version=1, session_id=self.session_id
+        )
+        request = ptsl_pb2.Request(header=header)
+        response = self.stub.SendGrpcRequest(request)
+
+        if response.header.status != ptsl_pb2.TStatus_Completed:
+            return ""
+        path_data = json.loads(response.response_body_json)
+        return path_data.get("session_path", {}).get("path", "")
+
+    @timed("protools.session_sample_rate")
+    def get_session_sample_rate(self):
+        """
+        Get the sample rate of the open session (what timeline samples count).
+
+        Returns:
+            int: Sample rate in Hz
+
+        Raises:
+            Exception: If Pro Tools doesn't report it
+        """
+        import json
+
+        header = ptsl_pb2.RequestHeader(
+            command=ptsl_pb2.CId_GetSessionSampleRate, version=1, session_id=self.session_id
+        )
+        request = ptsl_pb2.Request(header=header)
+        response = self.stub.SendGrpcRequest(request)
+
+        if response.header.status != ptsl_pb2.TStatus_Completed:
+            raise Exception(f"Failed to get sample rate: {response.response_error_json}")
+        rate = json.loads(response.response_body_json or "{}").get("sample_rate", "")
+        # SampleRate enum, e.g. "SR_48000"
+        return int(rate.rpartition("_")[2])
+
+    @timed("protools.open_session")
+    def open_session(self, session_path):
+        """
+        Open a session file, closing the current one (used by batch mode).
+
+        Args:
+            session_path: Path to the .ptx file
+
+        Raises:
+            FileNotFoundError: If the session file doesn't exist
+            Exception: If Pro Tools can't open it
+        """
+        import json
+
+        if not os.path.isfile(session_path):
+            raise FileNotFoundError(f"Session not found: {session_path}")
+
+        header = ptsl_pb2.RequestHeader(
+            command=ptsl_pb2.CId_OpenSession, version=1, session_id=self.session_id
+        )
+        request = ptsl_pb2.Request(
+            header=header,
+            request_body_json=json.dumps({"session_path": os.path.abspath(session_path)}),
+        )
+        print(f"Opening session {session_path}...")
+        response = self.stub.SendGrpcRequest(request)
+
+        if response.header.status != ptsl_pb2.TStatus_Completed:
+            raise Exception(f"Failed to open session: {response.response_error_json}")
+
+    @timed("protools.close_session")
+    def close_session(self, save=False):
+        """
+        Close the current session.
+
+        Args:
+            save: Save changes before closing (default: discard)
+
+        Raises:
+            Exception: If Pro Tools can't close it
+        """
+        import json
+
+        header = ptsl_pb2.RequestHeader(
+            command=ptsl_pb2.CId_CloseSession, version=1, session_id=self.session_id
+        )
+        request = ptsl_pb2.Request(
+            header=header, request_body_json=json.dumps({"save_on_close": save})
+        )
+        response = self.stub.SendGrpcRequest(request)
+
+        if response.header.status != ptsl_pb2.TStatus_Completed:
+            raise Exception(f"Failed to close session: {response.response_error_json}")
+
     def bounce_to_disk(self, output_path, file_name=None, **options):
         """
         Bounce/export the current Pro Tools session to disk.
@@ -143,16 +249,60 @@ class ProToolsClient:
                 - sample_rate: Sample rate (default: 48000)
                 - audio_format: Audio format (default: 'Interleaved')
                 - offline_bounce: Use offline bounce (default: True)
+                - stems: List of mix sources to export in one run, each a bus
+                  name or a (source_type, name) tuple such as
+                  ('EMSType_Output', 'Out 1-2'). Pro Tools writes one file
+                  per source.
 
         Returns:
-            str: Path to the bounced file
+            str: Path to the bounced file, or list of paths in stems mode
         """
         # Set defaults
         file_type = options.get("file_type", "WAV")
         bit_depth = options.get("bit_depth", 24)
         sample_rate = options.get("sample_rate", 48000)
         offline_bounce = options.get("offline_bounce", True)
+        stems = options.get("stems")
+
+        file_name, session_path, bounce_path = self._bounce_target(file_name)
+        cache_settings = {
+            "file_name": file_name,
+            "file_type": file_type,
+            "bit_depth": bit_depth,
+            "sample_rate": sample_rate,
+            "offline_bounce": offline_bounce,
+            "stems": stems,
+        }
+        if self.bounce_cache and session_path:
+            with span("protools.bounce_cache"):
+                cached = self.bounce_cache.lookup(session_path, cache_settings)
+            if cached:
+                print(f"Session unchanged since last bounce - reusing {cached}")
+                return cached
+
+        print(f"Bouncing to {output_path}/{file_name}...")
+        bounce_started = time.time()
+        with span("protools.export_mix", stems=len(stems or [])):
+            self._export_mix(file_name, bit_depth, sample_rate, stems)
+
+        if stems:
+            result = self._collect_stem_paths(bounce_path, file_name, bounce_started)
+        else:
+            print(f"Bounce complete: {bounce_path}")
+            result = bounce_path
+
+        if self.bounce_cache and session_path:
+            self.bounce_cache.add(session_path, cache_settings, result)
+
+        return result
+
+    def _bounce_target(self, file_name=None):
+        """
+        Resolve the bounce file name and where Pro Tools will write it.
 
+        Returns:
+            tuple: (sanitized file name, session path or "", bounce path)
+        """
         # Get session name if file_name not provided
         if not file_name:
             session_info = self.get_session_info()
@@ -166,6 +316,25 @@ class ProToolsClient:
         )  # Replace special chars with underscore
         file_name = file_name.strip()  # Remove leading/trailing whitespace
 
+        # File is bounced to session folder / Bounced Files directory
+        session_path = self.get_session_path()
+        if session_path:
+            session_folder = os.path.dirname(session_path)
+            bounce_path = os.path.join(
+                session_folder, "Bounced Files", f"{file_name}.wav"
+            )
+        else:
+            # Fallback if path command fails
+            bounce_path = f"{file_name}.wav"
+        return file_name, session_path, bounce_path
+
+    def _export_mix(self, file_name, bit_depth, sample_rate, stems=None):
+        """
+        Run ExportMix into the session's Bounced Files folder.
+
+        Raises:
+            Exception: If the bounce fails
+        """
         # Build export mix request
         import json
 
@@ -183,8 +352,16 @@ class ProToolsClient:
                 "delivery_format": "EMDF_Interleaved",  # EM_DeliveryFormat enum
             },
             "offline_bounce": "TB_True",  # TripleBool enum
-            # Don't specify mix_source_list - let Pro Tools use the default/entire mix
         }
+        if stems:
+            # One file per source, all rendered in a single offline pass
+            request_body["mix_source_list"] = [
+                {"source_type": stem[0], "name": stem[1]}
+                if isinstance(stem, (tuple, list))
+                else {"source_type": "EMSType_Bus", "name": stem}
+                for stem in stems
+            ]
+        # Otherwise don't specify mix_source_list - let Pro Tools use the default/entire mix
 
         # Create request header with session_id
         header = ptsl_pb2.RequestHeader(
@@ -197,7 +374,6 @@ class ProToolsClient:
         )
 
         # Send request
-        print(f"Bouncing to {output_path}/{file_name}...")
         response = self.stub.SendGrpcRequest(request)
 
         if response.header.status != ptsl_pb2.TStatus_Completed:
@@ -208,35 +384,184 @@ class ProToolsClient:
             )
             raise Exception(f"Bounce failed: {error_msg}")
 
-        # File is bounced to session folder / Bounced Files directory
-        # Use GetSessionPath to get the actual session file path
+    @timed("protools.get_selection")
+    def get_timeline_selection(self):
+        """
+        Get the current timeline selection in samples.
+
+        Returns:
+            tuple: (in_time, out_time) as Pro Tools reports them
+        """
+        import json
+
         header = ptsl_pb2.RequestHeader(
-            command=ptsl_pb2.CId_GetSessionPath, version=1, session_id=self.session_id
+            command=ptsl_pb2.CId_GetTimelineSelection, version=1, session_id=self.session_id
+        )
+        request = ptsl_pb2.Request(
+            header=header, request_body_json=json.dumps({"time_scale": "TOOptions_Samples"})
         )
-        request = ptsl_pb2.Request(header=header)
         response = self.stub.SendGrpcRequest(request)
 
-        if response.header.status == ptsl_pb2.TStatus_Completed:
-            import json
+        if response.header.status != ptsl_pb2.TStatus_Completed:
+            raise Exception(f"Failed to get selection: {response.response_error_json}")
+        selection = json.loads(response.response_body_json or "{}")
+        return selection.get("in_time", "0"), selection.get("out_time", "0")
 
-            path_data = json.loads(response.response_body_json)
-            session_path = path_data.get("session_path", {}).get("path", "")
+    @timed("protools.set_selection")
+    def set_timeline_selection(self, in_time, out_time):
+        """
+        Select a timeline range (what an offline bounce renders).
 
-            if session_path:
-                session_folder = os.path.dirname(session_path)
-                bounce_path = os.path.join(
-                    session_folder, "Bounced Files", f"{file_name}.wav"
-                )
-            else:
-                # Fallback
-                bounce_path = f"{file_name}.wav"
-        else:
-            # Fallback if path command fails
-            bounce_path = f"{file_name}.wav"
+        Args:
+            in_time: Start, in samples
+            out_time: End, in samples
 
-        print(f"Bounce complete: {bounce_path}")
+        Raises:
+            Exception: If Pro Tools rejects the selection
+        """
+        import json
 
-        return bounce_path
+        header = ptsl_pb2.RequestHeader(
+            command=ptsl_pb2.CId_SetTimelineSelection, version=1, session_id=self.session_id
+        )
+        request = ptsl_pb2.Request(
+            header=header,
+            request_body_json=json.dumps({"in_time": str(in_time), "out_time": str(out_time)}),
+        )
+        response = self.stub.SendGrpcRequest(request)
+
+        if response.header.status != ptsl_pb2.TStatus_Completed:
+            raise Exception(f"Failed to set selection: {response.response_error_json}")
+
+    def bounce_range(self, output_path, start, end, file_name=None, timeline_start=0, **options):
+        """
+        Re-bounce only a changed part of the mix and splice it into the last bounce.
+
+        Needs a bounce cache holding an earlier bounce of this session
+        with the same settings. Only ``start``-``end`` plus a handle on
+        either side is bounced, after a pre-roll that lets effects settle
+        (by setting the timeline selection, which is restored afterwards);
+        the handles are checked against the earlier bounce and the new
+        audio is crossfaded in. Falls back to a full
+        bounce when there's no earlier bounce, in stems mode, or when the
+        handles don't match.
+
+        Args:
+            output_path: Directory path where the bounce will be saved
+            start: Start of the changed range, in seconds from the start of the mix
+            end: End of the changed range, in seconds
+            file_name: Name for the bounced file (optional, uses session name
+                if not provided)
+            timeline_start: Timeline position of the mix's first sample, in
+                session samples
+            **options: Bounce options, as for ``bounce_to_disk``
+
+        Returns:
+            str: Path to the updated bounce
+        """
+        from ..audio.splice import HANDLE_SECONDS, PREROLL_SECONDS, replace_range
+        from ..audio.wav import WavReader
+
+        if options.get("stems") or not self.bounce_cache:
+            print("Partial bounce needs BOUNCE_CACHE and a single mix - bouncing everything")
+            return self.bounce_to_disk(output_path, file_name, **options)
+
+        bit_depth = options.get("bit_depth", 24)
+        sample_rate = options.get("sample_rate", 48000)
+        file_name, session_path, bounce_path = self._bounce_target(file_name)
+        cache_settings = {
+            "file_name": file_name,
+            "file_type": options.get("file_type", "WAV"),
+            "bit_depth": bit_depth,
+            "sample_rate": sample_rate,
+            "offline_bounce": options.get("offline_bounce", True),
+            "stems": None,
+        }
+        previous = None
+        if session_path:
+            previous = self.bounce_cache.previous(session_path, cache_settings)
+        if not isinstance(previous, str):
+            print("No earlier bounce to update - bouncing everything")
+            return self.bounce_to_disk(output_path, file_name, **options)
+        if self.bounce_cache.lookup(session_path, cache_settings):
+            print(f"Session unchanged since last bounce - reusing {previous}")
+            return previous
+
+        # Frames of the bounce and timeline samples differ when the bounce
+        # is sample-rate converted; the selection is in session samples
+        with WavReader(previous) as reader:
+            rate, frames = reader.sample_rate, reader.frames
+        session_rate = self.get_session_sample_rate()
+        first = min(int(round(start * rate)), frames)
+        last = min(int(round(end * rate)), frames)
+        if first >= last:
+            raise ValueError(f"Range {start:g}-{end:g}s is outside the {frames / rate:.1f}s mix")
+        # Start the partial bounce (pre-roll included) on a frame that falls
+        # exactly on a timeline sample, so it lines up with the full one
+        # after conversion
+        step = rate // math.gcd(rate, session_rate)
+        handle = max(first - int(rate * HANDLE_SECONDS), 0)
+        lo = max(handle - int(rate * PREROLL_SECONDS), 0) // step * step
+        hi = min(last + int(rate * HANDLE_SECONDS), frames)
+
+        range_name = f"{file_name}_range"
+        range_path = os.path.join(os.path.dirname(bounce_path), f"{range_name}.wav")
+        print(f"Bouncing {start:g}-{end:g}s of {file_name} (of {frames / rate:.0f}s)...")
+        selection = self.get_timeline_selection()
+        self.set_timeline_selection(
+            timeline_start + lo * session_rate // rate,
+            timeline_start + math.ceil(hi * session_rate / rate),
+        )
+        try:
+            with span("protools.export_range", seconds=round((hi - lo) / rate, 3)):
+                self._export_mix(range_name, bit_depth, sample_rate)
+        finally:
+            self.set_timeline_selection(*selection)
+
+        try:
+            with span("audio.splice"):
+                diffs = replace_range(previous, range_path, lo, first, last, preroll=handle - lo)
+        except ValueError as e:
+            print(f"Can't splice the re-bounced range ({e}) - bouncing everything")
+            return self.bounce_to_disk(output_path, file_name, **options)
+        finally:
+            if os.path.exists(range_path):
+                os.remove(range_path)
+
+        worst = max((d for d in diffs.values() if d is not None), default=None)
+        match = "identical" if worst in (None, float("-inf")) else f"within {worst} dB"
+        print(f"Spliced {start:g}-{end:g}s into {previous} (handles {match})")
+        self.bounce_cache.add(session_path, cache_settings, previous)
+        return previous
+
+    def _collect_stem_paths(self, bounce_path, file_name, since):
+        """
+        Find the files written by a multi-source export.
+
+        Pro Tools names each file after the bounce and its source, so match
+        on the bounce name prefix and keep files written by this bounce.
+
+        Args:
+            bounce_path: Path the single-file bounce would have used
+            file_name: Bounce file name (without extension)
+            since: Time the export was started
+
+        Returns:
+            list: Paths of the bounced stem files
+        """
+        folder = os.path.dirname(bounce_path) or "."
+        paths = sorted(
+            os.path.join(folder, name)
+            for name in os.listdir(folder)
+            if name.startswith(file_name)
+            and name.lower().endswith(".wav")
+            and os.path.getmtime(os.path.join(folder, name)) >= since - 1
+        )
+        if not paths:
+            raise Exception(f"Bounce finished but no stem files found in {folder}")
+        for path in paths:
+            print(f"Bounce complete: {path}")
+        return paths
 
     def __enter__(self):
         """Context manager entry."""
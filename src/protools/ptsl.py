@@ -0,0 +1,89 @@
+"""Lazy loader for the generated PTSL protobuf/gRPC modules."""
+
+import importlib.util
+import os
+import sys
+import threading
+
+generated_path = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "../../generated")
+)
+
+# Module name the patched 0_pb2_grpc.py imports the descriptors under
+# (see README, "Setup Pro Tools SDK")
+PB2_MODULE_NAME = "PTSL_dot_2025_dot_06_dot_0__pb2"
+
+_modules = None
+_lock = threading.Lock()
+
+
+def _exec_file(name, path):
+    """
+    Execute a generated module from its file path and register it.
+
+    SourceFileLoader writes/reads __pycache__ bytecode for these files, so
+    after the first run only the descriptor registration itself is paid.
+    Registering in sys.modules before executing lets the patched
+    0_pb2_grpc.py reuse the already-built descriptors instead of building
+    them a second time.
+    """
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[name]
+        raise
+    return module
+
+
+def load():
+    """
+    Import the generated PTSL modules on first use.
+
+    Returns:
+        tuple: (ptsl_pb2, ptsl_pb2_grpc)
+    """
+    global _modules
+    with _lock:
+        if _modules is not None:
+            return _modules
+
+        # Note: The proto file generates modules at PTSL/2025/06/0_pb2.py
+        if generated_path not in sys.path:
+            sys.path.insert(0, generated_path)
+        try:
+            from PTSL._2025._06 import _0_pb2 as ptsl_pb2
+            from PTSL._2025._06 import _0_pb2_grpc as ptsl_pb2_grpc
+        except ImportError:
+            # Alternative import path
+            ptsl_pb2 = _exec_file(
+                PB2_MODULE_NAME, os.path.join(generated_path, "PTSL/2025/06/0_pb2.py")
+            )
+            ptsl_pb2_grpc = _exec_file(
+                "ptsl_pb2_grpc", os.path.join(generated_path, "PTSL/2025/06/0_pb2_grpc.py")
+            )
+
+        _modules = (ptsl_pb2, ptsl_pb2_grpc)
+        return _modules
+
+
+class LazyModule:
+    """Stand-in that loads the generated modules on first attribute access."""
+
+    def __init__(self, index):
+        """
+        Initialize the stand-in.
+
+        Args:
+            index: 0 for ptsl_pb2, 1 for ptsl_pb2_grpc
+        """
+        self._index = index
+
+    def __getattr__(self, name):
+        return getattr(load()[self._index], name)
+
+
+ptsl_pb2 = LazyModule(0)
+ptsl_pb2_grpc = LazyModule(1)
@@ -0,0 +1,157 @@
+"""Several Pro Tools machines driven from one controller."""
+
+import threading
+import time
+from typing import List, Optional
+
+from .client import ProToolsClient
+
+# Seconds to wait for a rig's PTSL endpoint to accept a connection
+HEALTH_TIMEOUT = 2.0
+
+
+class Rig:
+    """
+    One Pro Tools machine: its PTSL connection and last known health.
+
+    The connection (and its registration) is made on first use and kept
+    between jobs; only the rig's own bounce worker uses it. Health checks
+    only probe the gRPC channel, so they can run while a bounce is in
+    progress.
+    """
+
+    def __init__(self, name: str, host: str, port: int, bounce_cache=None):
+        """
+        Initialize a rig.
+
+        Args:
+            name: Short name used in job status and --rig, e.g. 'studio-a'
+            host: PTSL host
+            port: PTSL port
+            bounce_cache: Optional BounceCache shared by all rigs
+        """
+        self.name = name
+        self.host = host
+        self.port = port
+        self.bounce_cache = bounce_cache
+        self.healthy = True
+        self.last_error: Optional[str] = None
+        self.checked_at: Optional[float] = None
+        self._client: Optional[ProToolsClient] = None
+        self._probe = None
+        self._lock = threading.Lock()
+        self._probe_lock = threading.Lock()
+
+    @property
+    def address(self) -> str:
+        """host:port of the PTSL endpoint."""
+        return f"{self.host}:{self.port}"
+
+    def client(self) -> ProToolsClient:
+        """Return the connected Pro Tools client, connecting on first use."""
+        with self._lock:
+            if self._client is None:
+                pt = ProToolsClient(self.host, self.port, bounce_cache=self.bounce_cache)
+                pt.connect()
+                self._client = pt
+            return self._client
+
+    def drop(self) -> None:
+        """Close the connection so the next job reconnects."""
+        with self._lock:
+            if self._client is not None:
+                try:
+                    self._client.disconnect()
+                finally:
+                    self._client = None
+
+    def check(self, timeout: float = HEALTH_TIMEOUT) -> bool:
+        """
+        Probe the PTSL endpoint and record the result.
+
+        Args:
+            timeout: Seconds to wait for the channel to become ready
+
+        Returns:
+            bool: True if the endpoint accepted a connection
+        """
+        import grpc
+
+        with self._probe_lock:
+            if self._probe is None:
+                self._probe = grpc.insecure_channel(self.address)
+            probe = self._probe
+        try:
+            grpc.channel_ready_future(probe).result(timeout=timeout)
+        except grpc.FutureTimeoutError:
+            self.healthy = False
+            self.last_error = f"no answer from {self.address} within {timeout:g}s"
+            # A fresh channel next time, rather than one in reconnect backoff
+            with self._probe_lock:
+                if self._probe is probe:
+                    probe.close()
+                    self._probe = None
+        else:
+            self.healthy = True
+            self.last_error = None
+        self.checked_at = time.time()
+        return self.healthy
+
+    def close(self) -> None:
+        """Close the connection and the health probe."""
+        self.drop()
+        with self._probe_lock:
+            if self._probe is not None:
+                self._probe.close()
+                self._probe = None
+
+    def status(self) -> dict:
+        """JSON-serializable health summary."""
+        return {
+            "rig": self.name,
+            "address": self.address,
+            "healthy": self.healthy,
+            "last_error": self.last_error,
+            "checked_at": self.checked_at,
+        }
+
+    def __repr__(self) -> str:
+        return f"Rig({self.name!r}, {self.address!r})"
+
+
+def parse_rigs(spec: str, default_port: int = 31416, bounce_cache=None) -> List[Rig]:
+    """
+    Parse a rig list like 'studio-a=10.0.0.11:31416, studio-b=10.0.0.12'.
+
+    Names are optional (the host is used instead) and so are ports.
+
+    Args:
+        spec: Comma-separated [name=]host[:port] entries
+        default_port: Port for entries without one
+        bounce_cache: Optional BounceCache shared by all rigs
+
+    Returns:
+        list: Rig objects, in the order given
+
+    Raises:
+        ValueError: If an entry is malformed or a name is repeated
+    """
+    rigs = []
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        name, _, address = item.rpartition("=")
+        host, _, port = address.strip().partition(":")
+        if not host or (port and not port.isdigit()):
+            raise ValueError(f"Invalid Pro Tools rig {item!r} (expected [name=]host[:port])")
+        rig = Rig(
+            name.strip() or host,
+            host,
+            int(port) if port else default_port,
+            bounce_cache=bounce_cache,
+        )
+        if any(r.name == rig.name for r in rigs):
+            raise ValueError(f"Duplicate Pro Tools rig name: {rig.name}")
+        rigs.append(rig)
+    return rigs
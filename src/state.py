@@ -0,0 +1,94 @@
+"""Local state shared between runs (caches, indexes, stamps)."""
+
+import fcntl
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable
+
+
+def state_dir() -> Path:
+    """
+    Return the directory holding local state, creating it if needed.
+
+    Defaults to ~/.masv_protools; override with MASV_PROTOOLS_STATE_DIR.
+    """
+    path = Path(
+        os.path.expanduser(os.getenv("MASV_PROTOOLS_STATE_DIR", "~/.masv_protools"))
+    )
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+class JsonStore:
+    """
+    A small JSON document persisted atomically in the state directory.
+
+    Updates hold a thread lock and an flock on a sibling lock file, so the
+    daemon, hotkey runs and other processes can share the same store. The
+    state directory is resolved on first use, so module-level stores honour
+    a MASV_PROTOOLS_STATE_DIR loaded from .env after import.
+    """
+
+    def __init__(self, name: str):
+        """
+        Initialize the store.
+
+        Args:
+            name: File name inside the state directory
+        """
+        self.name = name
+        self._path = None
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> Path:
+        """Location of the document in the state directory."""
+        if self._path is None:
+            self._path = state_dir() / self.name
+        return self._path
+
+    @contextmanager
+    def _locked(self):
+        """Hold both the in-process and the cross-process lock."""
+        with self._lock:
+            with open(f"{self.path}.lock", "w") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def load(self) -> dict:
+        """Return the stored document, or an empty dict if missing or corrupt."""
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def save(self, data: dict) -> None:
+        """Write the document atomically (write to temp file, then rename)."""
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+
+    def update(self, fn: Callable[[dict], Any]) -> Any:
+        """
+        Read-modify-write the document under lock.
+
+        Args:
+            fn: Called with the loaded document; may mutate it in place
+
+        Returns:
+            Whatever ``fn`` returns
+        """
+        with self._locked():
+            data = self.load()
+            result = fn(data)
+            self.save(data)
+            return result
@@ -0,0 +1,191 @@
+"""Per-phase timing spans, metrics and optional profiling."""
+
+import contextvars
+import cProfile
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Fields (e.g. job ID) attached to every span opened in the current context
+_fields = contextvars.ContextVar("timing_fields", default={})
+
+_lock = threading.Lock()
+_totals = {}
+
+# Held while a profile is captured; Python allows only one profiler at a time
+_profiling = threading.Lock()
+
+
+@contextmanager
+def context(**fields):
+    """
+    Attach fields to all spans opened inside this block (on this thread).
+
+    Args:
+        **fields: Values to include in each span record, e.g. job="ab12"
+    """
+    token = _fields.set({**_fields.get(), **fields})
+    try:
+        yield
+    finally:
+        _fields.reset(token)
+
+
+@contextmanager
+def span(name, **fields):
+    """
+    Time a block and emit it as one JSON line.
+
+    Records go to the file named by PIPELINE_TIMING_LOG (nothing is written
+    when it's unset); totals per span name also go to the Prometheus
+    textfile named by PIPELINE_METRICS_FILE, if set.
+
+    Args:
+        name: Span name, e.g. "protools.export_mix"
+        **fields: Extra values for this record
+    """
+    started = time.time()
+    clock = time.perf_counter()
+    error = None
+    try:
+        yield
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        seconds = time.perf_counter() - clock
+        record = {
+            "ts": round(started, 3),
+            "span": name,
+            "seconds": round(seconds, 6),
+            "ok": error is None,
+            **_fields.get(),
+            **fields,
+        }
+        if error is not None:
+            record["error"] = f"{type(error).__name__}: {error}"
+        _emit(record)
+
+
+def timed(name):
+    """
+    Decorator form of ``span`` for timing a whole function.
+
+    Args:
+        name: Span name
+    """
+
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def _emit(record):
+    """Write a span record to the JSON-lines log and the metrics file."""
+    log_path = os.getenv("PIPELINE_TIMING_LOG")
+    metrics_path = os.getenv("PIPELINE_METRICS_FILE")
+    if not log_path and not metrics_path:
+        return
+    try:
+        if log_path:
+            line = json.dumps(record, default=str) + "\n"
+            # O_APPEND keeps concurrent writers' lines intact
+            fd = os.open(
+                os.path.expanduser(log_path), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644
+            )
+            try:
+                os.write(fd, line.encode())
+            finally:
+                os.close(fd)
+        if metrics_path:
+            with _lock:
+                total = _totals.setdefault(record["span"], [0, 0.0, 0, 0.0])
+                total[0] += 1
+                total[1] += record["seconds"]
+                total[2] += 0 if record["ok"] else 1
+                total[3] = record["seconds"]
+                _write_metrics(os.path.expanduser(metrics_path))
+    except OSError as e:
+        print(f"Note: could not write timing data: {e}")
+
+
+def _write_metrics(path):
+    """Rewrite the Prometheus textfile from this process's totals."""
+    lines = [
+        "# HELP masv_protools_phase_seconds Time spent per pipeline phase.",
+        "# TYPE masv_protools_phase_seconds summary",
+    ]
+    for name, (count, seconds, _, _) in sorted(_totals.items()):
+        lines.append(f'masv_protools_phase_seconds_sum{{phase="{name}"}} {seconds:.6f}')
+        lines.append(f'masv_protools_phase_seconds_count{{phase="{name}"}} {count}')
+    lines += [
+        "# HELP masv_protools_phase_errors_total Failed runs per pipeline phase.",
+        "# TYPE masv_protools_phase_errors_total counter",
+    ]
+    for name, (_, _, errors, _) in sorted(_totals.items()):
+        lines.append(f'masv_protools_phase_errors_total{{phase="{name}"}} {errors}')
+    lines += [
+        "# HELP masv_protools_phase_last_seconds Duration of the latest run of each phase.",
+        "# TYPE masv_protools_phase_last_seconds gauge",
+    ]
+    for name, (_, _, _, last) in sorted(_totals.items()):
+        lines.append(f'masv_protools_phase_last_seconds{{phase="{name}"}} {last:.6f}')
+
+    # Write then rename so the collector never reads a partial file
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        f.write("\n".join(lines) + "\n")
+    os.replace(tmp, path)
+
+
+@contextmanager
+def profile(name):
+    """
+    Capture a cProfile of this block when PIPELINE_PROFILE_DIR is set.
+
+    One profile runs at a time: from Python 3.12 cProfile hooks into
+    sys.monitoring, which is process-wide and takes a single profiler
+    (before 3.12 it only sees the calling thread). A phase that starts
+    while another is being profiled, e.g. on another rig or upload worker,
+    runs unprofiled. Output is ``<dir>/<name>-<timestamp>.prof``, readable
+    with ``python -m pstats`` or snakeviz.
+
+    Args:
+        name: File name prefix, e.g. "ab12-bounce"
+    """
+    directory = os.getenv("PIPELINE_PROFILE_DIR")
+    if not directory:
+        yield
+        return
+    if not _profiling.acquire(blocking=False):
+        print(f"Note: {name} not profiled - another phase is being profiled")
+        yield
+        return
+    try:
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Some other profiling tool is active
+            yield
+            return
+        try:
+            yield
+        finally:
+            profiler.disable()
+            directory = os.path.expanduser(directory)
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}.prof")
+            profiler.dump_stats(path)
+            print(f"Profile written to {path}")
+    finally:
+        _profiling.release()
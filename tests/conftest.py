@@ -0,0 +1,15 @@
+import os
+import sys
+
+import pytest
+
+# Tests import the app as the `src` package, like the scripts do
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(autouse=True)
+def state_dir(tmp_path, monkeypatch):
+    """Keep each test's local state out of ~/.masv_protools."""
+    path = tmp_path / "state"
+    monkeypatch.setenv("MASV_PROTOOLS_STATE_DIR", str(path))
+    return path
@@ -0,0 +1,55 @@
+import os
+import struct
+
+import pytest
+
+from src.pipeline import compress
+
+
+def _wav(path, format_tag, bits, frames=100):
+    """Minimal mono WAV with silent samples."""
+    block = bits // 8
+    data = bytes(frames * block)
+    fmt = struct.pack("<HHIIHH", format_tag, 1, 48000, 48000 * block, block, bits)
+    path.write_bytes(
+        b"RIFF" + struct.pack("<I", 4 + 24 + 8 + len(data)) + b"WAVE"
+        + b"fmt " + struct.pack("<I", 16) + fmt
+        + b"data" + struct.pack("<I", len(data)) + data
+    )
+    return str(path)
+
+
+@pytest.fixture
+def flac(tmp_path, monkeypatch):
+    """Stand-in flac binary that copies its input to the -o path."""
+    script = tmp_path / "flac"
+    script.write_text('#!/bin/sh\nwhile [ "$1" != "-o" ]; do shift; done\ncp "$3" "$2"\n')
+    script.chmod(0o755)
+    monkeypatch.setattr(compress, "find_flac", lambda: str(script))
+    return script
+
+
+def test_flac_encodable(tmp_path):
+    assert compress.flac_encodable(_wav(tmp_path / "int.wav", 1, 24))
+    assert not compress.flac_encodable(_wav(tmp_path / "float.wav", 3, 32))
+    (tmp_path / "junk.wav").write_bytes(b"not a wav file" * 4)
+    assert not compress.flac_encodable(str(tmp_path / "junk.wav"))
+
+
+def test_float_wav_sent_uncompressed_even_when_forced(tmp_path, flac, capsys):
+    files = [_wav(tmp_path / "mix.wav", 3, 32)]
+    assert compress.compress_for_upload(files, mode="always") == files
+    assert "FLAC skipped for mix.wav" in capsys.readouterr().out
+
+
+def test_integer_wav_encoded_when_forced(tmp_path, flac):
+    pcm = _wav(tmp_path / "mix.wav", 1, 24)
+    float_stem = _wav(tmp_path / "stem.wav", 3, 32)
+    result = compress.compress_for_upload([pcm, float_stem], mode="always")
+    assert result == [str(tmp_path / "mix.flac"), float_stem]
+    assert os.path.exists(result[0])
+
+
+def test_off(tmp_path, flac):
+    files = [_wav(tmp_path / "mix.wav", 1, 16)]
+    assert compress.compress_for_upload(files, mode="off") == files
@@ -0,0 +1,98 @@
+from src.pipeline.folder_watch import FolderWatcher
+
+
+def _watcher(tmp_path, batches, **kwargs):
+    return FolderWatcher([str(tmp_path)], batches.append, settle=3.0, coalesce=5.0, **kwargs)
+
+
+def _write(tmp_path, name, data=b"audio"):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_file_delivered_once_settled_and_quiet(tmp_path):
+    batches = []
+    watcher = _watcher(tmp_path, batches)
+    path = _write(tmp_path, "mix.wav")
+    watcher._note_change(path, False, 0.0)
+
+    watcher._check_settled(2.0)
+    watcher._flush(2.0)
+    assert watcher._pending and batches == []
+
+    watcher._check_settled(3.0)
+    watcher._flush(4.0)
+    assert batches == []
+    watcher._flush(8.0)
+    assert batches == [[path]]
+
+
+def test_growing_file_restarts_settle_clock(tmp_path):
+    batches = []
+    watcher = _watcher(tmp_path, batches)
+    path = _write(tmp_path, "mix.wav")
+    watcher._note_change(path, False, 0.0)
+    _write(tmp_path, "mix.wav", b"audio, longer now")
+    watcher._check_settled(3.0)
+    assert path in watcher._pending
+    watcher._check_settled(6.0)
+    watcher._flush(11.0)
+    assert batches == [[path]]
+
+
+def test_closed_file_settles_sooner(tmp_path):
+    batches = []
+    watcher = _watcher(tmp_path, batches)
+    path = _write(tmp_path, "mix.wav")
+    watcher._note_change(path, True, 0.0)
+    watcher._check_settled(0.5)
+    assert watcher._ready == [path]
+
+
+def test_burst_coalesced_into_one_batch(tmp_path):
+    batches = []
+    watcher = _watcher(tmp_path, batches)
+    first = _write(tmp_path, "dialog.wav")
+    watcher._note_change(first, False, 0.0)
+    watcher._check_settled(3.0)
+    second = _write(tmp_path, "music.wav")
+    watcher._note_change(second, False, 4.0)
+    # First is ready, but the second is still settling
+    watcher._flush(9.0)
+    assert batches == []
+    watcher._check_settled(7.0)
+    watcher._flush(12.0)
+    assert batches == [[first, second]]
+
+
+def test_empty_and_deleted_files_dropped(tmp_path):
+    batches = []
+    watcher = _watcher(tmp_path, batches)
+    empty = _write(tmp_path, "empty.wav", b"")
+    gone = _write(tmp_path, "gone.wav")
+    watcher._note_change(empty, False, 0.0)
+    watcher._note_change(gone, False, 0.0)
+    (tmp_path / "gone.wav").unlink()
+    watcher._check_settled(3.0)
+    watcher._flush(10.0)
+    assert watcher._pending == {} and batches == []
+
+
+def test_wanted(tmp_path):
+    watcher = _watcher(tmp_path, [])
+    assert watcher._wanted(str(tmp_path / "Mix.WAV"))
+    assert not watcher._wanted(str(tmp_path / ".mix.wav"))
+    assert not watcher._wanted(str(tmp_path / "notes.txt"))
+
+
+def test_callback_error_does_not_stop_watching(tmp_path, capsys):
+    def fail(files):
+        raise RuntimeError("upload failed")
+
+    watcher = FolderWatcher([str(tmp_path)], fail, settle=3.0, coalesce=5.0)
+    watcher._note_change(_write(tmp_path, "mix.wav"), False, 0.0)
+    watcher._check_settled(3.0)
+    watcher._flush(8.0)
+    assert watcher._ready == []
+    assert "upload failed" in capsys.readouterr().out
@@ -0,0 +1,62 @@
+import json
+import socket
+import threading
+
+import pytest
+
+from src import hotkey
+
+
+@pytest.fixture
+def daemon(tmp_path, monkeypatch):
+    """Unix socket server answering each request with ``reply(request)``."""
+    path = str(tmp_path / "daemon.sock")
+    monkeypatch.setenv("BOUNCE_DAEMON_SOCKET", path)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    server.listen()
+    requests = []
+
+    def serve(reply):
+        def run():
+            while True:
+                try:
+                    conn, _ = server.accept()
+                except OSError:
+                    return
+                with conn, conn.makefile("rb") as f:
+                    request = json.loads(f.readline())
+                    requests.append(request)
+                    response = reply(request)
+                    if response is not None:
+                        conn.sendall(json.dumps(response).encode() + b"\n")
+
+        threading.Thread(target=run, daemon=True).start()
+        return requests
+
+    yield serve
+    server.close()
+
+
+def test_no_daemon(tmp_path, monkeypatch):
+    monkeypatch.setenv("BOUNCE_DAEMON_SOCKET", str(tmp_path / "missing.sock"))
+    assert hotkey.main(["submit"]) == hotkey.NO_DAEMON
+
+
+def test_submit_queued(daemon, capsys):
+    requests = daemon(lambda request: {"ok": True, "job_id": "abc"})
+    assert hotkey.main(["submit", "--rig", "studio-a", "--range", "1:00-1:30"]) == 0
+    assert requests == [{"action": "submit", "rig": "studio-a", "range": "1:00-1:30"}]
+    assert "Queued job abc" in capsys.readouterr().out
+
+
+def test_refused(daemon):
+    daemon(lambda request: {"ok": False, "error": "Unknown rig"})
+    assert hotkey.main(["submit", "--rig", "nope"]) == hotkey.REFUSED
+
+
+def test_sent_without_reply(daemon):
+    # The job may have been queued: not reported as "no daemon"
+    requests = daemon(lambda request: None)
+    assert hotkey.main(["submit"]) == hotkey.NO_REPLY
+    assert len(requests) == 1
@@ -0,0 +1,65 @@
+import threading
+import time
+
+import pytest
+
+from src.pipeline.jobs import BouncePipeline, Job
+
+
+def _pipeline(bounce_seconds=0.0, **kwargs):
+    def bounce(job):
+        time.sleep(bounce_seconds)
+        job.bounce_path = f"/bounces/{job.id}.wav"
+
+    def upload(job):
+        job.package_id = f"pkg-{job.id}"
+
+    return BouncePipeline(bounce, upload, **kwargs)
+
+
+def test_jobs_bounce_then_upload():
+    pipeline = _pipeline()
+    jobs = [pipeline.submit(Job()) for _ in range(3)]
+    for job in jobs:
+        assert job.result(timeout=5) == (f"/bounces/{job.id}.wav", f"pkg-{job.id}")
+        assert job.phase == "done"
+    pipeline.shutdown()
+
+
+def test_failed_bounce_reported():
+    errors = []
+
+    def bounce(job):
+        raise RuntimeError("Pro Tools went away")
+
+    pipeline = BouncePipeline(bounce, lambda job: None, on_error=lambda j, e: errors.append(e))
+    job = pipeline.submit(Job())
+    with pytest.raises(RuntimeError, match="went away"):
+        job.result(timeout=5)
+    assert job.phase == "failed" and errors == [job.error]
+    pipeline.shutdown()
+
+
+def test_submit_after_shutdown_refused():
+    pipeline = _pipeline()
+    pipeline.shutdown()
+    with pytest.raises(RuntimeError):
+        pipeline.submit(Job())
+    with pytest.raises(RuntimeError):
+        pipeline.resume(Job())
+
+
+def test_shutdown_without_wait_finishes_queued_jobs():
+    pipeline = _pipeline(bounce_seconds=0.05)
+    jobs = [pipeline.submit(Job()) for _ in range(3)]
+    pipeline.shutdown(wait=False)
+    for job in jobs:
+        assert job.wait(5)
+        assert job.error is None and job.package_id
+
+
+def test_finish_wakes_waiters():
+    job = Job()
+    threading.Timer(0.05, job.finish, args=(ValueError("gone"),)).start()
+    assert job.wait(5)
+    assert job.phase == "failed" and isinstance(job.error, ValueError)
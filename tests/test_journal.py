@@ -0,0 +1,59 @@
+import os
+
+from src.pipeline.jobs import Job
+from src.pipeline.journal import JobJournal
+
+
+def _job():
+    job = Job(recipients=["a@example.com"])
+    job.session_name = "Song"
+    job.files = ["a.wav"]
+    job.bounce_path = job.files[0]
+    return job
+
+
+def test_interrupted_resumes_jobs_of_a_finished_process(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    crashed = JobJournal(path)
+    job = _job()
+    crashed.record(job, "bounced")
+    done = _job()
+    crashed.record(done, "done")
+    crashed.close()
+
+    journal = JobJournal(path)
+    jobs = journal.interrupted()
+    assert [j.id for j in jobs] == [job.id]
+    resumed = jobs[0]
+    assert resumed.phase == "bounced"
+    assert resumed.recipients == ["a@example.com"]
+    assert resumed.files == ["a.wav"] and resumed.session_name == "Song"
+    # Claimed: nobody else gets it
+    assert JobJournal(path).interrupted() == []
+
+
+def test_live_owner_keeps_its_jobs(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    live = JobJournal(path)
+    live.record(_job(), "uploading")
+    other = JobJournal(path)
+    assert other.interrupted() == []
+    assert live.interrupted() == []
+    live.close()
+    assert len(other.interrupted()) == 1
+
+
+def test_leases_removed(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    leases = tmp_path / "leases"
+    first = JobJournal(path)
+    # Left behind by a process that died without closing
+    (leases / "1-deadbeef.lock").write_text("")
+    second = JobJournal(path)
+    assert sorted(os.listdir(leases)) == sorted(
+        [f"{first.owner}.lock", f"{second.owner}.lock"]
+    )
+    first.close()
+    second.close()
+    second.close()
+    assert os.listdir(leases) == []
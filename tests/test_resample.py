@@ -0,0 +1,7 @@
+from src.audio.resample import parse_formats
+
+
+def test_parse_formats():
+    assert parse_formats("48000/24, 44100/16,") == [(48000, 24), (44100, 16)]
+    assert parse_formats("96000") == [(96000, 24)]
+    assert parse_formats("") == []
@@ -0,0 +1,142 @@
+import struct
+import threading
+
+import pytest
+
+from src.pipeline.jobs import Job
+from src.pipeline.journal import JobJournal
+
+
+class FakeMASV:
+    """Records the uploads a resumed job starts and completes."""
+
+    def __init__(self):
+        self.started = []
+        self.completed = []
+        self._lock = threading.Lock()
+
+    def has_upload(self, upload_id):
+        return True
+
+    def start_upload(self, files, **options):
+        with self._lock:
+            self.started.append((list(files), options))
+            return f"new-{len(self.started)}"
+
+    def complete_upload(self, upload_id, size, progress=None, priority=None):
+        with self._lock:
+            self.completed.append(upload_id)
+
+
+def _wav(path, frames=4800):
+    data = bytes(frames * 2)
+    path.write_bytes(
+        b"RIFF" + struct.pack("<I", 36 + len(data)) + b"WAVE"
+        + b"fmt " + struct.pack("<IHHIIHH", 16, 1, 1, 48000, 96000, 2, 16)
+        + b"data" + struct.pack("<I", len(data)) + data
+    )
+    return str(path)
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    import src.audio.preview
+    import src.bounce_and_send as bs
+
+    for name, value in {
+        "MASV_API_KEY": "key",
+        "MASV_TEAM_ID": "team",
+        "MASV_DELIVERY_MODE": "portal",
+        "MASV_PORTAL_URL": "default",
+        "MASV_DESTINATIONS": "",
+        "MASV_PREVIEW": "on",
+        "QC_POLICY": "warn",
+        "DELIVERABLES": "",
+        "BOUNCE_DIR": str(tmp_path / "bounces"),
+    }.items():
+        monkeypatch.setenv(name, value)
+
+    def encode_preview(path, bitrate="128k"):
+        out = path[:-4] + "_preview.m4a"
+        with open(out, "wb") as f:
+            f.write(b"preview")
+        return out
+
+    monkeypatch.setattr(src.audio.preview, "encode_preview", encode_preview)
+    masv = FakeMASV()
+    app = bs.BounceAndSendApp()
+    app._await_preflight = lambda job: masv
+    app.masv_fake = masv
+    yield app
+    app.shutdown()
+
+
+def _crashed_job(tmp_path, deliveries):
+    """Journal a job as a process that died mid-upload would have left it."""
+    journal = JobJournal()
+    job = Job()
+    job.session_name = "Song"
+    job.files = [_wav(tmp_path / "Song.wav")]
+    job.bounce_path = job.files[0]
+    job.deliveries = deliveries
+    journal.record(job, "uploading")
+    journal.close()
+    return job
+
+
+def _delivery(**fields):
+    return dict(
+        {
+            "label": "Portal: client",
+            "priority": "normal",
+            "status": "pending",
+            "upload_id": None,
+            "package_id": None,
+            "error": None,
+            "progress": None,
+        },
+        **fields,
+    )
+
+
+def test_resume_with_preview_in_flight(tmp_path, app):
+    # As journaled before deliveries named their destination
+    preview_file = tmp_path / "Song_preview.m4a"
+    preview_file.write_bytes(b"preview")
+    crashed = _crashed_job(
+        tmp_path,
+        {
+            "portal:client": _delivery(status="uploading", upload_id="full-1"),
+            "portal:client#preview": _delivery(
+                label="Portal: client (preview)",
+                priority="high",
+                status="uploading",
+                upload_id="preview-1",
+                files=[str(preview_file)],
+                preview=True,
+            ),
+        },
+    )
+    (job,) = app.resume_interrupted()
+    assert job.id == crashed.id
+    assert job.wait(10)
+    assert job.error is None
+    assert [d.key for d in app._destinations(job)] == ["portal:client"]
+    assert app.masv_fake.started == []
+    assert sorted(app.masv_fake.completed) == ["full-1", "preview-1"]
+    assert job.package_id == "full-1"
+
+
+def test_resume_before_upload_adds_preview(tmp_path, app):
+    _crashed_job(
+        tmp_path,
+        {"portal:client": _delivery(destination="portal:client", preview=False)},
+    )
+    (job,) = app.resume_interrupted()
+    assert job.wait(10)
+    assert job.error is None
+    sent = {options["name"]: options["portal_subdomain"] for _, options in app.masv_fake.started}
+    # Full-resolution files and a re-added preview, both to the real portal
+    assert sent == {None: "client", "Song (preview)": "client"}
+    preview = job.deliveries["portal:client#preview"]
+    assert preview["preview"] and preview["destination"] == "portal:client"
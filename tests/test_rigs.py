@@ -0,0 +1,66 @@
+import pytest
+
+from src.protools import parse_rigs
+
+
+def test_parse_rigs():
+    rigs = parse_rigs("studio-a=10.0.0.11:31417, 10.0.0.12", default_port=31416)
+    assert [(r.name, r.host, r.port) for r in rigs] == [
+        ("studio-a", "10.0.0.11", 31417),
+        ("10.0.0.12", "10.0.0.12", 31416),
+    ]
+    assert parse_rigs(" , ") == []
+
+
+@pytest.mark.parametrize("spec", ["a=host:port", "a=", "a=h1, a=h2"])
+def test_parse_rigs_rejects(spec):
+    with pytest.raises(ValueError):
+        parse_rigs(spec)
+
+
+class RemoteRig:
+    """Pro Tools client on another machine: reports paths as that machine sees them."""
+
+    def __init__(self, bounced):
+        self.bounced = bounced
+
+    def get_session_info(self):
+        return {"session_name": "Song"}
+
+    def bounce_to_disk(self, output_path, **options):
+        return self.bounced
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    import src.bounce_and_send as bs
+
+    monkeypatch.setenv("PROTOOLS_RIGS", "studio-a=10.0.0.11, studio-b=10.0.0.12")
+    monkeypatch.setenv("BOUNCE_DIR", str(tmp_path / "out"))
+    app = bs.BounceAndSendApp()
+    yield app
+    app.shutdown()
+
+
+def _bounce(app, monkeypatch, bounced):
+    from src.pipeline.jobs import Job
+    from src.protools.rigs import Rig
+
+    monkeypatch.setattr(Rig, "client", lambda rig: RemoteRig(bounced))
+    job = Job(rig="studio-b")
+    app._bounce(job)
+    return job
+
+
+def test_bounce_on_shared_storage(tmp_path, app, monkeypatch):
+    bounced = tmp_path / "Song" / "Bounced Files" / "Song.wav"
+    bounced.parent.mkdir(parents=True)
+    bounced.write_bytes(b"RIFF")
+    job = _bounce(app, monkeypatch, str(bounced))
+    assert job.files == [str(bounced)]
+
+
+def test_bounce_not_reachable_from_controller(app, monkeypatch):
+    remote = "/Users/studio-b/Sessions/Song/Bounced Files/Song.wav"
+    with pytest.raises(RuntimeError, match="studio-b not found on this machine"):
+        _bounce(app, monkeypatch, remote)
@@ -0,0 +1,120 @@
+import time
+
+import pytest
+
+from src.masv.scheduler import BandwidthScheduler, limit_at, parse_schedule
+
+# 0.008 Mbit/s = 1000 bytes per second
+SLOW = "0.008"
+
+
+def test_parse_schedule():
+    assert parse_schedule("8") == [(0, 1440, 1_000_000)]
+    assert parse_schedule("09:00-19:00=40, 19:00-09:00=400") == [
+        (540, 1140, 5_000_000),
+        (1140, 540, 50_000_000),
+    ]
+    assert parse_schedule("") == []
+
+
+@pytest.mark.parametrize("spec", ["fast", "0", "25:00-26:00=4", "09:00-19:00=x"])
+def test_parse_schedule_rejects(spec):
+    with pytest.raises(ValueError):
+        parse_schedule(spec)
+
+
+def _at(hour, minute=0):
+    return time.mktime((2026, 1, 15, hour, minute, 0, 0, 0, -1))
+
+
+def test_limit_at_wraps_past_midnight():
+    schedule = parse_schedule("09:00-19:00=40, 22:00-06:00=400")
+    assert limit_at(schedule, _at(12)) == 5_000_000
+    assert limit_at(schedule, _at(23)) == 50_000_000
+    assert limit_at(schedule, _at(3)) == 50_000_000
+    assert limit_at(schedule, _at(20)) is None
+
+
+class Agent:
+    def __init__(self, fail_pause=False):
+        self.calls = []
+        self.fail_pause = fail_pause
+
+    def pause(self, upload_id):
+        if self.fail_pause:
+            raise RuntimeError("not supported")
+        self.calls.append(("pause", upload_id))
+
+    def resume(self, upload_id):
+        self.calls.append(("resume", upload_id))
+
+
+def _scheduler(agent, spec=SLOW):
+    return BandwidthScheduler(
+        parse_schedule(spec), pause=agent.pause, resume=agent.resume, burst_seconds=1
+    )
+
+
+def test_over_budget_pauses_lowest_priority():
+    agent = Agent()
+    scheduler = _scheduler(agent)
+    scheduler.track("high", "high")
+    scheduler.track("backup", "backup")
+    scheduler.track("normal", "normal")
+    for upload_id in ("high", "backup", "normal"):
+        scheduler.report(upload_id, 0)
+    scheduler.report("high", 5000)
+    assert agent.calls == [("pause", "backup")]
+    assert scheduler.paused("backup") and not scheduler.paused("high")
+
+
+def test_release_resumes_paused_upload():
+    agent = Agent()
+    scheduler = _scheduler(agent)
+    with scheduler.tracking("a"):
+        scheduler.report("a", 0)
+        scheduler.report("a", 5000)
+        assert scheduler.paused("a")
+    assert agent.calls == [("pause", "a"), ("resume", "a")]
+    assert not scheduler.paused("a")
+
+
+def test_unlimited_window_resumes_everything():
+    agent = Agent()
+    scheduler = _scheduler(agent)
+    scheduler.track("a")
+    scheduler.report("a", 0)
+    scheduler.report("a", 5000)
+    scheduler.schedule = []
+    scheduler.report("a", 5000)
+    assert agent.calls == [("pause", "a"), ("resume", "a")]
+    assert scheduler.paused_seconds("a") > 0
+
+
+def test_failed_pause_stops_pausing(capsys):
+    scheduler = _scheduler(Agent(fail_pause=True))
+    scheduler.track("a")
+    scheduler.report("a", 0)
+    scheduler.report("a", 5000)
+    assert not scheduler.can_pause
+    assert not scheduler.paused("a")
+    assert "can't pause" in capsys.readouterr().out
+
+
+def test_admit_waits_for_budget():
+    scheduler = _scheduler(Agent())
+    scheduler.can_pause = False
+    scheduler.admit()
+    scheduler.track("a", "normal")
+    scheduler.report("a", 0)
+    scheduler.report("a", 1500)
+    # More important work never waits for a lower-priority upload
+    started = time.monotonic()
+    scheduler.admit("high", timeout=5)
+    assert time.monotonic() - started < 0.1
+    started = time.monotonic()
+    scheduler.admit("normal", timeout=0.2)
+    assert time.monotonic() - started >= 0.2
+    # Back in budget once the bucket has refilled
+    scheduler.admit("normal", timeout=5)
+    assert time.monotonic() - started < 5
@@ -0,0 +1,61 @@
+import os
+import time
+
+from src.pipeline.session_delta import (
+    MANIFEST_NAME,
+    HashIndex,
+    build_manifest,
+    diff_manifests,
+    session_files,
+)
+
+
+def _manifest(**files):
+    return {"files": {rel: {"size": 1, "sha256": digest} for rel, digest in files.items()}}
+
+
+def test_diff_first_delivery_sends_everything():
+    changed, removed = diff_manifests(None, _manifest(a="1", b="2"))
+    assert sorted(changed) == ["a", "b"] and removed == []
+
+
+def test_diff_changed_new_and_removed():
+    previous = _manifest(a="1", b="2", c="3")
+    current = _manifest(a="1", b="changed", d="4")
+    changed, removed = diff_manifests(previous, current)
+    assert sorted(changed) == ["b", "d"]
+    assert removed == ["c"]
+
+
+def test_diff_unchanged():
+    assert diff_manifests(_manifest(a="1"), _manifest(a="1")) == ([], [])
+
+
+def _session(tmp_path):
+    folder = tmp_path / "Song"
+    (folder / "Audio Files").mkdir(parents=True)
+    (folder / "Session File Backups").mkdir()
+    (folder / "Song.ptx").write_bytes(b"session")
+    (folder / "Audio Files" / "a.wav").write_bytes(b"audio")
+    (folder / "Session File Backups" / "Song.bak.001.ptx").write_bytes(b"old")
+    (folder / ".DS_Store").write_bytes(b"x")
+    (folder / MANIFEST_NAME).write_text("{}")
+    return folder
+
+
+def test_session_files_skips_housekeeping(tmp_path):
+    assert session_files(str(_session(tmp_path))) == ["Audio Files/a.wav", "Song.ptx"]
+
+
+def test_manifest_and_modified(tmp_path):
+    folder = _session(tmp_path)
+    index = HashIndex()
+    manifest = build_manifest(str(folder), index)
+    assert set(manifest["files"]) == {"Audio Files/a.wav", "Song.ptx"}
+    assert manifest["files"]["Song.ptx"]["size"] == 7
+
+    paths = [os.path.join(os.path.realpath(folder), "Song.ptx")]
+    assert index.modified(paths) == []
+    later = time.time() + 10
+    os.utime(paths[0], (later, later))
+    assert index.modified(paths) == paths
@@ -0,0 +1,14 @@
+from src.protools import parse_stems
+
+
+def test_parse_stems():
+    assert parse_stems("Dialog Stem, Music,output:Out 1-2,") == [
+        ("EMSType_Bus", "Dialog Stem"),
+        ("EMSType_Bus", "Music"),
+        ("EMSType_Output", "Out 1-2"),
+    ]
+
+
+def test_parse_stems_empty():
+    assert parse_stems("") == []
+    assert parse_stems(" , ") == []
@@ -0,0 +1,42 @@
+import os
+import threading
+
+from src import timing
+
+
+def test_profile_off_by_default(monkeypatch, tmp_path):
+    monkeypatch.delenv("PIPELINE_PROFILE_DIR", raising=False)
+    with timing.profile("job-bounce"):
+        pass
+    assert not any(tmp_path.iterdir())
+
+
+def test_concurrent_profiles_run_one_at_a_time(monkeypatch, tmp_path, capsys):
+    monkeypatch.setenv("PIPELINE_PROFILE_DIR", str(tmp_path))
+    started, release = threading.Event(), threading.Event()
+    errors = []
+
+    def phase():
+        try:
+            with timing.profile("job-upload"):
+                started.set()
+                release.wait(5)
+        except Exception as e:
+            errors.append(e)
+
+    worker = threading.Thread(target=phase)
+    worker.start()
+    started.wait(5)
+    # Runs unprofiled instead of failing while the other profile is active
+    with timing.profile("job-bounce"):
+        total = sum(range(1000))
+    release.set()
+    worker.join()
+
+    assert total == 499500 and errors == []
+    assert [name.split("-")[1] for name in os.listdir(tmp_path)] == ["upload"]
+    assert "job-bounce not profiled" in capsys.readouterr().out
+    # The lock is free again
+    with timing.profile("job-send"):
+        pass
+    assert len(os.listdir(tmp_path)) == 2
@@ -0,0 +1,126 @@
+import socket
+import threading
+import time
+
+import pytest
+
+from src.masv.transport import HTTPTransport
+
+
+class Agent:
+    """
+    Minimal HTTP server speaking keep-alive, with scripted failures.
+
+    ``drop_after`` requests on one connection, the next request on it is
+    read and the connection closed without an answer. ``close_idle``
+    closes each connection right after answering (without saying so).
+    """
+
+    def __init__(self, drop_after=None, close_idle=False):
+        self.drop_after = drop_after
+        self.close_idle = close_idle
+        self.requests = []
+        self.connections = 0
+        self._server = socket.create_server(("127.0.0.1", 0))
+        self.url = f"http://127.0.0.1:{self._server.getsockname()[1]}/api/v1"
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self):
+        while True:
+            try:
+                conn, _ = self._server.accept()
+            except OSError:
+                return
+            self.connections += 1
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn):
+        with conn, conn.makefile("rb") as f:
+            served = 0
+            while True:
+                line = f.readline()
+                if not line:
+                    return
+                length = 0
+                while True:
+                    header = f.readline()
+                    if header in (b"\r\n", b""):
+                        break
+                    name, _, value = header.decode().partition(":")
+                    if name.lower() == "content-length":
+                        length = int(value)
+                f.read(length)
+                self.requests.append(" ".join(line.decode().split()[:2]))
+                if self.drop_after is not None and served == self.drop_after:
+                    return
+                body = b'{"id": "u1", "transfers": []}'
+                conn.sendall(
+                    b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body)
+                )
+                served += 1
+                if self.close_idle:
+                    return
+
+    def close(self):
+        self._server.close()
+
+
+@pytest.fixture
+def agent_factory():
+    agents = []
+
+    def make(**kwargs):
+        agents.append(Agent(**kwargs))
+        return agents[-1]
+
+    yield make
+    for agent in agents:
+        agent.close()
+
+
+def test_connection_reused(agent_factory):
+    agent = agent_factory()
+    transport = HTTPTransport("key", url=agent.url)
+    assert transport.ping()
+    assert transport.list_transfers() == []
+    assert agent.connections == 1
+    transport.close()
+
+
+def test_get_retried_after_dropped_connection(agent_factory):
+    agent = agent_factory(drop_after=1)
+    transport = HTTPTransport("key", url=agent.url)
+    assert transport.ping()
+    assert transport.list_transfers() == []
+    assert agent.requests == ["GET /api/v1/uploads"] * 3
+    assert agent.connections == 2
+    transport.close()
+
+
+def test_post_not_resent_after_dropped_connection(agent_factory):
+    agent = agent_factory(drop_after=1)
+    transport = HTTPTransport("key", url=agent.url)
+    assert transport.ping()
+    with pytest.raises(RuntimeError):
+        transport.finalize_upload("u1")
+    # The agent may have acted on it: never sent twice
+    assert agent.requests.count("POST /api/v1/uploads/u1/finalize") == 1
+    transport.close()
+
+
+def test_closed_idle_connection_not_used(agent_factory):
+    agent = agent_factory(close_idle=True)
+    transport = HTTPTransport("key", url=agent.url)
+    assert transport.ping()
+    # Let the close reach us before the pooled connection is picked up
+    time.sleep(0.1)
+    assert transport.start_upload("portal", ["/tmp/mix.wav"], subdomain="abc") == "u1"
+    assert agent.requests == ["GET /api/v1/uploads", "POST /api/v1/uploads/portal"]
+    transport.close()
+
+
+def test_unreachable_agent():
+    transport = HTTPTransport("key", url="http://127.0.0.1:9/api/v1", timeout=1)
+    assert not transport.ping()
+    with pytest.raises(RuntimeError):
+        transport.start_upload("portal", ["/tmp/mix.wav"])
@@ -0,0 +1,97 @@
+import threading
+import time
+
+from src.masv.watcher import UploadWatcher
+
+
+class Agent:
+    """Transfer list served to the watcher, with a log of when it was fetched."""
+
+    def __init__(self, transfers=()):
+        self.transfers = list(transfers)
+        self.fetched = []
+        self.fail = False
+        self._lock = threading.Lock()
+
+    def fetch(self):
+        with self._lock:
+            self.fetched.append(time.monotonic())
+        if self.fail:
+            raise RuntimeError("agent busy")
+        return list(self.transfers)
+
+
+def _wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("timed out")
+        time.sleep(0.005)
+
+
+def test_status_published_to_every_handle():
+    agent = Agent([{"package_id": "p1", "state": "finished"}])
+    watcher = UploadWatcher(agent.fetch, min_interval=0.01)
+    first, second, other = watcher.watch("p1"), watcher.watch("p1"), watcher.watch("p2")
+    assert first.wait(1) and second.wait(1) and other.wait(1)
+    assert first.transfer["state"] == "finished"
+    assert second.transfer == first.transfer
+    # Not in the agent's list (yet)
+    assert other.transfer is None
+    for handle in (first, second, other):
+        handle.close()
+
+
+def test_one_fetch_per_tick_for_all_uploads():
+    agent = Agent([{"package_id": f"p{i}"} for i in range(5)])
+    watcher = UploadWatcher(agent.fetch, min_interval=0.05, max_interval=0.05)
+    handles = [watcher.watch(f"p{i}") for i in range(5)]
+    time.sleep(0.3)
+    for handle in handles:
+        handle.close()
+    assert 3 <= len(agent.fetched) <= 10
+
+
+def test_fetch_error_publishes_nothing():
+    agent = Agent()
+    agent.fail = True
+    watcher = UploadWatcher(agent.fetch, min_interval=0.01)
+    with watcher.watch("p1") as handle:
+        assert not handle.wait(0.1)
+        agent.fail = False
+        assert handle.wait(1)
+
+
+def test_backoff_reset_by_new_watch():
+    agent = Agent()
+    watcher = UploadWatcher(agent.fetch, min_interval=0.01, max_interval=0.4, backoff=4)
+    first = watcher.watch("p1")
+    # Backed off to the maximum interval
+    _wait_until(lambda: watcher._interval == 0.4)
+    _wait_until(lambda: len(agent.fetched) >= 4)
+    second = watcher.watch("p2")
+    count = len(agent.fetched)
+    _wait_until(lambda: len(agent.fetched) >= count + 2)
+    # Polled quickly again, not after another 0.4 s
+    assert agent.fetched[count + 1] - agent.fetched[count] < 0.2
+    first.close()
+    second.close()
+
+
+def test_thread_stops_when_nothing_is_watched():
+    agent = Agent()
+    watcher = UploadWatcher(agent.fetch, min_interval=0.01, max_interval=0.01)
+    handle = watcher.watch("p1")
+    thread = watcher._thread
+    _wait_until(lambda: len(agent.fetched) >= 2)
+    handle.close()
+    thread.join(1)
+    assert not thread.is_alive()
+    count = len(agent.fetched)
+    time.sleep(0.05)
+    assert len(agent.fetched) == count
+
+    # Watching again starts a new poll thread
+    with watcher.watch("p2") as handle:
+        assert handle.wait(1)
+    assert watcher._thread is not thread
@@ -0,0 +1,77 @@
+import struct
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.audio import wav
+from src.audio.wav import WavReader, WavWriter, encode_pcm
+
+
+def _signal(frames=1000, channels=2):
+    t = np.arange(frames) / 48000
+    return np.stack([np.sin(2 * np.pi * 440 * (c + 1) * t) for c in range(channels)], 1) * 0.5
+
+
+def _write(path, samples, bits, rate=48000):
+    with WavWriter(str(path), rate, samples.shape[1], bits) as writer:
+        writer.write(encode_pcm(samples, bits))
+
+
+@pytest.mark.parametrize("bits", [16, 24, 32])
+def test_round_trip(tmp_path, bits):
+    samples = _signal()
+    _write(tmp_path / "a.wav", samples, bits)
+    with WavReader(str(tmp_path / "a.wav")) as reader:
+        assert (reader.sample_rate, reader.channels, reader.bits) == (48000, 2, bits)
+        assert reader.frames == len(samples)
+        assert not reader.truncated
+        decoded = reader.read(0, reader.frames)
+    assert np.abs(decoded - samples).max() <= 1 / (1 << (bits - 1))
+
+
+def test_read_pads_outside_file(tmp_path):
+    samples = _signal(frames=10, channels=1)
+    _write(tmp_path / "a.wav", samples, 16)
+    with WavReader(str(tmp_path / "a.wav")) as reader:
+        out = reader.read(-5, 15)
+        assert out.shape == (20, 1)
+        assert not out[:5].any() and not out[15:].any()
+        assert len(reader.read_raw(8, 100)) == 2 * reader.block_align
+
+
+def test_odd_size_is_padded(tmp_path):
+    _write(tmp_path / "a.wav", _signal(frames=3, channels=1), 24)
+    data = (tmp_path / "a.wav").read_bytes()
+    assert len(data) % 2 == 0
+    with WavReader(str(tmp_path / "a.wav")) as reader:
+        assert reader.frames == 3
+
+
+def test_rf64_past_riff_limit(tmp_path, monkeypatch):
+    # Shrink the limit so a small file takes the RF64 path
+    monkeypatch.setattr(wav, "RIFF_LIMIT", 100)
+    samples = _signal(frames=100)
+    _write(tmp_path / "a.wav", samples, 16)
+    data = (tmp_path / "a.wav").read_bytes()
+    assert data[:4] == b"RF64" and data[12:16] == b"ds64"
+    riff_size, data_size = struct.unpack_from("<QQ", data, 20)
+    assert (riff_size, data_size) == (len(data) - 8, 400)
+    with WavReader(str(tmp_path / "a.wav")) as reader:
+        assert reader.frames == 100
+        assert np.abs(reader.read(0, 100) - samples).max() <= 1 / (1 << 15)
+
+
+def test_truncated_file(tmp_path):
+    _write(tmp_path / "a.wav", _signal(frames=100), 16)
+    path = tmp_path / "a.wav"
+    path.write_bytes(path.read_bytes()[:-40])
+    with WavReader(str(path)) as reader:
+        assert reader.truncated
+        assert reader.frames == 90
+
+
+def test_not_a_wav(tmp_path):
+    (tmp_path / "a.wav").write_bytes(b"RIFX" + bytes(40))
+    with pytest.raises(ValueError):
+        WavReader(str(tmp_path / "a.wav"))